@@ -1,4 +1,5 @@
 import os
+import atexit
 import json
 import smtplib
 import time
@@ -10,11 +11,7 @@ from functools import wraps
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime, timedelta
 import re
@@ -65,6 +62,41 @@ _load_dotenv_optional()
 # Create Flask app
 app = Flask(__name__)
 
+from pipeline import Pipeline, TokenBucket
+from gemini_client import CircuitBreaker, CircuitOpen, GeminiClient, parse_retry_after
+from local_classifier import LocalPreClassifier
+from post_text import (
+    activity_number,
+    activity_time,
+    _normalize_text_for_id,
+    extract_role_from_text,
+    extract_contacts_from_text,
+    build_job,
+)
+from dom_extract import EXTRACT_STATS as DOM_EXTRACT_STATS, HARVEST_STATS, PostHarvester, extract_posts
+from page_parser import extract_post_items
+from voyager import VOYAGER_STATS, VoyagerCapture
+import waits
+from browser import (
+    NetworkMeter,
+    account_profile_dir,
+    apply_resource_blocking,
+    build_chrome_options,
+    cookie_names,
+    parse_block_categories,
+    set_cookies,
+    source_metrics,
+)
+from chrome_setup import resolve as resolve_chrome
+from browser_pool import AccountLimiter, BrowserSupervisor, BrowserWorker, WarmBrowserPool, is_browser_crash, launch_workers, run_sources
+from waits import WAIT_STATS, scroll_through_lookback, wait_for_posts, wait_quiet, wait_until
+from keyword_matcher import (
+    build_post_matcher,
+    match_post_terms,
+    is_promo_training,
+    seems_hiring,
+    is_disallowed_location,
+)
 from db import (
     init_db,
     get_settings as db_get_settings,
@@ -72,6 +104,19 @@ from db import (
     get_sent_job_ids,
     add_sent_job,
     get_all_sent_jobs,
+    get_ai_verdict,
+    put_ai_verdict,
+    get_ai_verdict_history,
+    get_source_cursors,
+    advance_source_cursor,
+    source_cursor_targets,
+    clear_source_cursors,
+    get_linkedin_session,
+    save_linkedin_session,
+    list_linkedin_sessions,
+    clear_linkedin_sessions,
+    _account_key,
+    DEFAULT_DB_PATH,
 )
 
 # Database initialization will be performed after logging is configured farther down
@@ -175,116 +220,11 @@ def write_json_atomic(path: str, data):
         except Exception:
             pass
 
-# --- ID STABILITY HELPERS ---
-def _normalize_text_for_id(text: str) -> str:
-    """Normalize post text to reduce duplicate emails from minor UI/time changes.
-
-    - Lowercase
-    - Remove 'recent time' words like '2h', '5 hr', '10m', 'just now'
-    - Remove common social counters like '123 likes', '45 comments', 'share'
-    - Collapse whitespace
-    """
-    if not text:
-        return ''
-    t = text.lower()
-    try:
-        # remove time words
-        t = re.sub(r"\b\d+\s*(?:h|hr|hrs|hour|hours|m|min|mins|minute|minutes)\b", " ", t)
-        t = re.sub(r"\bjust now\b", " ", t)
-        # remove interaction counters/labels
-        t = re.sub(r"\b\d+\s+likes?\b", " ", t)
-        t = re.sub(r"\b\d+\s+comments?\b", " ", t)
-        t = re.sub(r"\bshares?\b", " ", t)
-        t = re.sub(r"\bfollow(ing)?\b", " ", t)
-        t = re.sub(r"\bpremium\b", " ", t)
-        # collapse whitespace
-        t = re.sub(r"\s+", " ", t).strip()
-    except Exception:
-        t = text.strip().lower()
-    return t
+def _heuristic_tokens(text: str) -> list:
+    # Synthetic tokens so the local pre-classifier can weigh the keyword heuristics directly
+    found = match_post_terms(text)
+    return [f'__{label}__' for label in ('promo', 'hiring', 'location') if found.get(label)]
 
-def _extract_linkedin_activity_id_from_anchors(anchors: list) -> str | None:
-    """Try to extract a stable LinkedIn activity/update ID from anchor hrefs.
-    Returns an id string like 'activity:1234567890' or None.
-    """
-    if not anchors:
-        return None
-    try:
-        for a in anchors:
-            try:
-                href = (a.get_attribute('href') or '')
-            except Exception:
-                href = ''
-            if not href:
-                continue
-            h = href.lower()
-            if 'activity:' in h:
-                # urn:li:activity:12345
-                try:
-                    idx = h.index('activity:')
-                    part = h[idx:]
-                    # keep up to next non-digit boundary
-                    m = re.search(r"activity:(\d+)", part)
-                    if m:
-                        return f"activity:{m.group(1)}"
-                except Exception:
-                    pass
-            # Some links look like /feed/update/urn:li:activity:1234 or contain '/updates/' with share id
-            if '/feed/update/' in h and 'activity:' in h:
-                try:
-                    m = re.search(r"activity:(\d+)", h)
-                    if m:
-                        return f"activity:{m.group(1)}"
-                except Exception:
-                    pass
-            if '/posts/' in h:
-                # As a fallback, hash the posts URL path (stable enough)
-                try:
-                    from urllib.parse import urlparse
-                    p = urlparse(h)
-                    if p.path:
-                        return f"postpath:{hashlib.sha1(p.path.encode('utf-8')).hexdigest()}"
-                except Exception:
-                    pass
-    except Exception:
-        return None
-    return None
-
-
-def extract_role_from_text(text: str) -> str | None:
-    """Heuristic extraction of a role/title from post text.
-
-    Returns a short role string like 'Python Developer' or 'Senior Software Engineer', or None.
-    This is intentionally conservative: we try a few regexes in order and return the first reasonable match.
-    """
-    if not text:
-        return None
-    t = text.replace('\n', ' ').strip()
-    try:
-        # 1) Look for explicit phrases like 'looking for', 'hiring', 'seeking' followed by a title
-        m = re.search(r"(?:looking for|we're looking for|we are looking for|hiring|we're hiring|we are hiring|seeking|open for|open role for)\s+(?:an?|the)?\s*([A-Za-z0-9+.#\s\-]{3,80}?)\b(?:\.|,|\band|for|in|\(|$)", t, re.I)
-        if m:
-            candidate = m.group(1).strip(' .,:;\\/')
-            if 3 <= len(candidate) <= 80:
-                return ' '.join(candidate.split())
-
-        # 2) Role keywords e.g. 'Python Developer', 'Java Engineer', 'Full Stack Developer'
-        # Capture up to 4 words ending with a role keyword
-        role_kw = r"(?:developer|engineer|manager|designer|architect|consultant|analyst|specialist|lead|scientist|administrator|admin|devops|full[ -]?stack|backend|frontend|mobile|engineer)"
-        m2 = re.search(rf"([A-Za-z0-9+#\.\-\s]{{0,60}}\b{role_kw})", t, re.I)
-        if m2:
-            candidate = m2.group(1).strip(' .,:;\\/')
-            if 3 <= len(candidate) <= 80:
-                return ' '.join(candidate.split())
-
-        # 3) Fallback: look for common language + role combos like 'Python', 'Java' near the word 'developer' elsewhere
-        m3 = re.search(r"(Python|JavaScript|Java|Go|Golang|Ruby|C\+\+|C#|Node|React|Django|Flask)\s+([A-Za-z]{2,20})", t, re.I)
-        if m3:
-            candidate = (m3.group(1) + ' ' + m3.group(2)).strip()
-            return candidate
-    except Exception:
-        pass
-    return None
 
 # configure basic logging so terminal shows progress
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s - %(message)s')
@@ -297,7 +237,103 @@ ADMIN_TOKEN = os.getenv('ADMIN_TOKEN') or 'ChangeThisToAStrongSecret'
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_API_URL = os.getenv('GEMINI_API_URL')  # e.g., https://generativelanguage.googleapis.com/v1/models/gemini-1.5-flash:generateContent
 GEMINI_API_VERSION = os.getenv('GEMINI_API_VERSION')  # optional override, e.g. 'v1' or 'v1beta'
+# GEMINI_API_URL may be replaced at runtime by a resolved model; remember what was configured
+GEMINI_API_URL_CONFIGURED = GEMINI_API_URL
+# Resolved model endpoint persisted in the settings table: how long it stays valid, and how
+# often the background refresher re-validates it (0 disables the refresher)
+GEMINI_MODEL_SETTINGS_KEY = 'gemini_model'
+GEMINI_MODEL_TTL_SECONDS = float(os.getenv('GEMINI_MODEL_TTL_HOURS', '168')) * 3600
+GEMINI_MODEL_REFRESH_SECONDS = float(os.getenv('GEMINI_MODEL_REFRESH_HOURS', '6')) * 3600
 AI_FILTER_ENABLED_DEFAULT = os.getenv('AI_FILTER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Persistent AI verdict cache (db.ai_verdicts): entry lifetime and max rows kept
+AI_CACHE_TTL_SECONDS = float(os.getenv('AI_CACHE_TTL_HOURS', '72')) * 3600
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '20000'))
+_ai_cache_stats_lock = threading.Lock()
+
+# Batched classification: posts per generateContent request and how long the classify stage
+# waits to fill a batch before sending a partial one
+AI_BATCH_SIZE = int(os.getenv('AI_BATCH_SIZE', '10'))
+AI_BATCH_WAIT_SECONDS = float(os.getenv('AI_BATCH_WAIT_SECONDS', '2'))
+# Flipped off if the API version in use rejects generationConfig.responseSchema
+_batch_schema_supported = True
+
+# Gemini quota: requests/minute (token bucket, 0 disables) and max requests in flight at once
+GEMINI_RPM = float(os.getenv('GEMINI_RPM', '15'))
+GEMINI_BURST = float(os.getenv('GEMINI_BURST', '3'))
+AI_MAX_CONCURRENCY = max(1, int(os.getenv('AI_MAX_CONCURRENCY', '4')))
+_gemini_rate_limiter = TokenBucket(GEMINI_RPM / 60.0, capacity=GEMINI_BURST)
+_gemini_concurrency = threading.BoundedSemaphore(AI_MAX_CONCURRENCY)
+# Pooled keep-alive session shared by every AI call (generateContent and ListModels)
+_gemini_http = GeminiClient(pool_size=AI_MAX_CONCURRENCY + 2, retries=int(os.getenv('GEMINI_HTTP_RETRIES', '2')))
+# Circuit breaker: consecutive failures (timeouts, 429, 5xx) before opening, and the initial/max open period.
+# While open, posts are classified by the local keyword heuristics instead of waiting on Gemini.
+AI_BREAKER_FAILURES = int(os.getenv('AI_BREAKER_FAILURES', '3'))
+AI_BREAKER_OPEN_SECONDS = float(os.getenv('AI_BREAKER_OPEN_SECONDS', '30'))
+AI_BREAKER_MAX_OPEN_SECONDS = float(os.getenv('AI_BREAKER_MAX_OPEN_SECONDS', '600'))
+_gemini_breaker = CircuitBreaker(AI_BREAKER_FAILURES, AI_BREAKER_OPEN_SECONDS, AI_BREAKER_MAX_OPEN_SECONDS)
+
+# Local pre-classifier cascade (needs numpy): posts scoring >= LOCAL_CLASSIFIER_POS_THRESHOLD are kept and
+# <= LOCAL_CLASSIFIER_NEG_THRESHOLD dropped without calling Gemini. It is retrained from stored verdicts at the
+# start of each run and stays off until there are LOCAL_CLASSIFIER_MIN_SAMPLES examples and its confident
+# decisions reach LOCAL_CLASSIFIER_MIN_ACCURACY on a holdout split.
+LOCAL_CLASSIFIER_ENABLED = os.getenv('LOCAL_CLASSIFIER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LOCAL_CLASSIFIER_POS_THRESHOLD = float(os.getenv('LOCAL_CLASSIFIER_POS_THRESHOLD', '0.9'))
+LOCAL_CLASSIFIER_NEG_THRESHOLD = float(os.getenv('LOCAL_CLASSIFIER_NEG_THRESHOLD', '0.1'))
+LOCAL_CLASSIFIER_MIN_SAMPLES = int(os.getenv('LOCAL_CLASSIFIER_MIN_SAMPLES', '200'))
+LOCAL_CLASSIFIER_MIN_ACCURACY = float(os.getenv('LOCAL_CLASSIFIER_MIN_ACCURACY', '0.95'))
+_local_classifier = LocalPreClassifier(
+    pos_threshold=LOCAL_CLASSIFIER_POS_THRESHOLD,
+    neg_threshold=LOCAL_CLASSIFIER_NEG_THRESHOLD,
+    min_samples=LOCAL_CLASSIFIER_MIN_SAMPLES,
+    min_accuracy=LOCAL_CLASSIFIER_MIN_ACCURACY,
+    extra_features=_heuristic_tokens,
+)
+
+# Scraper pipeline tuning: classification workers (defaults to the AI concurrency limit) and bounded queue size between stages
+CLASSIFY_WORKERS = int(os.getenv('CLASSIFY_WORKERS', str(AI_MAX_CONCURRENCY)))
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '100'))
+# How posts are read from a loaded page: 'script' (one injected script, expands 'see more'), 'html'
+# (parse driver.page_source offline with page_parser; no clicks, so truncated posts stay truncated) or 'api'
+# (decode the voyager JSON responses the page fetched, captured via CDP; full text and exact activity ids,
+# falls back to the script when a page yields none)
+SCRAPER_EXTRACTOR = os.getenv('SCRAPER_EXTRACTOR', 'script').lower()
+# Site the scraper drives; point it at a local fake_linkedin.py server for load tests (no real LinkedIn traffic)
+LINKEDIN_BASE_URL = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com').rstrip('/')
+# Page waits: 'events' returns as soon as posts render / the page goes idle (old sleeps are the upper bounds); 'sleep' keeps the fixed sleeps
+SCRAPER_WAIT_MODE = os.getenv('SCRAPER_WAIT_MODE', 'events').lower()
+waits.FIXED_SLEEPS = SCRAPER_WAIT_MODE == 'sleep'
+# Scroll each source until its posts reach back HOURS_LOOKBACK hours (older posts are dropped); 0 = old fixed scroll count, no age cut-off
+HOURS_LOOKBACK = float(os.getenv('HOURS_LOOKBACK', str(HOURS_LOOKBACK)))
+LOOKBACK_MINUTES = int(HOURS_LOOKBACK * 60) or None
+# Upper bound on scroll steps per source when following the lookback window
+SCROLL_MAX_STEPS = int(os.getenv('SCROLL_MAX_STEPS', '25'))
+# Read posts before every scroll step instead of once after scrolling: LinkedIn's feed and search results drop
+# off-screen posts from the DOM, so a single read at the end misses them (script extractor only)
+SCRAPER_HARVEST_DURING_SCROLL = os.getenv('SCRAPER_HARVEST_DURING_SCROLL', 'true').lower() in ('1', 'true', 'yes')
+# Per-source high-water marks: skip (and stop scrolling at) posts no newer than the last run's newest activity id per group/keyword
+SOURCE_CURSORS_ENABLED = os.getenv('SOURCE_CURSORS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Reuse LinkedIn sessions across runs: a Chrome profile per account under CHROME_PROFILE_ROOT plus the account's
+# cookies in the DB; the password login only runs when neither is still signed in
+SESSION_PERSISTENCE = os.getenv('SESSION_PERSISTENCE', 'true').lower() in ('1', 'true', 'yes')
+CHROME_PROFILE_ROOT = os.getenv('CHROME_PROFILE_ROOT', os.path.join(os.path.dirname(os.path.abspath(DEFAULT_DB_PATH)), 'chrome_profiles'))
+# Browsers scraping groups/keyword searches in parallel (extra ones reuse the signed-in session's cookies),
+# and how many pages of one LinkedIn account may load at the same time
+SCRAPER_BROWSERS = max(1, int(os.getenv('SCRAPER_BROWSERS', '1')))
+SCRAPER_MAX_PER_ACCOUNT = max(1, int(os.getenv('SCRAPER_MAX_PER_ACCOUNT', '3')))
+# Browser recycling during long runs: a browser is replaced (session cookies carried over, no new login) after
+# BROWSER_RECYCLE_PAGES sources or when its Chrome processes / page JS heap exceed the ceilings in MB; 0 disables a limit
+BROWSER_RECYCLE_PAGES = int(os.getenv('BROWSER_RECYCLE_PAGES', '20'))
+BROWSER_MAX_RSS_MB = int(os.getenv('BROWSER_MAX_RSS_MB', '1200'))
+BROWSER_MAX_JS_HEAP_MB = int(os.getenv('BROWSER_MAX_JS_HEAP_MB', '400'))
+# Browser profile: headless Chrome without GPU/extensions (human verification can then only be cleared via /admin/resume-scraper)
+SCRAPER_HEADLESS = os.getenv('SCRAPER_HEADLESS', 'false').lower() in ('1', 'true', 'yes')
+SCRAPER_WINDOW_SIZE = os.getenv('SCRAPER_WINDOW_SIZE', '1366,900' if SCRAPER_HEADLESS else '')
+# Resource categories dropped via CDP: images, media, fonts, analytics (comma-separated, 'all' or 'none'); 'auto' = all when headless
+SCRAPER_BLOCK_RESOURCES = parse_block_categories(os.getenv('SCRAPER_BLOCK_RESOURCES', 'auto'), SCRAPER_HEADLESS)
+# Idle pre-launched browsers kept ready for the next run (default: one when headless, none when a window would pop up),
+# pre-signed-in with the stored session of the configured LinkedIn account unless WARM_BROWSER_SIGN_IN=false
+WARM_BROWSERS = int(os.getenv('WARM_BROWSERS', '1' if SCRAPER_HEADLESS else '0'))
+WARM_BROWSER_SIGN_IN = os.getenv('WARM_BROWSER_SIGN_IN', 'true').lower() in ('1', 'true', 'yes')
 
 def admin_required(f):
     @wraps(f)
@@ -338,7 +374,14 @@ scraper_status = {
 scraper_status.setdefault('paused_for_human_verification', False)
 scraper_status.setdefault('resume_requested', False)
 scraper_status.setdefault('ai_filter_enabled', AI_FILTER_ENABLED_DEFAULT)
-scraper_status.setdefault('ai_filter_stats', {'kept': 0, 'skipped': 0, 'errors': 0})
+scraper_status.setdefault('ai_filter_stats', {'kept': 0, 'skipped': 0, 'errors': 0, 'avoided': 0, 'degraded': 0})
+scraper_status.setdefault('ai_rate_limit', {'rpm': GEMINI_RPM, 'max_concurrency': AI_MAX_CONCURRENCY, 'limiter': _gemini_rate_limiter.stats})
+scraper_status.setdefault('ai_circuit', _gemini_breaker.stats)
+scraper_status.setdefault('local_classifier', _local_classifier.stats)
+scraper_status.setdefault('dom_extract', DOM_EXTRACT_STATS)
+scraper_status.setdefault('harvest', HARVEST_STATS)
+scraper_status.setdefault('waits', WAIT_STATS)
+scraper_status.setdefault('api_capture', VOYAGER_STATS)
 scraper_status.setdefault('extracted_emails_count', 0)
 scraper_status.setdefault('extracted_emails_file', '')
 
@@ -375,7 +418,7 @@ def _resolve_gemini_model_url(prefer: str = 'flash'):
     last_err = None
     for ver in versions:
         try:
-            resp = requests.get(f"{base}/{ver}/models", params=params, headers=headers, timeout=15)
+            resp = _gemini_http.get(f"{base}/{ver}/models", params=params, headers=headers, timeout=15)
         except Exception as e:
             last_err = f"http-ex:{type(e).__name__}:{str(e)[:120]}"
             continue
@@ -425,7 +468,371 @@ def _resolve_gemini_model_url(prefer: str = 'flash'):
 
     return None, (last_err or 'resolve-failed')
 
-def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
+
+def _gemini_key_fingerprint() -> str:
+    return hashlib.sha256((GEMINI_API_KEY or '').encode('utf-8')).hexdigest()[:16]
+
+
+def _get_persisted_gemini_model(max_age_seconds: float | None = None) -> dict | None:
+    """Return the resolved model entry stored in settings if it still applies to this process.
+
+    The entry only counts if it was resolved for the same API key and the same configured
+    GEMINI_API_URL, and is younger than max_age_seconds (default GEMINI_MODEL_TTL_SECONDS).
+    """
+    try:
+        entry = (db_get_settings() or {}).get(GEMINI_MODEL_SETTINGS_KEY)
+    except Exception:
+        logger.exception('Failed reading persisted Gemini model from settings')
+        return None
+    if not isinstance(entry, dict) or not entry.get('url'):
+        return None
+    if entry.get('key_fingerprint') != _gemini_key_fingerprint():
+        return None
+    if entry.get('configured_url') != _redact_model_url(GEMINI_API_URL_CONFIGURED):
+        return None
+    try:
+        resolved_at = datetime.fromisoformat((entry.get('resolved_at') or '').rstrip('Z'))
+    except Exception:
+        return None
+    max_age = GEMINI_MODEL_TTL_SECONDS if max_age_seconds is None else max_age_seconds
+    if (datetime.utcnow() - resolved_at).total_seconds() > max_age:
+        return None
+    return entry
+
+
+def _persist_gemini_model_url(url: str, info: str = '') -> bool:
+    """Store a working generateContent URL in settings so other workers and restarts reuse it."""
+    entry = {
+        'url': _redact_model_url(url),
+        'info': info,
+        'resolved_at': datetime.utcnow().isoformat() + 'Z',
+        'key_fingerprint': _gemini_key_fingerprint(),
+        'configured_url': _redact_model_url(GEMINI_API_URL_CONFIGURED),
+    }
+    try:
+        return bool(db_save_settings({GEMINI_MODEL_SETTINGS_KEY: entry}))
+    except Exception:
+        logger.exception('Failed persisting resolved Gemini model')
+        return False
+
+
+def _probe_gemini_model_url(url: str) -> bool | None:
+    """Cheap models.get check for a generateContent URL. True/False when known, None on network trouble."""
+    base_url = _redact_model_url(url).rsplit(':generateContent', 1)[0]
+    try:
+        resp = _gemini_http.get(base_url, label='getModel', params={'key': GEMINI_API_KEY}, timeout=15)
+    except Exception:
+        return None
+    if resp.status_code == 200:
+        return True
+    if resp.status_code in (400, 404):
+        return False
+    return None
+
+
+def _refresh_gemini_model_url():
+    """Make sure GEMINI_API_URL points at a working model, off the request path.
+
+    Adopts a fresh entry persisted by another worker if there is one; otherwise validates the
+    current URL and only falls back to a full ListModels resolution when the model is gone.
+    """
+    global GEMINI_API_URL
+    if not GEMINI_API_KEY or not GEMINI_API_URL:
+        return
+    entry = _get_persisted_gemini_model(max_age_seconds=GEMINI_MODEL_REFRESH_SECONDS)
+    if entry:
+        if entry['url'] != _redact_model_url(GEMINI_API_URL):
+            logger.info(f"Adopting persisted Gemini model URL ({entry.get('info') or 'persisted'})")
+            GEMINI_API_URL = entry['url']
+        return
+    ok = _probe_gemini_model_url(GEMINI_API_URL)
+    if ok:
+        _persist_gemini_model_url(GEMINI_API_URL, info='validated')
+        return
+    if ok is None:
+        # Network trouble: keep the current URL and try again next cycle
+        return
+    resolved_url, why = _resolve_gemini_model_url(prefer='flash')
+    if resolved_url:
+        GEMINI_API_URL = resolved_url
+        _persist_gemini_model_url(resolved_url, info=why)
+    else:
+        logger.warning(f'Background Gemini model refresh could not resolve a model: {why}')
+
+
+def _gemini_model_refresher():
+    # Give the app a moment to finish booting before the first network call
+    time.sleep(5)
+    while True:
+        try:
+            _refresh_gemini_model_url()
+        except Exception:
+            logger.exception('Background Gemini model refresh failed')
+        time.sleep(GEMINI_MODEL_REFRESH_SECONDS)
+
+
+def _gemini_post(url: str, **kwargs):
+    """POST to a Gemini generateContent endpoint within the shared rate limit and concurrency cap.
+
+    All AI requests (batched, single and retries) go through here, so the classify workers
+    together never exceed GEMINI_RPM requests/minute or AI_MAX_CONCURRENCY requests in flight.
+    Outcomes feed the circuit breaker: timeouts, connection errors, 429 and 5xx count as failures
+    (a Retry-After header sets the minimum open period). Raises CircuitOpen without calling the
+    API while the breaker is open.
+    """
+    if not _gemini_breaker.allow():
+        raise CircuitOpen()
+    # Only a running scraper can be stopped; stop_event stays set after a stopped run until the next start
+    waiter_stop = stop_event if scraper_status.get('is_running') else None
+    if not _gemini_rate_limiter.acquire(stop_event=waiter_stop):
+        _gemini_breaker.release()
+        raise StopRequested()
+    try:
+        with _gemini_concurrency:
+            resp = _gemini_http.post(url, **kwargs)
+    except requests.RequestException:
+        _gemini_breaker.record_failure()
+        raise
+    except BaseException:
+        _gemini_breaker.release()
+        raise
+    if resp.status_code == 429 or resp.status_code >= 500:
+        retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+        if resp.status_code == 429 and retry_after is None:
+            # Quota exhausted without a hint: open immediately rather than after more failures
+            retry_after = AI_BREAKER_OPEN_SECONDS
+        _gemini_breaker.record_failure(retry_after=retry_after)
+        if _gemini_breaker.is_open():
+            logger.warning(f"AI circuit open after HTTP {resp.status_code}; using keyword heuristics until {_gemini_breaker.stats.get('open_until')}")
+    else:
+        # Any other answer (including 400/404) means the API itself is reachable
+        _gemini_breaker.record_success()
+    return resp
+
+
+def _degraded_verdict(text: str) -> tuple[bool, str]:
+    """Local stand-in for the Gemini verdict while the circuit breaker is open (never cached).
+
+    Promo/training and location checks still run afterwards in _apply_local_guards.
+    """
+    try:
+        if seems_hiring(text):
+            return True, 'ai-degraded: hiring keywords'
+        return False, 'ai-degraded: no hiring keywords'
+    except Exception:
+        return True, 'ai-degraded'
+
+
+def _ai_cache_key(text: str) -> str:
+    return hashlib.sha256(_normalize_text_for_id(text).encode('utf-8')).hexdigest()
+
+
+def _redact_model_url(url: str | None) -> str:
+    # Never persist the API key if it was embedded in GEMINI_API_URL
+    return (url or '').split('?', 1)[0]
+
+
+def _record_cache_stat(stats: dict | None, hit: bool):
+    if stats is None:
+        return
+    with _ai_cache_stats_lock:
+        k = 'cache_hits' if hit else 'cache_misses'
+        stats[k] = stats.get(k, 0) + 1
+        total = stats.get('cache_hits', 0) + stats.get('cache_misses', 0)
+        stats['cache_hit_rate'] = round(stats.get('cache_hits', 0) / total, 3) if total else 0.0
+
+
+def _ai_cache_get(text: str, stats: dict | None = None) -> tuple[bool, str] | None:
+    try:
+        cached = get_ai_verdict(_ai_cache_key(text), ttl_seconds=AI_CACHE_TTL_SECONDS)
+    except Exception:
+        logger.exception('AI cache lookup failed; calling Gemini')
+        cached = None
+    _record_cache_stat(stats, cached is not None)
+    if cached is None:
+        return None
+    return cached['keep'], cached['reason']
+
+
+def _ai_cache_put(text: str, keep: bool, reason: str):
+    # Errors, parse failures and heuristic stand-ins are transient; never cache them
+    if (reason or '').startswith(('ai-error', 'ai-parse-failed', 'ai-disabled', 'ai-degraded')):
+        return
+    try:
+        put_ai_verdict(_ai_cache_key(text), keep, reason, model_url=_redact_model_url(GEMINI_API_URL), ttl_seconds=AI_CACHE_TTL_SECONDS, max_entries=AI_CACHE_MAX_ENTRIES, text=(text or '')[:4000])
+    except Exception:
+        logger.exception('AI cache store failed')
+
+
+def ai_is_usa_hiring_post(text: str, timeout: int = 20, use_cache: bool = True, stats: dict | None = None) -> tuple[bool, str]:
+    """Call Gemini to determine if a post is about hiring in the USA, using the persistent verdict cache.
+
+    The same recruiter post shows up across groups, searches and consecutive runs, so verdicts are
+    cached in the DB keyed by the normalized text hash. Errors are never cached.
+    If stats is given, cache_hits/cache_misses/cache_hit_rate are updated in it.
+    Returns (keep, reason). keep=True if it's hiring and US-related.
+    """
+    if not GEMINI_API_KEY or not GEMINI_API_URL or not use_cache:
+        return _ai_is_usa_hiring_post_uncached(text, timeout=timeout)
+    cached = _ai_cache_get(text, stats)
+    if cached is not None:
+        return cached
+    keep, reason = _ai_is_usa_hiring_post_uncached(text, timeout=timeout)
+    _ai_cache_put(text, keep, reason)
+    return keep, reason
+
+
+def ai_classify_batch(texts: list, timeout: int = 45, stats: dict | None = None) -> list:
+    """Classify many posts with as few Gemini requests as possible.
+
+    Cached verdicts are answered locally; the remaining posts are packed AI_BATCH_SIZE at a time
+    into one generateContent request with a JSON-array response schema, and verdicts are mapped
+    back by index. Any post missing from (or unparseable in) a batch response falls back to a
+    single-post call. While the circuit breaker is open, uncached posts get local heuristic
+    verdicts instead. Returns a list of (keep, reason) in the same order as texts.
+    """
+    if not texts:
+        return []
+    if not GEMINI_API_KEY or not GEMINI_API_URL:
+        return [(True, 'ai-disabled') for _ in texts]
+    results: list = [None] * len(texts)
+    # Group identical (normalized) posts so each distinct text is classified once
+    pending: dict = {}
+    for i, t in enumerate(texts):
+        cached = _ai_cache_get(t, stats)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.setdefault(_ai_cache_key(t), []).append(i)
+    keys = list(pending.keys())
+    size = max(1, AI_BATCH_SIZE)
+    for start in range(0, len(keys), size):
+        chunk = keys[start:start + size]
+        chunk_texts = [texts[pending[k][0]] for k in chunk]
+        if _gemini_breaker.is_open():
+            verdicts = {}
+        else:
+            verdicts = _gemini_batch_request(chunk_texts, timeout=timeout, stats=stats)
+        for j, k in enumerate(chunk):
+            verdict = verdicts.get(j)
+            if verdict is None:
+                # Not answered in the batch response: fall back to a per-post call (heuristics if the circuit is open)
+                verdict = _degraded_verdict(chunk_texts[j]) if _gemini_breaker.is_open() else _ai_is_usa_hiring_post_uncached(chunk_texts[j])
+            _ai_cache_put(chunk_texts[j], verdict[0], verdict[1])
+            for i in pending[k]:
+                results[i] = verdict
+    return results
+
+
+def _schema_rejected(resp):
+    # A 400 about the structured-output fields (as opposed to a bad key, an oversized prompt, ...)
+    try:
+        body = resp.text or ''
+    except Exception:
+        return False
+    return any(k in body for k in ('responseSchema', 'response_schema', 'generationConfig', 'generation_config', 'responseMimeType', 'response_mime_type'))
+
+
+def _gemini_batch_request(texts: list, timeout: int = 45, stats: dict | None = None) -> dict:
+    """Send one generateContent request covering all texts. Returns {index: (keep, reason)} for parsed items."""
+    global _batch_schema_supported
+    prompt = (
+        "You are a precise filter for job posts. You will receive several posts, each introduced by a line "
+        "'### Post <index>'. For EVERY post return one object {\"index\": <index>, \"hiring\": true|false, "
+        "\"usa\": true|false, \"reason\": \"short reason\"} and answer strictly with a JSON array of these objects. "
+        "- hiring=true only if the post is recruiting/hiring or contains openings/positions/vacancies/looking for candidates (not job seeking). "
+        "- usa=true only if the role is in the United States of America (50 states or DC), or remote but explicitly restricted to US residents. "
+        "  Treat US territories (e.g., Puerto Rico, Guam, USVI) and other countries as NOT usa. If global with no explicit US-only restriction, set usa=false.\n\n"
+        + "\n\n".join(f"### Post {i}\n{(t or '')[:4000]}" for i, t in enumerate(texts))
+    )
+    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+    if _batch_schema_supported:
+        payload["generationConfig"] = {
+            "responseMimeType": "application/json",
+            "responseSchema": {
+                "type": "ARRAY",
+                "items": {
+                    "type": "OBJECT",
+                    "properties": {
+                        "index": {"type": "INTEGER"},
+                        "hiring": {"type": "BOOLEAN"},
+                        "usa": {"type": "BOOLEAN"},
+                        "reason": {"type": "STRING"}
+                    },
+                    "required": ["index", "hiring", "usa"]
+                }
+            }
+        }
+    params = {}
+    if 'key=' not in (GEMINI_API_URL or ''):
+        params = {"key": GEMINI_API_KEY}
+    headers = {"Content-Type": "application/json"}
+    if stats is not None:
+        with _ai_cache_stats_lock:
+            stats['batch_requests'] = stats.get('batch_requests', 0) + 1
+            stats['batched_posts'] = stats.get('batched_posts', 0) + len(texts)
+    try:
+        resp = _gemini_post(GEMINI_API_URL, params=params, headers=headers, json=payload, timeout=timeout)
+        if resp.status_code == 400 and 'generationConfig' in payload and _schema_rejected(resp):
+            # Some API versions reject responseSchema; retry this batch relying on the prompt alone, and only
+            # stop sending the schema once that retry shows the schema was the problem
+            logger.info('AI batch: responseSchema rejected (HTTP 400); retrying without it')
+            payload.pop('generationConfig', None)
+            resp = _gemini_post(GEMINI_API_URL, params=params, headers=headers, json=payload, timeout=timeout)
+            if resp.ok:
+                _batch_schema_supported = False
+        resp.raise_for_status()
+        data = resp.json()
+        out_text = ''
+        try:
+            out_text = data['candidates'][0]['content']['parts'][0]['text']
+        except Exception:
+            pass
+        cleaned = (out_text or '').strip()
+        if cleaned.startswith('```'):
+            cleaned = cleaned.strip('`').replace('json\n', '').replace('json\r\n', '')
+        try:
+            arr = json.loads(cleaned)
+        except Exception:
+            m = re.search(r"\[[\s\S]*\]", cleaned)
+            arr = None
+            if m:
+                try:
+                    arr = json.loads(m.group(0))
+                except Exception:
+                    arr = None
+        if isinstance(arr, dict):
+            arr = arr.get('results') or arr.get('items') or []
+        if not isinstance(arr, list):
+            logger.warning('AI batch: could not parse response; falling back to per-post calls')
+            return {}
+        out = {}
+        for item in arr:
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item.get('index'))
+            except Exception:
+                continue
+            if idx < 0 or idx >= len(texts) or idx in out or 'hiring' not in item or 'usa' not in item:
+                continue
+            hiring = bool(item.get('hiring'))
+            usa = bool(item.get('usa'))
+            reason = str(item.get('reason') or '')
+            out[idx] = ((hiring and usa), reason or ('hiring=%s usa=%s' % (hiring, usa)))
+        return out
+    except CircuitOpen:
+        return {}
+    except Exception as e:
+        emsg = str(e)
+        # Avoid leaking full URLs with query params
+        if 'http' in emsg and '?' in emsg:
+            emsg = emsg.split('?', 1)[0]
+        logger.warning(f"AI batch error: {emsg[:120]}; falling back to per-post calls")
+        return {}
+
+
+def _ai_is_usa_hiring_post_uncached(text: str, timeout: int = 20) -> tuple[bool, str]:
     global GEMINI_API_URL
     """Call Gemini to determine if a post is about hiring in the USA.
 
@@ -451,7 +858,7 @@ def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
         if 'key=' not in (GEMINI_API_URL or ''):
             params = {"key": GEMINI_API_KEY}
         headers = {"Content-Type": "application/json"}
-        resp = requests.post(GEMINI_API_URL, params=params, headers=headers, json=payload, timeout=timeout)
+        resp = _gemini_post(GEMINI_API_URL, params=params, headers=headers, json=payload, timeout=timeout)
         try:
             resp.raise_for_status()
         except requests.HTTPError as http_err:
@@ -464,11 +871,15 @@ def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
                 pass
             # If 404 model not found/unsupported, try to resolve a supported model and retry once
             if code == 404:
-                # 1) Resolve a working model for this key (preferring flash)
-                try:
-                    resolved_url, why = _resolve_gemini_model_url(prefer='flash')
-                except Exception:
-                    resolved_url, why = None, 'resolve-exception'
+                # 1) Prefer a model another worker already resolved; else resolve one for this key (preferring flash)
+                persisted = _get_persisted_gemini_model()
+                if persisted and persisted['url'] != _redact_model_url(GEMINI_API_URL):
+                    resolved_url, why = persisted['url'], 'persisted'
+                else:
+                    try:
+                        resolved_url, why = _resolve_gemini_model_url(prefer='flash')
+                    except Exception:
+                        resolved_url, why = None, 'resolve-exception'
                 for candidate_url in [resolved_url, None]:
                     try_url = candidate_url or None
                     # If resolution failed, try simply swapping API version v1 <-> v1beta
@@ -484,7 +895,7 @@ def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
                     if not try_url or try_url == GEMINI_API_URL:
                         continue
                     try:
-                        r2 = requests.post(try_url, params=params, headers=headers, json=payload, timeout=timeout)
+                        r2 = _gemini_post(try_url, params=params, headers=headers, json=payload, timeout=timeout)
                         r2.raise_for_status()
                         data2 = r2.json()
                         out_text2 = ''
@@ -505,9 +916,11 @@ def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
                             hiring = bool(obj2.get('hiring'))
                             usa = bool(obj2.get('usa'))
                             reason2 = str(obj2.get('reason') or '')
-                            # Update global URL so future requests use the working endpoint
+                            # Update global URL so future requests use the working endpoint,
+                            # and persist it so other workers and restarts skip the discovery
                             try:
                                 GEMINI_API_URL = try_url
+                                _persist_gemini_model_url(try_url, info=why if try_url == resolved_url else 'version-swap')
                             except Exception:
                                 pass
                             return (hiring and usa), reason2 or ('hiring=%s usa=%s' % (hiring, usa))
@@ -548,6 +961,8 @@ def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
         usa = bool(obj.get('usa'))
         reason = str(obj.get('reason') or '')
         return (hiring and usa), reason or ('hiring=%s usa=%s' % (hiring, usa))
+    except CircuitOpen:
+        return _degraded_verdict(text)
     except Exception as e:
         emsg = str(e)
         # Avoid leaking full URLs with query params
@@ -557,9 +972,473 @@ def ai_is_usa_hiring_post(text: str, timeout: int = 20) -> tuple[bool, str]:
         logger.warning(f"AI filter error: {reason}")
         return True, reason
 
+def _apply_local_guards(text: str, keep: bool, reason: str) -> tuple[bool, str]:
+    """Post-AI guards: drop obvious training/promo and disallowed (non-USA) locations."""
+    if not keep:
+        return keep, reason
+    found = match_post_terms(text)
+    # Extra guard: filter out obvious training/promo if not clearly hiring
+    try:
+        if is_promo_training(text, found) and not seems_hiring(text, found):
+            keep = False
+            reason = (reason or '') + ' | promo-training'
+    except Exception:
+        pass
+    # Disallow specific non-USA locations
+    try:
+        if keep:
+            bad_loc = is_disallowed_location(text, found)
+            if bad_loc:
+                keep = False
+                reason = (reason or '') + f' | non-usa-location: {bad_loc}'
+    except Exception:
+        pass
+    return keep, reason
+
+
+_AI_UNRELIABLE_REASONS = ('ai-error', 'ai-parse-failed', 'ai-disabled', 'ai-degraded', 'local-model')
+
+
+def _local_training_data() -> tuple[list, list]:
+    """(texts, labels) for the local pre-classifier from stored Gemini verdicts and sent jobs.
+
+    Verdict history supplies both outcomes; sent jobs with a real AI reason are positives.
+    Fallback/heuristic verdicts are skipped so the model only learns from Gemini.
+    """
+    texts, labels, seen = [], [], set()
+    try:
+        for row in get_ai_verdict_history(limit=AI_CACHE_MAX_ENTRIES):
+            if (row.get('reason') or '').startswith(_AI_UNRELIABLE_REASONS) or row['key'] in seen:
+                continue
+            seen.add(row['key'])
+            texts.append(row['text'])
+            labels.append(1 if row['keep'] else 0)
+    except Exception:
+        logger.exception('Local classifier: failed reading AI verdict history')
+    try:
+        for job in get_all_sent_jobs():
+            reason = (job.get('ai_reason') or '').strip()
+            text = job.get('raw_text') or job.get('text') or ''
+            if not reason or reason.startswith(_AI_UNRELIABLE_REASONS) or not text:
+                continue
+            key = _ai_cache_key(text)
+            if key in seen:
+                continue
+            seen.add(key)
+            texts.append(text[:4000])
+            labels.append(1)
+    except Exception:
+        logger.exception('Local classifier: failed reading sent jobs')
+    return texts, labels
+
+
+def _train_local_classifier() -> bool:
+    """Retrain the local pre-classifier from the current verdict history. Returns True if it is enabled."""
+    if not LOCAL_CLASSIFIER_ENABLED:
+        _local_classifier.stats.update({'enabled': False, 'reason': 'disabled by LOCAL_CLASSIFIER_ENABLED'})
+        return False
+    try:
+        started = time.time()
+        texts, labels = _local_training_data()
+        enabled = _local_classifier.fit(texts, labels)
+        _local_classifier.stats['trained_seconds'] = round(time.time() - started, 2)
+        logger.info(f"Local classifier: {'enabled' if enabled else 'off'} ({_local_classifier.stats})")
+        return enabled
+    except Exception:
+        logger.exception('Local classifier: training failed; every post will go to Gemini')
+        _local_classifier.model = None
+        _local_classifier.stats.update({'enabled': False, 'reason': 'training failed'})
+        return False
+
+
+def _record_local_stats(stats: dict | None, decided: int, total: int):
+    if stats is None or not total:
+        return
+    with _ai_cache_stats_lock:
+        stats['local_decided'] = stats.get('local_decided', 0) + decided
+        stats['local_seen'] = stats.get('local_seen', 0) + total
+        stats['local_share'] = round(stats['local_decided'] / stats['local_seen'], 3)
+
+
+def filter_candidate_posts(texts: list, ai_enabled: bool, stats: dict | None = None) -> list:
+    """Decide whether scraped posts should be kept. Returns a list of (keep, reason) per text.
+
+    With AI enabled, posts the local pre-classifier scores confidently are decided locally and only
+    the uncertain rest is sent (batched) to Gemini; all verdicts then pass the local promo/location
+    guards. Without AI only the local heuristics apply. stats receives the AI cache/batch counters
+    and local_decided/local_seen/local_share for the cascade.
+    """
+    if ai_enabled:
+        verdicts = _local_classifier.decide(texts)
+        todo = [i for i, v in enumerate(verdicts) if v is None]
+        _record_local_stats(stats, len(texts) - len(todo), len(texts))
+        if todo:
+            for i, v in zip(todo, ai_classify_batch([texts[i] for i in todo], stats=stats)):
+                verdicts[i] = v
+        return [_apply_local_guards(t, keep, reason) for t, (keep, reason) in zip(texts, verdicts)]
+    out = []
+    for text in texts:
+        # Without AI: drop promo/training if not hiring-like
+        try:
+            found = match_post_terms(text)
+            if is_promo_training(text, found) and not seems_hiring(text, found):
+                out.append((False, 'promo-training'))
+                continue
+            bad_loc = is_disallowed_location(text, found)
+            if bad_loc:
+                out.append((False, f'non-usa-location: {bad_loc}'))
+                continue
+        except Exception:
+            pass
+        out.append((True, ''))
+    return out
+
+
+def filter_candidate_post(text: str, ai_enabled: bool, stats: dict | None = None) -> tuple[bool, str]:
+    """Single-post form of filter_candidate_posts."""
+    return filter_candidate_posts([text], ai_enabled, stats=stats)[0]
+
+
+def _load_sent_job_ids() -> set:
+    """Ids of jobs already emailed: DB ids unioned with the legacy JSON file."""
+    try:
+        # Union DB ids with file-based ids (fallback) so a transient DB error doesn't cause duplicates
+        sent_job_ids = set(get_sent_job_ids() or set())
+    except Exception:
+        # fallback to file-based approach if DB fails
+        logger.exception('Scraper: Failed to read sent job ids from DB; falling back to JSON file')
+        sent_job_ids = set()
+    # Also read JSON file to add to the set (regardless) for extra safety
+    try:
+        if os.path.exists(SENT_JOBS_FILE):
+            with open(SENT_JOBS_FILE, 'r', encoding='utf-8') as f:
+                sent_jobs = json.load(f) or []
+            for job in sent_jobs:
+                jid = (job.get('id') or '').strip()
+                if jid:
+                    sent_job_ids.add(jid)
+    except Exception:
+        logger.exception('Scraper: Ignoring errors reading file-based sent jobs while unioning ids')
+    return sent_job_ids
+
+
+def _build_sender_pool(gmail_user, gmail_pass) -> list:
+    """Sender pool from settings['senders'], falling back to the single env credentials."""
+    settings_local = load_settings() or {}
+    senders = []
+    try:
+        configured = settings_local.get('senders')
+        if configured and isinstance(configured, list) and configured:
+            for s in configured:
+                # Expect structure: {'user':..., 'pass':..., 'host': 'smtp.example.com', 'port': 465, 'use_ssl': True}
+                user = s.get('user') or s.get('email')
+                pwd = s.get('pass') or s.get('password')
+                host = s.get('host') or os.getenv('SMTP_HOST') or 'smtp.gmail.com'
+                port = int(s.get('port') or os.getenv('SMTP_PORT') or (465))
+                use_ssl = bool(s.get('use_ssl') if 'use_ssl' in s else True)
+                if user and pwd:
+                    senders.append({'user': user, 'pass': pwd, 'host': host, 'port': port, 'use_ssl': use_ssl})
+    except Exception:
+        logger.exception('Scraper: Failed to parse configured senders; falling back to env')
+
+    if not senders:
+        # fallback to single configured env credentials for backward-compat
+        if gmail_user and gmail_pass:
+            senders = [{'user': gmail_user, 'pass': gmail_pass, 'host': os.getenv('SMTP_HOST') or 'smtp.gmail.com', 'port': int(os.getenv('SMTP_PORT') or 465), 'use_ssl': True}]
+        else:
+            raise RuntimeError('No sender credentials configured (settings.senders or GMAIL_USER/GMAIL_PASS)')
+    return senders
+
+
+def _send_job_email(job: dict, sender: dict, recipient_emails: str):
+    """Compose and send the notification email for one job. Raises on SMTP failures."""
+    short_id = job['id'][:8]
+    ts = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+    # Try to extract a role/title for a clearer subject
+    role = extract_role_from_text(job.get('raw_text') or job.get('text') or '')
+    if role:
+        subject = f"New job found: \"{role}\" — found in \"{job['group_name']}\" [{short_id}-{ts}]"
+    else:
+        subject = f"New LinkedIn Job Lead: From '{job['group_name']}' [{short_id}-{ts}]"
+    contacts = ''
+    if job.get('emails'):
+        contacts += 'Emails: ' + ', '.join(job.get('emails')) + '\n'
+    if job.get('phones'):
+        contacts += 'Phones: ' + ', '.join(job.get('phones')) + '\n'
+    # Compose message: include cleaned content and always attach the full raw post so the recipient
+    # can read and decide. Also set Reply-To to the first extracted contact email when available.
+    content = job.get('text') or ''
+    raw = job.get('raw_text') or ''
+    # Always append the raw post after a separator so recipient has full context
+    if raw and raw.strip() and raw.strip() != (content or '').strip():
+        full_content = f"{content}\n\n----- Full Raw Post -----\n{raw}"
+    else:
+        full_content = content
+    if job.get('ai_reason'):
+        full_content = f"{full_content}\n\n(AI reason: {job.get('ai_reason')})"
+    body = (
+        f"A new potential job opportunity was found.\n\n"
+        f"Group: {job['group_name']}\nGroup URL: {job['group_url']}\n"
+        f"------------------------------------\n\n{full_content}\n\n{contacts}"
+    )
+    msg = MIMEText(body)
+    msg['Subject'] = subject
+    msg['From'] = sender['user']
+    # If an extracted contact exists, set Reply-To so recipient's Reply will go to that contact
+    reply_to = None
+    try:
+        extracted_contacts = (job.get('emails') or [])
+        if extracted_contacts:
+            reply_to = extracted_contacts[0]
+    except Exception:
+        reply_to = None
+    if reply_to:
+        try:
+            msg['Reply-To'] = reply_to
+        except Exception:
+            pass
+    msg['To'] = recipient_emails
+    # Add a stable X-Job-ID header so recipients can correlate messages
+    try:
+        msg_id = f"<{uuid.uuid4()}@linkedin-scraper>"
+        msg['Message-ID'] = msg_id
+        msg['X-Job-ID'] = job['id']
+    except Exception:
+        logger.exception('Scraper: Failed to set message headers')
+
+    # Sanitize recipient list and log attempt (masking sensitive parts)
+    recipients_raw = recipient_emails or ''
+    recipient_list = [r.strip() for r in (recipients_raw.split(',') if recipients_raw else []) if r.strip()]
+    logger.info(f"Scraper: Attempting send: sender={sender.get('user')} to recipients={recipient_list}")
+    if not recipient_list:
+        logger.warning('Scraper: No recipients configured; skipping send for job id %s', job.get('id'))
+        return
+    # Send using the chosen sender credentials (login per-send for simplicity)
+    if sender.get('use_ssl'):
+        server = smtplib.SMTP_SSL(sender.get('host'), int(sender.get('port')))
+    else:
+        server = smtplib.SMTP(sender.get('host'), int(sender.get('port')))
+        server.starttls()
+    try:
+        server.login(sender.get('user'), sender.get('pass'))
+        server.sendmail(sender.get('user'), recipient_list, msg.as_string())
+        server.quit()
+    except smtplib.SMTPAuthenticationError as e:
+        logger.exception('SMTP auth failed for sender %s', sender.get('user'))
+        try:
+            scraper_status['last_smtp_error'] = f'auth:{str(e)}'
+        except Exception:
+            pass
+        raise
+    except Exception as e:
+        logger.exception('SMTP send failed for sender %s', sender.get('user'))
+        try:
+            scraper_status['last_smtp_error'] = f'send:{str(e)}'
+        except Exception:
+            pass
+        raise
+
+
+# Reuse a model URL resolved by another worker or a previous run, then keep it fresh in the background
+try:
+    _persisted_model = _get_persisted_gemini_model() if (GEMINI_API_KEY and GEMINI_API_URL) else None
+    if _persisted_model:
+        GEMINI_API_URL = _persisted_model['url']
+        logger.info(f"Using persisted Gemini model URL ({_persisted_model.get('info') or 'persisted'})")
+except Exception:
+    logger.exception('Failed to load persisted Gemini model URL')
+if GEMINI_API_KEY and GEMINI_API_URL and GEMINI_MODEL_REFRESH_SECONDS > 0:
+    threading.Thread(target=_gemini_model_refresher, name='gemini-model-refresh', daemon=True).start()
+
+
+_account_limiter = AccountLimiter(SCRAPER_MAX_PER_ACCOUNT)
+# Chrome binary / chromedriver path, resolved once per process (webdriver-manager may hit the network) and
+# remembered across restarts in settings under this key
+CHROME_SETUP_SETTINGS_KEY = 'chrome_setup'
+_chrome_setup = {}
+_chrome_setup_lock = threading.Lock()
+# Browser startup per run: how long until the first navigation could be issued, and whether a warm browser was used
+STARTUP_STATS = {'runs': 0, 'warm_starts': 0, 'cold_starts': 0, 'last_first_navigation_seconds': None, 'avg_first_navigation_seconds': None}
+scraper_status.setdefault('startup', STARTUP_STATS)
+
+
+def _load_source_cursors():
+    if not SOURCE_CURSORS_ENABLED:
+        return {}
+    try:
+        return get_source_cursors()
+    except Exception:
+        logger.exception('Scraper: Failed to load source cursors; scrolling without them')
+        return {}
+
+
+def _save_source_cursors(posts, handled):
+    """Advance each source's cursor past the posts this run handled (see db.source_cursor_targets); returns how many moved."""
+    if not SOURCE_CURSORS_ENABLED:
+        return 0
+    moved = 0
+    for source, num in source_cursor_targets(posts, handled).items():
+        try:
+            when = activity_time(num)
+            if advance_source_cursor(source, num, when.isoformat() if when else None):
+                moved += 1
+        except Exception:
+            logger.exception(f'Scraper: Failed to advance cursor for {source}')
+    return moved
+
+
+def _linkedin_url(url, base_url=None):
+    """A site path ('/feed/') or linkedin.com URL (e.g. a saved group URL) on base_url (default LINKEDIN_BASE_URL)."""
+    base = (base_url or LINKEDIN_BASE_URL).rstrip('/')
+    if url.startswith('/'):
+        return base + url
+    return re.sub(r'^https?://(?:www\.)?linkedin\.com', base, url, flags=re.IGNORECASE)
+
+
+def _resolve_chrome_setup():
+    """(Chrome binary, chromedriver path) for new browsers; binary is None when Chrome isn't installed.
+
+    Resolved once per process. The result and both versions are also kept in settings
+    (CHROME_SETUP_SETTINGS_KEY), so later processes only re-run webdriver-manager when the
+    installed Chrome version changed. A missing Chrome is not cached, so installing it needs no
+    restart. chromedriver path None leaves the driver lookup to Selenium.
+    """
+    with _chrome_setup_lock:
+        if _chrome_setup:
+            return _chrome_setup['binary'], _chrome_setup['chromedriver']
+        try:
+            cached = (db_get_settings() or {}).get(CHROME_SETUP_SETTINGS_KEY)
+        except Exception:
+            logger.exception('Failed reading cached Chrome setup from settings')
+            cached = None
+        entry = resolve_chrome(cached if isinstance(cached, dict) else None, install=lambda: ChromeDriverManager().install())
+        if not entry['binary']:
+            return None, None
+        logger.info(f"Scraper: Chrome {entry['binary_version']} at {entry['binary']}; chromedriver {entry['chromedriver_version']} at {entry['chromedriver'] or '(Selenium lookup)'} [{entry['source']}]")
+        if entry['source'] != 'cache' and entry['chromedriver']:
+            try:
+                db_save_settings({CHROME_SETUP_SETTINGS_KEY: {k: v for k, v in entry.items() if k != 'source'}})
+            except Exception:
+                logger.exception('Failed persisting resolved Chrome setup')
+        _chrome_setup.update(entry)
+        scraper_status['chrome_setup'] = dict(entry)
+        return entry['binary'], entry['chromedriver']
+
+
+def _new_chrome(user_data_dir=None):
+    """Start a Chrome with the scraper's options (own chromedriver service); CDP resource blocking applied."""
+    binary, chromedriver_path = _resolve_chrome_setup()
+    opts = build_chrome_options(headless=SCRAPER_HEADLESS, window_size=SCRAPER_WINDOW_SIZE, block=SCRAPER_BLOCK_RESOURCES, user_data_dir=user_data_dir)
+    if binary:
+        opts.binary_location = binary
+    drv = webdriver.Chrome(service=Service(executable_path=chromedriver_path) if chromedriver_path else Service(), options=opts)
+    apply_resource_blocking(drv, SCRAPER_BLOCK_RESOURCES)
+    return drv
+
+
+def _launch_warm_browser():
+    """Warm pool factory: a started browser, signed in with the configured account's stored session when possible."""
+    if not _resolve_chrome_setup()[0]:
+        return None
+    drv = _new_chrome()
+    account = ''
+    try:
+        user = (load_settings() or {}).get('linkedin_user') or os.getenv('LINKEDIN_USER') or ''
+        stored = get_linkedin_session(user) if (WARM_BROWSER_SIGN_IN and SESSION_PERSISTENCE and user) else None
+        if stored and set_cookies(drv, stored['cookies']):
+            if _linkedin_signed_in(drv):
+                account = _account_key(user)
+            else:
+                # Expired session: hand it out as a plain browser
+                drv.delete_all_cookies()
+    except Exception:
+        logger.exception('Warm browser: pre-sign-in failed; keeping it as a plain browser')
+    return drv, account
+
+
+_warm_pool = WarmBrowserPool(_launch_warm_browser, size=WARM_BROWSERS) if WARM_BROWSERS > 0 else None
+if _warm_pool is not None:
+    scraper_status.setdefault('warm_browsers', _warm_pool.stats)
+    atexit.register(_warm_pool.close)
+    _warm_pool.start()
+else:
+    # Still resolve chromedriver at boot so the first run doesn't wait on webdriver-manager
+    threading.Thread(target=_resolve_chrome_setup, name='chrome-setup', daemon=True).start()
+
+
+def _linkedin_signed_in(driver, base_url=None, timeout=5):
+    """Session probe: true when the browser holds an li_at cookie and the feed loads without a bounce to login/authwall/checkpoint."""
+    names = cookie_names(driver)
+    if names is not None and 'li_at' not in names:
+        # No session cookie at all: skip the page load
+        return False
+    driver.get(_linkedin_url('/feed/', base_url))
+    wait_until(driver, lambda d: d.execute_script('return document.readyState') == 'complete', timeout, should_stop=_assert_not_stopped)
+    url = (driver.current_url or '').lower()
+    return '/feed' in url and not any(m in url for m in ('/login', '/authwall', '/uas/', '/checkpoint', '/signup'))
+
+
+def _restore_linkedin_session(driver, account, base_url=None):
+    """'profile' or 'cookies' when the browser is signed in without a password login, else None."""
+    try:
+        if _linkedin_signed_in(driver, base_url):
+            return 'profile'
+        stored = get_linkedin_session(account) if account else None
+        if stored and set_cookies(driver, stored['cookies']) and _linkedin_signed_in(driver, base_url):
+            return 'cookies'
+    except StopRequested:
+        raise
+    except Exception:
+        logger.exception('Scraper: Session probe failed; using password login')
+    return None
+
+
+def _save_linkedin_session(driver, account):
+    """Store the signed-in browser's cookies for the next run (only once LinkedIn has issued li_at)."""
+    try:
+        cookies = driver.get_cookies()
+        if account and any(c.get('name') == 'li_at' for c in cookies):
+            return save_linkedin_session(account, cookies)
+    except Exception:
+        logger.exception('Scraper: Failed to save LinkedIn session')
+    return False
+
+
+def _new_harvester(selectors, strict, max_expand):
+    """PostHarvester for reading posts at every scroll step, or None (SCRAPER_HARVEST_DURING_SCROLL off, or not the script extractor)."""
+    if not SCRAPER_HARVEST_DURING_SCROLL or SCRAPER_EXTRACTOR != 'script':
+        return None
+    return PostHarvester(selectors, strict=strict, max_expand=max_expand)
+
+
+def _read_page_posts(driver, selectors, strict, max_expand, api_capture=None, meter=None, harvester=None):
+    """Posts on the current page, via the injected script, the page source (SCRAPER_EXTRACTOR=html)
+    or the captured API responses (SCRAPER_EXTRACTOR=api, needs api_capture and its NetworkMeter).
+    With a harvester, the posts it collected while scrolling (the script runs once more if it got none)."""
+    if harvester is not None:
+        items = harvester.finish()
+        if items:
+            return items
+    if SCRAPER_EXTRACTOR == 'api' and api_capture is not None:
+        items = api_capture.collect(driver, meter)
+        if items:
+            return items
+        VOYAGER_STATS['fallbacks'] += 1
+        logger.info('Scraper: no posts in the captured API responses; falling back to the DOM script')
+    elif SCRAPER_EXTRACTOR == 'html':
+        try:
+            return extract_post_items(driver.page_source, selectors, base_url=driver.current_url)
+        except Exception:
+            logger.exception('Scraper: page_source parsing failed; falling back to the DOM script')
+    return extract_posts(driver, selectors, strict=strict, max_expand=max_expand)
+
+
 # The main function that does all the work, adapted for Flask
-def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linkedin_pass, delay_seconds=10, send_separately=True, groups=None, keywords=None, require_keywords=False, use_keywords_search=False, hold_emails_only=False):
-    """This function runs in a separate thread to avoid blocking the web server."""
+def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linkedin_pass, delay_seconds=10, send_separately=True, groups=None, keywords=None, require_keywords=False, use_keywords_search=False, hold_emails_only=False, base_url=None):
+    """This function runs in a separate thread to avoid blocking the web server.
+
+    base_url overrides LINKEDIN_BASE_URL for this run (e.g. a fake_linkedin.py server).
+    """
     global scraper_status
     scraper_status['is_running'] = True
     scraper_status['progress'] = 'Starting scraper...'
@@ -567,56 +1446,93 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
 
     # Clear any previous stop request when starting a fresh run
     stop_event.clear()
+    run_started_at = time.time()
+    driver = None
+    extra_drivers = []
+    pipe = None
 
     try:
         # --- Selenium Setup ---
         _assert_not_stopped()
         scraper_status['progress'] = 'Setting up browser...'
         logger.info('Scraper: Setting up browser...')
-        chrome_options = Options()
-        # Comment out the line below to see the browser in action
-        # chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-
-        # Try to find Chrome binary in common Windows locations (helps when Chrome isn't on PATH)
-        chrome_paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe")
-        ]
-        chrome_found = False
-        for p in chrome_paths:
-            if os.path.exists(p):
-                chrome_options.binary_location = p
-                logger.info(f"Scraper: Found Chrome binary at {p}")
-                chrome_found = True
-                break
-
-        if not chrome_found:
-            # Give a clear message both in terminal and UI status
-            msg = (
-                "Chrome browser binary not found. Please install Google Chrome or set the path to your "
-                "chrome.exe in the code (chrome_options.binary_location). Common Windows paths are: "
-                "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe or your user AppData path."
-            )
-            logger.error('Scraper: ' + msg)
-            scraper_status['progress'] = msg
-            scraper_status['is_running'] = False
-            return
-
-        # Use webdriver-manager to automatically download/locate chromedriver
-        try:
-            chromedriver_path = ChromeDriverManager().install()
-            service = Service(executable_path=chromedriver_path)
-            logger.info(f'Scraper: Using chromedriver at {chromedriver_path}')
-        except Exception:
-            # Fallback: assume chromedriver is on PATH
-            logger.warning('Scraper: webdriver-manager failed, falling back to PATH for chromedriver')
-            service = Service()
-
-        _assert_not_stopped()
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        # SCRAPER_HEADLESS=true for the lean headless profile; the default headed browser lets you watch it work
+        profile_dir = None
+        driver = _warm_pool.take(linkedin_user) if _warm_pool is not None else None
+        warm_start = driver is not None
+        if warm_start:
+            # Warm browsers run without the account's Chrome profile; the stored cookies carry the session
+            logger.info('Scraper: Using a pre-launched browser')
+        else:
+            if not _resolve_chrome_setup()[0]:
+                # Give a clear message both in terminal and UI status
+                msg = (
+                    "Chrome browser binary not found. Please install Google Chrome or Chromium, or set CHROME_BIN "
+                    "to its path (e.g. /usr/bin/google-chrome or "
+                    "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe)."
+                )
+                logger.error('Scraper: ' + msg)
+                scraper_status['progress'] = msg
+                scraper_status['is_running'] = False
+                return
+            if SESSION_PERSISTENCE and linkedin_user:
+                profile_dir = account_profile_dir(CHROME_PROFILE_ROOT, linkedin_user)
+                try:
+                    os.makedirs(profile_dir, exist_ok=True)
+                except Exception:
+                    logger.warning(f'Scraper: Cannot create Chrome profile dir {profile_dir}; using a fresh profile')
+                    profile_dir = None
+            _assert_not_stopped()
+            try:
+                driver = _new_chrome(user_data_dir=profile_dir)
+            except Exception:
+                if not profile_dir:
+                    raise
+                # Typically the profile is locked by another Chrome; the stored cookies still let us skip the login
+                logger.warning(f'Scraper: Chrome failed to start with profile {profile_dir}; retrying with a fresh profile', exc_info=True)
+                profile_dir = None
+                driver = _new_chrome()
+        first_nav = round(time.time() - run_started_at, 2)
+        STARTUP_STATS['runs'] += 1
+        STARTUP_STATS['warm_starts' if warm_start else 'cold_starts'] += 1
+        prev_avg = STARTUP_STATS['avg_first_navigation_seconds'] or 0.0
+        STARTUP_STATS['avg_first_navigation_seconds'] = round(prev_avg + (first_nav - prev_avg) / STARTUP_STATS['runs'], 2)
+        STARTUP_STATS['last_first_navigation_seconds'] = first_nav
+        logger.info(f"Scraper: Browser ready {first_nav}s after start ({'warm' if warm_start else 'cold'} start)")
+        blocked_patterns = apply_resource_blocking(driver, SCRAPER_BLOCK_RESOURCES)
+        # Bytes/requests per source from the CDP performance log, plus page-load timing
+        net_meter = NetworkMeter()
+        net_totals = {
+            'headless': SCRAPER_HEADLESS, 'blocked_categories': list(SCRAPER_BLOCK_RESOURCES) if blocked_patterns else [],
+            'kb_transferred': 0.0, 'requests': 0, 'blocked_requests': 0, 'sources': 0,
+        }
+        scraper_status['network'] = net_totals
+        api_capture = None
+        if SCRAPER_EXTRACTOR == 'api':
+            api_capture = VoyagerCapture()
+            net_meter.add_listener(api_capture.on_event)
+        main_worker = BrowserWorker(driver, net_meter, api_capture, 'browser-0')
+        net_lock = threading.Lock()
+
+        def start_source_metrics(worker):
+            # Count whatever loaded since the last source (login, redirects) in the totals only
+            net = worker.meter.drain(worker.driver)
+            if net:
+                with net_lock:
+                    net_totals['kb_transferred'] = round(net_totals['kb_transferred'] + net['bytes'] / 1024, 1)
+                    net_totals['requests'] += net['requests']
+                    net_totals['blocked_requests'] += net['blocked']
+            if worker.api_capture is not None:
+                worker.api_capture.clear()
+
+        def finish_source_metrics(worker):
+            m = source_metrics(worker.driver, worker.meter)
+            with net_lock:
+                net_totals['sources'] += 1
+                net_totals['kb_transferred'] = round(net_totals['kb_transferred'] + (m.get('kb_transferred') or 0), 1)
+                net_totals['requests'] += m.get('requests') or 0
+                net_totals['blocked_requests'] += m.get('blocked_requests') or 0
+            return {k: m.get(k) for k in ('load_ms', 'kb_transferred', 'requests', 'blocked_requests')}
 
         # Helper: check for common LinkedIn human verification / checkpoint pages
         def is_human_verification_page(drv):
@@ -641,18 +1557,34 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
         scraper_status['progress'] = 'Logging into LinkedIn...'
         logger.info('Scraper: Logging into LinkedIn...')
         _assert_not_stopped()
-        driver.get("https://www.linkedin.com/login")
-        time.sleep(2)
-        _assert_not_stopped()
-        driver.find_element(By.ID, "username").send_keys(linkedin_user)
-        driver.find_element(By.ID, "password").send_keys(linkedin_pass)
-        driver.find_element(By.XPATH, '//*[@type="submit"]').click()
-        time.sleep(5) # Wait for login and redirect
+        login_started = time.time()
+        # Reuse the account's session (Chrome profile, else stored cookies) when it is still signed in
+        login_method = _restore_linkedin_session(driver, linkedin_user, base_url) if SESSION_PERSISTENCE else None
+        if login_method:
+            logger.info(f'Scraper: Reusing LinkedIn session from the {login_method}; skipping password login')
+        else:
+            login_method = 'password'
+            driver.get(_linkedin_url('/login', base_url))
+            wait_until(driver, lambda d: d.find_elements(By.ID, "username"), 2, should_stop=_assert_not_stopped)
+            driver.find_element(By.ID, "username").send_keys(linkedin_user)
+            driver.find_element(By.ID, "password").send_keys(linkedin_pass)
+            driver.find_element(By.XPATH, '//*[@type="submit"]').click()
+            # Wait for login and redirect: done once we have left the login/submit URLs and the next page has loaded
+            wait_until(
+                driver,
+                lambda d: '/login' not in (d.current_url or '') and d.execute_script('return document.readyState') == 'complete',
+                5,
+                should_stop=_assert_not_stopped,
+            )
+        scraper_status['login'] = {'method': login_method, 'seconds': round(time.time() - login_started, 2), 'profile': bool(profile_dir)}
 
         # After login, detect if LinkedIn has challenged with human verification.
         # If so, pause the scraper and wait until the verification page clears, then auto-resume.
         if is_human_verification_page(driver):
-            scraper_status['progress'] = 'Waiting: LinkedIn requested human verification. Complete it in the opened browser; the scraper will resume automatically.'
+            if SCRAPER_HEADLESS:
+                scraper_status['progress'] = 'Waiting: LinkedIn requested human verification, but the browser is headless. Run headed (SCRAPER_HEADLESS=false) to complete it, or resume via /admin/resume-scraper.'
+            else:
+                scraper_status['progress'] = 'Waiting: LinkedIn requested human verification. Complete it in the opened browser; the scraper will resume automatically.'
             scraper_status['paused_for_human_verification'] = True
             logger.warning('Scraper: Human verification detected. Waiting for completion to auto-resume...')
 
@@ -694,436 +1626,282 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
             scraper_status['paused_for_human_verification'] = False
             scraper_status['progress'] = 'Human verification completed; resuming scraping...'
 
-        # --- Scrape via Keyword Search (Posts -> Sort: Latest) ---
-        all_job_posts = []
+        # Store the cookies after every successful sign-in so a rotated li_at is picked up too
+        if SESSION_PERSISTENCE and _save_linkedin_session(driver, linkedin_user):
+            logger.info(f'Scraper: Saved LinkedIn session cookies for the next run (signed in via {login_method})')
+
+        # --- Pipeline: scrape -> classify -> dedupe -> send ---
+        # This thread drives the browser and feeds bounded queues; classification, dedupe and
+        # SMTP sending run on their own workers so emails go out while groups are still scrolling.
         _assert_not_stopped()
         scraper_status['groups_summary'] = []
         scraper_status['last_found_total'] = 0
         scraper_status['last_sent_count'] = 0
         scraper_status['last_sent_to'] = ''
+        scraper_status['first_email_seconds'] = None
 
-        # regex to match recent time indicators like '2h', '5 hr', '10m', 'just now', etc.
-        recent_time_re = re.compile(r"\b\d+\s*(?:h|hr|m|min)\b|just now|\bjust now\b|\b\d+\s*min\b", re.IGNORECASE)
-
-        # --- Scrape Home Feed (when no keywords/search/groups provided) ---
+        _flag_settings = load_settings() or {}
+        ai_enabled = bool(_flag_settings.get('ai_filter_enabled', AI_FILTER_ENABLED_DEFAULT))
         try:
-            # Use the function parameters `keywords` and `groups` here (they exist earlier)
-            if (not use_keywords_search) and (not keywords or str(keywords).strip() == '') and not groups:
-                _assert_not_stopped()
-                scraper_status['progress'] = 'Scraping LinkedIn Home feed...'
-                logger.info('Scraper: Scraping LinkedIn Home feed')
-                # Also print an explicit marker so the terminal shows it even if logging is misconfigured
-                print('[SCRAPER-DEBUG] Entered home feed branch')
-                try:
-                    # Try to dismiss common cookie/consent banners which can hide the feed
-                    for txt in ('Accept cookies', 'Accept all', 'Accept', 'I agree', 'Agree'):
-                        try:
-                            btns = driver.find_elements(By.XPATH, f"//button[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{txt.lower()}')]")
-                            for b in btns[:2]:
-                                try:
-                                    b.click()
-                                    logger.info(f"Scraper: Clicked cookie/consent button '{txt}'")
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                try:
-                    driver.get('https://www.linkedin.com/feed/')
-                except Exception:
-                    # sometimes LinkedIn redirects; continue with current page
-                    pass
-                time.sleep(4)
-
-                # gentle scroll to load content
-                for _ in range(4):
-                    _assert_not_stopped()
-                    try:
-                        driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
-                    except Exception:
-                        pass
-                    for __ in range(15):
-                        if stop_event.is_set():
-                            _assert_not_stopped()
-                        time.sleep(0.1)
-
-                posts = []
-                try:
-                    posts = driver.find_elements(By.CSS_SELECTOR, 'article, .feed-shared-update-v2')
-                except Exception:
-                    posts = []
-
-                logger.info(f"Scraper: Found {len(posts)} raw post elements in home feed")
-                print(f'[SCRAPER-DEBUG] Found posts count: {len(posts)}')
-                recent_count = 0
-                sample_texts = []
-                for post in posts:
-                    _assert_not_stopped()
-                    try:
-                        # Expand possible 'See more' buttons
-                        more_buttons = post.find_elements(By.XPATH, ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'see more') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'more')]")
-                        for b in more_buttons[:2]:
-                            try:
-                                b.click(); time.sleep(0.1)
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-
-                    post_text = (post.text or '').strip()
-                    if not post_text:
-                        continue
-                    # Skip non-recent posts
-                    if not bool(recent_time_re.search(post_text)):
-                        continue
-
-                    # Basic cleaning similar to group scraping
-                    lines = [l.strip() for l in post_text.splitlines() if l.strip()]
-                    cleaned_lines = []
-                    prev = None
-                    in_comment_section = False
-                    for l in lines:
-                        low = l.lower()
-                        if not in_comment_section:
-                            if low == '1 comment' or bool(re.match(r"^\d+\s+comments?$", low)):
-                                in_comment_section = True
-                                continue
-                        if in_comment_section:
-                            continue
-                        if low.startswith('like') or low.startswith('likes') or low.startswith('comment') or low.startswith('comments') or 'share' in low:
-                            continue
-                        if prev is not None and l == prev:
-                            continue
-                        cleaned_lines.append(l)
-                        prev = l
-                    cleaned_text = '\n'.join(cleaned_lines).strip()
-
-                    # extract contacts
-                    emails, phones = extract_contacts_from_text(cleaned_text)
-                    if not emails and not phones:
-                        emails2, phones2 = extract_contacts_from_text(post_text)
-                        if emails2:
-                            emails = emails2
-                        if phones2:
-                            phones = phones2
-
-                    # anchors
-                    try:
-                        anchors = post.find_elements(By.TAG_NAME, 'a')
-                        stable_id = _extract_linkedin_activity_id_from_anchors(anchors)
-                        if not stable_id:
-                            stable_id = f"txt:{hashlib.sha256(_normalize_text_for_id(post_text).encode('utf-8')).hexdigest()}"
-                    except Exception:
-                        stable_id = f"txt:{hashlib.sha256(_normalize_text_for_id(post_text).encode('utf-8')).hexdigest()}"
-
-                    job = {
-                        'text': cleaned_text or post_text,
-                        'raw_text': post_text,
-                        'emails': emails,
-                        'phones': phones,
-                        'group_name': 'Home Feed',
-                        'group_url': 'https://www.linkedin.com/feed/',
-                        'id': stable_id,
-                        'ai_reason': ''
-                    }
-                    all_job_posts.append(job)
-                    recent_count += 1
-                    if len(sample_texts) < 5:
-                        sample_texts.append((cleaned_text or post_text)[:400])
-
-                try:
-                    gs = scraper_status.get('groups_summary', [])
-                    gs.append({'name': 'Home Feed', 'url': 'https://www.linkedin.com/feed/', 'recent_count': recent_count})
-                    scraper_status['groups_summary'] = gs
-                    scraper_status['last_found_total'] = len(all_job_posts)
-                    scraper_status['sample_posts'] = sample_texts
-                    # If we found nothing, save a screenshot for debugging and update status
-                    if len(posts) == 0:
-                        try:
-                            path = _save_live_screenshot(driver)
-                            msg = f'No posts found on feed; saved screenshot to {path}'
-                            scraper_status['progress'] = msg
-                            logger.info('Scraper: ' + msg)
-                            print('[SCRAPER-DEBUG] ' + msg)
-                        except Exception:
-                            scraper_status['progress'] = 'No posts found on feed; failed saving screenshot'
-                            print('[SCRAPER-DEBUG] Failed saving screenshot for empty feed')
-                except Exception:
-                    pass
+            scraper_status['ai_filter_enabled'] = ai_enabled
         except Exception:
-            logger.exception('Scraper: Error while scraping home feed')
-
-        def try_click_posts_and_sort_latest(drv, timeout: int = 15, slow: bool = False):
-            wait = WebDriverWait(drv, timeout)
-            logger.info('Scraper: Trying to activate Posts tab and set Sort by -> Latest%s', ' (slow mode)' if slow else '')
-            # Slow mode timing helpers
-            pause_short = 0.2 if not slow else 0.5
-            pause_med = 0.3 if not slow else 0.8
-            pause_long = 1.5 if not slow else 2.2
-            # Step 1: Open content type menu and click Posts
-            try:
-                # Find the content-type pill (the one that shows All/People/Jobs/Posts/etc.) and open it
-                ct_button_candidates = drv.find_elements(
-                    By.XPATH,
-                    "//button[.//span[normalize-space()='Posts'] and contains(@class,'artdeco')]|"
-                    "//button[.//span[normalize-space()='All']]|//button[.//span[normalize-space()='People']]|//button[.//span[normalize-space()='Jobs']]|//button[.//span[normalize-space()='Companies']]|//button[.//span[normalize-space()='Groups']]"
-                )
-                if not ct_button_candidates:
-                    # Fallback: any button near the action bar that contains 'Posts' text
-                    ct_button_candidates = drv.find_elements(By.XPATH, "//div[contains(@class,'action-bar') or contains(@class,'search-reusables')]//button[contains(., 'Posts')]")
-                if ct_button_candidates:
-                    ct_btn = ct_button_candidates[0]
-                    try:
-                        drv.execute_script("arguments[0].scrollIntoView({block:'center'});", ct_btn)
-                    except Exception:
-                        pass
-                    try:
-                        ct_btn.click()
-                    except Exception:
-                        try:
-                            drv.execute_script("arguments[0].click();", ct_btn)
-                        except Exception:
-                            pass
-                    time.sleep(pause_med)
-                    # Click the Posts option from the opened menu
-                    try:
-                        posts_opt = None
-                        # Look for exact Posts label within menu/listbox
-                        menus = drv.find_elements(By.XPATH, "//*[@role='menu' or @role='listbox' or contains(@class,'artdeco-dropdown')]")
-                        for m in menus[:3] if menus else []:
-                            opts = m.find_elements(By.XPATH, ".//span[normalize-space()='Posts']")
-                            if opts:
-                                posts_opt = opts[0]
-                                break
-                        if posts_opt is None:
-                            # Global fallback
-                            opts = drv.find_elements(By.XPATH, "//span[normalize-space()='Posts']")
-                            if opts:
-                                posts_opt = opts[0]
-                        if posts_opt is not None:
-                            try:
-                                ActionChains(drv).move_to_element(posts_opt).pause(0.05).click(posts_opt).perform()
-                            except Exception:
-                                try:
-                                    drv.execute_script("arguments[0].click();", posts_opt)
-                                except Exception:
-                                    pass
-                            time.sleep(pause_med)
-                        # Close menu if still open
-                        try:
-                            drv.switch_to.active_element.send_keys(Keys.ESCAPE)
-                        except Exception:
-                            pass
-                    except Exception:
-                        pass
-            except Exception:
-                logger.exception('Scraper: Failed to select Posts content type')
-
-            # Open Sort by menu (try multiple times to handle sticky headers)
-            trigger_xpath = (
-                # Button near the Posts pill (case-insensitive)
-                "//button[.//span[translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')='sort by']] | "
-                "//button[translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')='sort by'] | "
-                "//*[@role='button'][.//span[translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')='sort by'] or translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')='sort by'] | "
-                "//div[contains(@class,'search') or contains(@class,'action-bar') or contains(@class,'filters')]//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'sort by')]"
-            )
-            # Small scroll up to ensure header controls are visible
-            try:
-                drv.execute_script('window.scrollTo(0, 0);')
-                time.sleep(pause_short)
-            except Exception:
-                pass
+            pass
+        if ai_enabled:
+            # Pick up verdicts stored since the last run before any post is classified
+            _train_local_classifier()
+        # 'avoided' counts Gemini calls skipped because the post was already sent or already classified this run;
+        # 'local_*' counts posts the local pre-classifier decided without Gemini
+        ai_stats = {'kept': 0, 'skipped': 0, 'errors': 0, 'avoided': 0, 'degraded': 0, 'cache_hits': 0, 'cache_misses': 0, 'cache_hit_rate': 0.0, 'batch_requests': 0, 'batched_posts': 0, 'local_decided': 0, 'local_seen': 0, 'local_share': 0.0}
+        scraper_status['ai_filter_stats'] = ai_stats
+        stats_lock = threading.Lock()
+        run_started = time.time()
+
+        # In-memory sent-id index, loaded once per run and extended as emails go out
+        sent_job_ids = _load_sent_job_ids()
+        classified_ids = set()
+        seen_ids = set()
+        unique_emails = set()
+        hold_unique = {}
+        sent_jobs_local = []
+        send_state = {'senders': None, 'error': None, 'attempts': 0}
+        # Source cursors: loaded once, advanced only after the pipeline has drained (see _save_source_cursors)
+        cursors = _load_source_cursors()
+        # posts: source -> {job id: activity id}; handled: job ids emailed, already sent or rejected by the filters
+        cursor_state = {'posts': {}, 'handled': set()}
+        cursor_stats = {'sources': len(cursors), 'skipped_posts': 0, 'advanced': 0}
+        scraper_status['source_cursors'] = cursor_stats
+
+        def note_cursor(source, job):
+            # Remember each source's posts by activity id; the cursor may only pass the ones that get handled
+            num = activity_number(job.get('id'))
+            if num is None:
+                return
+            with stats_lock:
+                cursor_state['posts'].setdefault(source, {})[job['id']] = num
+
+        def mark_handled(job):
+            if job.get('id'):
+                with stats_lock:
+                    cursor_state['handled'].add(job['id'])
+
+        def below_cursor(cursor_num, job):
+            num = activity_number(job.get('id'))
+            if cursor_num and num is not None and num <= cursor_num:
+                with stats_lock:
+                    cursor_stats['skipped_posts'] += 1
+                return True
+            return False
 
-            for attempt in range(4):
-                triggers = drv.find_elements(By.XPATH, trigger_xpath)
-                if not triggers:
-                    try:
-                        drv.execute_script('window.scrollBy(0, -200);')
-                    except Exception:
-                        pass
-                    time.sleep(0.3)
+        def classify_stage(batch):
+            # Dedupe by stable id before paying for a Gemini round trip
+            todo = []
+            for job in batch:
+                jid = job.get('id')
+                with stats_lock:
+                    already = bool(jid) and (jid in sent_job_ids or jid in classified_ids)
+                    if jid and jid in sent_job_ids:
+                        cursor_state['handled'].add(jid)
+                    if jid:
+                        classified_ids.add(jid)
+                    if already and ai_enabled:
+                        ai_stats['avoided'] += 1
+                if not already:
+                    todo.append(job)
+            if not todo:
+                return
+            verdicts = filter_candidate_posts([j.get('raw_text') or j.get('text') or '' for j in todo], ai_enabled, stats=ai_stats)
+            for job, (keep, reason) in zip(todo, verdicts):
+                if ai_enabled:
+                    with stats_lock:
+                        ai_stats['kept' if keep else 'skipped'] += 1
+                        if reason.startswith('ai-error'):
+                            ai_stats['errors'] += 1
+                        elif reason.startswith('ai-degraded'):
+                            ai_stats['degraded'] += 1
+                if not keep:
+                    # A rejection only counts as handled when Gemini judged the post: not on an AI error, nor
+                    # the keyword stand-in used while the breaker is open (a retry once it closes may keep it)
+                    if not reason.startswith(('ai-error', 'ai-degraded')):
+                        mark_handled(job)
                     continue
-                sort_trigger = triggers[0]
-                try:
-                    drv.execute_script("arguments[0].scrollIntoView({block:'center'});", sort_trigger)
-                except Exception:
-                    pass
-                try:
-                    sort_trigger.click()
-                except Exception:
-                    try:
-                        drv.execute_script("arguments[0].click();", sort_trigger)
-                    except Exception:
-                        pass
-                # Wait for a dropdown/menu container to appear
-                time.sleep(pause_short)
-                # Choose 'Latest/Recent' in the menu (handles radio + 'Show results')
-                latest_xpath = (
-                    "//div[contains(@class,'artdeco-dropdown') or contains(@class,'overflow') or contains(@class,'artdeco') or contains(@class,'ember-view')] | "
-                    "//*[@role='dialog'] | //*[@role='menu'] | //*[@role='listbox'] | //div[contains(@class,'dropdown') or contains(@class,'menu')]"
-                )
+                job['ai_reason'] = reason
+                pipe.put('dedupe', job)
+
+        def dedupe_stage(job):
+            scraper_status['last_found_total'] = scraper_status.get('last_found_total', 0) + 1
+            jid = job.get('id')
+            if jid and jid in sent_job_ids:
+                mark_handled(job)
+            if not jid or jid in sent_job_ids or jid in seen_ids:
+                return
+            seen_ids.add(jid)
+            # prefer job['emails'] (list); if empty, try extracting from text
+            emails = job.get('emails') or []
+            if not emails:
                 try:
-                    containers = drv.find_elements(By.XPATH, latest_xpath)
+                    emails, _ = extract_contacts_from_text(job.get('text') or job.get('raw_text') or '')
                 except Exception:
-                    containers = []
-                # Search within overlays for a label/button/span with text Latest
-                clicked_latest = False
-                for c in containers[:3] if containers else []:
-                    try:
-                        # Prefer menuitemradio/option to inspect aria-checked
-                        latest_opts = c.find_elements(By.XPATH,
-                            ".//*[self::span or self::*[@role='menuitemradio' or @role='option']]["
-                            "contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'latest') or "
-                            "contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'most recent')"
-                            "]"
-                        )
-                        if latest_opts:
-                            el = latest_opts[0]
-                            # If the element is a span inside a menuitem, click the ancestor item instead
-                            try:
-                                if el.tag_name.lower() == 'span':
-                                    ancestor = el.find_element(By.XPATH, "ancestor::*[@role='menuitemradio' or @role='option' or self::button][1]")
-                                    if ancestor:
-                                        el = ancestor
-                            except Exception:
-                                pass
-                            # Determine if already selected via aria-checked on self or ancestor
-                            selected = False
-                            try:
-                                if (el.get_attribute('aria-checked') or '').lower() == 'true':
-                                    selected = True
-                                else:
-                                    ac = el.find_elements(By.XPATH, "ancestor-or-self::*[@aria-checked='true']")
-                                    selected = len(ac) > 0
-                            except Exception:
-                                selected = False
-                            if selected:
-                                logger.info('Scraper: Latest appears already selected inside menu')
-                                clicked_latest = True
-                                break
-                            try:
-                                drv.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-                            except Exception:
-                                pass
-                            try:
-                                ActionChains(drv).move_to_element(el).pause(0.05).click(el).perform()
-                                clicked_latest = True
-                                logger.info('Scraper: Clicked Latest option')
-                                time.sleep(pause_short)
-                                break
-                            except Exception:
-                                try:
-                                    drv.execute_script("arguments[0].click();", el)
-                                    clicked_latest = True
-                                    logger.info('Scraper: Clicked Latest option via JS')
-                                    time.sleep(pause_short)
-                                    break
-                                except Exception:
-                                    pass
-                        # If not clicked yet, try a keyboard fallback (Down, Down, Enter)
-                        if not clicked_latest:
-                            try:
-                                active = drv.switch_to.active_element
-                                active.send_keys(Keys.ARROW_DOWN)
-                                time.sleep(pause_short)
-                                active.send_keys(Keys.ARROW_DOWN)
-                                time.sleep(pause_short)
-                                active.send_keys(Keys.ENTER)
-                                clicked_latest = True
-                                logger.info('Scraper: Selected Latest via keyboard fallback')
-                                time.sleep(pause_short)
-                            except Exception:
-                                pass
-                    except Exception:
-                        continue
+                    emails = []
+            for e in emails:
+                key = (e or '').strip().lower()
+                if not key:
+                    continue
+                unique_emails.add(key)
+                if hold_emails_only and key not in hold_unique:
+                    hold_unique[key] = {
+                        'email': key,
+                        'job_id': job.get('id'),
+                        'group_name': job.get('group_name'),
+                        'group_url': job.get('group_url'),
+                        'snippet': (job.get('text') or '')[:500]
+                    }
+            scraper_status['extracted_emails_count'] = len(unique_emails)
+            scraper_status['extracted_emails_sample'] = list(unique_emails)[:5]
+            if not hold_emails_only:
+                pipe.put('send', job)
 
-                # If a "Show results" button exists, click it
+        def send_stage(job):
+            if send_state['error']:
+                return
+            if send_state['senders'] is None:
                 try:
-                    show_btns = drv.find_elements(By.XPATH, "//button[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'show results')]")
-                    if show_btns:
-                        try:
-                            show_btns[0].click()
-                            logger.info('Scraper: Clicked Show results')
-                        except Exception:
-                            drv.execute_script("arguments[0].click();", show_btns[0])
-                        time.sleep(pause_short)
-                except Exception:
-                    pass
-
-                # Quick visible-label verification: does the Sort by trigger show 'Latest'?
+                    send_state['senders'] = _build_sender_pool(gmail_user, gmail_pass)
+                except Exception as e:
+                    # Without senders nothing can be sent; remember the error and drop the rest
+                    send_state['error'] = str(e)
+                    logger.exception('Scraper: Email sending/login error')
+                    return
+            senders = send_state['senders']
+            i = send_state['attempts']
+            if i > 0:
+                # Stop-aware delay between emails
+                waited = 0.0
+                step = 0.1
+                total = max(0.0, float(delay_seconds))
+                while waited < total:
+                    if stop_event.is_set():
+                        _assert_not_stopped()
+                    time.sleep(step)
+                    waited += step
+            send_state['attempts'] = i + 1
+            # Rotate senders across messages (round-robin)
+            sender = senders[i % len(senders)]
+            logger.info(f'Scraper: Sending email {i+1} (job id {job["id"][:60]})...')
+            try:
+                _send_job_email(job, sender, recipient_emails)
+                # Persist this job to DB immediately so it won't be re-sent
                 try:
-                    triggers_now = drv.find_elements(By.XPATH, trigger_xpath)
-                    if triggers_now:
-                        label = (triggers_now[0].text or '').strip().lower()
-                        if 'latest' in label:
-                            logger.info("Scraper: Sort trigger label shows 'Latest'; treating as selected")
-                            try:
-                                scraper_status['sort_status'] = 'recent-selected'
-                            except Exception:
-                                pass
-                            return
+                    if add_sent_job(job):
+                        logger.info(f"Scraper: Persisted sent job id {job['id'][:60]} to DB immediately")
+                    else:
+                        logger.info(f"Scraper: Sent job id {job['id'][:60]} already exists or failed to persist")
                 except Exception:
-                    pass
+                    logger.exception('Scraper: Failed to persist sent job to DB immediately')
+                sent_jobs_local.append(job)
+                sent_job_ids.add(job['id'])
+                mark_handled(job)
+                scraper_status['last_sent_count'] = len(sent_jobs_local)
+                scraper_status['last_sent_to'] = recipient_emails
+                if scraper_status.get('first_email_seconds') is None:
+                    scraper_status['first_email_seconds'] = round(time.time() - run_started, 1)
+                logger.info(f"Scraper: Email sent for job id {job['id'][:60]} using sender {sender.get('user')}")
+            except Exception:
+                logger.exception(f"Scraper: Failed to send email for job id {job['id'][:60]} using sender {sender.get('user')}")
+                # Not marked handled, so the source's cursor stays below this post and it is seen again next run
+
+        pipe = Pipeline(stop_event=stop_event)
+        # Classification takes posts in batches so one Gemini request covers up to AI_BATCH_SIZE posts
+        pipe.add_stage('classify', classify_stage, workers=CLASSIFY_WORKERS, maxsize=PIPELINE_QUEUE_SIZE, batch_size=AI_BATCH_SIZE, batch_wait=AI_BATCH_WAIT_SECONDS)
+        pipe.add_stage('dedupe', dedupe_stage, workers=1, maxsize=PIPELINE_QUEUE_SIZE)
+        if not hold_emails_only:
+            # A single sender worker keeps delay_seconds spacing and round-robin order intact
+            pipe.add_stage('send', send_stage, workers=1, maxsize=PIPELINE_QUEUE_SIZE)
+        scraper_status['pipeline'] = pipe.stats()
+        pipe.start()
 
-                # Verify by reopening menu and inspecting aria-checked if needed
+        # --- Scrape Home Feed (when no keywords/search/groups provided) ---
+        try:
+            # Use the function parameters `keywords` and `groups` here (they exist earlier)
+            if (not use_keywords_search) and (not keywords or str(keywords).strip() == '') and not groups:
+                _assert_not_stopped()
+                scraper_status['progress'] = 'Scraping LinkedIn Home feed...'
+                logger.info('Scraper: Scraping LinkedIn Home feed')
+                # Also print an explicit marker so the terminal shows it even if logging is misconfigured
+                print('[SCRAPER-DEBUG] Entered home feed branch')
                 try:
-                    # Re-open menu and verify 'Recent/Latest' is selected via aria-checked
-                    try:
-                        sort_trigger.click()
-                    except Exception:
-                        drv.execute_script("arguments[0].click();", sort_trigger)
-                    time.sleep(pause_med)
-                    containers = drv.find_elements(By.XPATH, latest_xpath)
-                    verified = False
-                    for c in containers[:3] if containers else []:
+                    # Try to dismiss common cookie/consent banners which can hide the feed
+                    for txt in ('Accept cookies', 'Accept all', 'Accept', 'I agree', 'Agree'):
                         try:
-                            latest_verified = c.find_elements(By.XPATH, ".//*[@aria-checked='true' and (contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'latest') or .//span[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'latest')])]")
-                            if latest_verified:
-                                logger.info('Scraper: Verified Latest selected via aria-checked')
+                            btns = driver.find_elements(By.XPATH, f"//button[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{txt.lower()}')]")
+                            for b in btns[:2]:
                                 try:
-                                    scraper_status['sort_status'] = 'recent-selected'
+                                    b.click()
+                                    logger.info(f"Scraper: Clicked cookie/consent button '{txt}'")
                                 except Exception:
                                     pass
-                                verified = True
-                                break
-                        except Exception:
-                            continue
-                    if verified:
-                        # Close menu by pressing Escape
-                        try:
-                            drv.switch_to.active_element.send_keys(Keys.ESCAPE)
                         except Exception:
                             pass
-                        return
                 except Exception:
                     pass
-                # Close any open overlays with ESC before retrying
+                feed_url = _linkedin_url('/feed/', base_url)
+                start_source_metrics(main_worker)
                 try:
-                    drv.switch_to.active_element.send_keys(Keys.ESCAPE)
-                    time.sleep(pause_short)
+                    driver.get(feed_url)
                 except Exception:
+                    # sometimes LinkedIn redirects; continue with current page
                     pass
-                # try next attempt
-            logger.warning('Scraper: Failed to set Sort by -> Latest/Recent after retries; leaving current order unchanged')
-            try:
-                scraper_status['sort_status'] = 'recent-not-selected'
-            except Exception:
-                pass
+                feed_selectors = ['article, .feed-shared-update-v2']
+                wait_for_posts(driver, feed_selectors, timeout=4, should_stop=_assert_not_stopped)
+
+                # gentle scroll until the feed reaches back past the lookback window; each step returns once
+                # new posts render or the page goes idle
+                # (reading posts before each step, so the ones the feed drops off-screen are kept)
+                harvester = _new_harvester(feed_selectors, strict=False, max_expand=2)
+                scroll = scroll_through_lookback(driver, feed_selectors, LOOKBACK_MINUTES, fixed_steps=4, max_steps=SCROLL_MAX_STEPS, step_timeout=1.5, should_stop=_assert_not_stopped, on_step=harvester.harvest if harvester else None)
+                logger.info(f"Scraper: Home feed scrolled {scroll['steps']} time(s), stopped on {scroll['reason']} (oldest {scroll['oldest_minutes']} min)")
+
+                # One round trip: expand 'See more' and read text/links of every post as plain data
+                posts = _read_page_posts(driver, feed_selectors, strict=False, max_expand=2, api_capture=api_capture, meter=net_meter, harvester=harvester)
+                feed_metrics = finish_source_metrics(main_worker)
+                if harvester is not None:
+                    feed_metrics.update(harvester.summary())
+
+                logger.info(f"Scraper: Found {len(posts)} raw post elements in home feed (new per scroll step: {feed_metrics.get('posts_per_step', 'n/a')})")
+                print(f'[SCRAPER-DEBUG] Found posts count: {len(posts)}')
+                recent_count = 0
+                sample_texts = []
+                for post in posts:
+                    _assert_not_stopped()
+                    # Skips empty/non-recent posts; basic cleaning, contacts and stable id
+                    job = build_job(post, 'feed', 'Home Feed', feed_url, max_age_minutes=LOOKBACK_MINUTES)
+                    if job is None:
+                        continue
+                    # Home feed posts are not AI-filtered; hand them straight to dedupe
+                    pipe.put('dedupe', job)
+                    recent_count += 1
+                    if len(sample_texts) < 5:
+                        sample_texts.append(job['text'][:400])
 
-        def extract_contacts_from_text(t: str):
-            # Stricter email pattern to avoid false positives like 'October@9'
-            email_re = re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,15}\b")
-            emails = email_re.findall(t or '')
-            if not emails and t:
-                # Tolerant collapse for 'name @ domain . com' patterns
-                collapsed = re.sub(r"\s*@\s*", "@", t)
-                collapsed = re.sub(r"\s*\.\s*", ".", collapsed)
-                emails = email_re.findall(collapsed)
-            phones = re.findall(r"\+?\d[\d\-\s().]{6,}\d", t or '')
-            emails = list(dict.fromkeys(emails))
-            phones = list(dict.fromkeys(phones))
-            return emails, phones
+                try:
+                    gs = scraper_status.get('groups_summary', [])
+                    gs.append({'name': 'Home Feed', 'url': feed_url, 'recent_count': recent_count, 'scrolls': scroll['steps'], 'scroll_stop': scroll['reason'], **feed_metrics})
+                    scraper_status['groups_summary'] = gs
+                    scraper_status['sample_posts'] = sample_texts
+                    # If we found nothing, save a screenshot for debugging and update status
+                    if len(posts) == 0:
+                        try:
+                            path = _save_live_screenshot(driver)
+                            msg = f'No posts found on feed; saved screenshot to {path}'
+                            scraper_status['progress'] = msg
+                            logger.info('Scraper: ' + msg)
+                            print('[SCRAPER-DEBUG] ' + msg)
+                        except Exception:
+                            scraper_status['progress'] = 'No posts found on feed; failed saving screenshot'
+                            print('[SCRAPER-DEBUG] Failed saving screenshot for empty feed')
+                except Exception:
+                    pass
+        except Exception:
+            logger.exception('Scraper: Error while scraping home feed')
 
         def enforce_posts_and_sort_once(drv, order: str = 'top'):
             """Make a single, gentle attempt to ensure Posts tab and (optionally) Latest are visibly selected.
@@ -1145,7 +1923,7 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
                             posts_btn.click()
                         except Exception:
                             drv.execute_script("arguments[0].click();", posts_btn)
-                        time.sleep(0.3)
+                        wait_quiet(drv, timeout=0.3)
                 except Exception:
                     pass
 
@@ -1170,7 +1948,7 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
                                 sort_btn.click()
                             except Exception:
                                 drv.execute_script("arguments[0].click();", sort_btn)
-                            time.sleep(0.3)
+                            wait_quiet(drv, timeout=0.3)
                             opt = None
                             opts = drv.find_elements(By.XPATH, "//*[(@role='option' or @role='menuitemradio') and (contains(., 'Latest') or contains(., 'Recent'))] | //li[contains(., 'Latest') or contains(., 'Recent')] | //span[contains(., 'Latest') or contains(., 'Recent')]")
                             if opts:
@@ -1180,7 +1958,7 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
                                     opt.click()
                                 except Exception:
                                     drv.execute_script("arguments[0].click();", opt)
-                                time.sleep(0.3)
+                                wait_quiet(drv, timeout=0.3)
                             # If confirmation button appears, click once
                             try:
                                 show = drv.find_elements(By.XPATH, "//button[contains(., 'Show results')]")
@@ -1189,7 +1967,7 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
                                         show[0].click()
                                     except Exception:
                                         drv.execute_script("arguments[0].click();", show[0])
-                                    time.sleep(0.3)
+                                    wait_quiet(drv, timeout=0.3)
                             except Exception:
                                 pass
                     except Exception:
@@ -1197,507 +1975,235 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
             except Exception:
                 pass
 
-        # Heuristic terms to reduce training/promo posts if AI misses
-        promo_terms = (
-            # Training/education/promotions
-            'training', 'course', 'courses', 'bootcamp', 'boot camp', 'enroll', 'enrollment', 'register', 'registration',
-            'demo', 'free demo', 'webinar', 'workshop', 'tutorial', 'class', 'classes', 'coaching', 'mentorship',
-            'certificate', 'certification', 'mock interview', 'interview prep', 'interview preparation',
-            'linkedin optimization', 'resume service', 'resume writing', 'cv writing', 'portfolio review', 'career guidance',
-            'placement assistance', 'job support', 'proxy support', 'support available', 'training batch', 'new batch',
-            'promo', 'promotion', 'offer', 'discount', 'sale', 'paid course', 'learn', 'learning', 'upskill', 'reskill',
-            'join our training', 'guaranteed placement', 'internship training', 'fee', 'fees', 'tuition'
-        )
-        hiring_terms = (
-            # Strong hiring/recruiting intent signals
-            'hiring', 'actively hiring', 'hiring now', 'we are hiring', 'we’re hiring', 'immediate hiring',
-            'opening', 'openings', 'job opening', 'job openings', 'position', 'positions', 'role', 'roles',
-            'vacancy', 'vacancies', 'vacant', 'opportunity', 'opportunities', 'apply', 'apply now', 'send resume',
-            'send cv', 'share resume', 'share your resume', 'resume to', 'cv to', 'email your resume', 'refer candidates',
-            'looking for', 'we are looking for', 'seeking', 'need', 'required', 'requirement', 'requirements',
-            'recruiting', 'recruitment', 'recruiter', 'talent acquisition',
-            # Employment types and conditions
-            'contract', 'c2c', 'w2', '1099', 'full-time', 'full time', 'fulltime', 'part-time', 'part time', 'parttime',
-            'contract to hire', 'contract-to-hire', 'temp to perm', 'temp-to-perm', 'immediate joiners', 'start asap',
-            'onsite', 'on-site', 'remote', 'remote only', 'hybrid', 'work from home'
-        )
-        def is_promo_training(text: str) -> bool:
-            low = (text or '').lower()
-            return any(p in low for p in promo_terms)
-        def seems_hiring(text: str) -> bool:
-            low = (text or '').lower()
-            return any(h in low for h in hiring_terms)
-        def is_disallowed_location(text: str) -> str | None:
-            low = (text or '').lower()
-            # Exclude Puerto Rico explicitly per requirement (treat as non-USA)
-            if 'puerto rico' in low or '#hpepuertorico' in low or ' hpepuertorico' in low:
-                return 'puerto rico'
-            return None
-
         kw_list = []
         if keywords:
             kw_list = [k.strip() for k in str(keywords).split(',') if k.strip()]
 
-        _flag_settings = load_settings() or {}
-        ai_enabled = bool(_flag_settings.get('ai_filter_enabled', AI_FILTER_ENABLED_DEFAULT))
-        try:
-            scraper_status['ai_filter_enabled'] = ai_enabled
-        except Exception:
-            pass
-        ai_stats = {'kept': 0, 'skipped': 0, 'errors': 0}
-
-        if use_keywords_search and kw_list:
-            for kw in kw_list:
+        def scrape_search(worker, kw):
+            drv = worker.driver
+            _assert_not_stopped()
+            # Posts + Latest using LinkedIn's date_posted sort param (encoded quotes) + origin
+            search_url = _linkedin_url(
+                f"/search/results/content/?keywords={quote_plus(kw)}"
+                f"&origin=FACETED_SEARCH&sortBy=%22date_posted%22",
+                base_url,
+            )
+            scraper_status['progress'] = f"Searching posts for: {kw} (Latest by date posted)..."
+            logger.info(scraper_status['progress'])
+            source = f"search:{kw.lower()}"
+            cursor_num = (cursors.get(source) or {}).get('activity_id')
+            try:
                 _assert_not_stopped()
-                # Posts + Latest using LinkedIn's date_posted sort param (encoded quotes) + origin
-                search_url = (
-                    f"https://www.linkedin.com/search/results/content/?keywords={quote_plus(kw)}"
-                    f"&origin=FACETED_SEARCH&sortBy=%22date_posted%22"
-                )
-                scraper_status['progress'] = f"Searching posts for: {kw} (Latest by date posted)..."
-                logger.info(scraper_status['progress'])
+                start_source_metrics(worker)
+                drv.get(search_url)
+                search_selectors = ['.reusable-search__result-container', 'article, .feed-shared-update-v2']
+                wait_for_posts(drv, search_selectors, timeout=3, should_stop=_assert_not_stopped)
+                # One-shot Sort by → Latest (visual confirmation; no loops)
                 try:
-                    _assert_not_stopped()
-                    driver.get(search_url)
-                    time.sleep(3)
-                    # One-shot Sort by → Latest (visual confirmation; no loops)
-                    try:
-                        enforce_posts_and_sort_once(driver, order='latest')
-                    except Exception:
-                        pass
+                    enforce_posts_and_sort_once(drv, order='latest')
+                except Exception:
+                    pass
 
-                    # Scroll to load more
-                    for _ in range(3):
-                        _assert_not_stopped()
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        # Stop-aware sleep
-                        for __ in range(15):
-                            if stop_event.is_set():
-                                _assert_not_stopped()
-                            time.sleep(0.1)
-
-                    # Collect post containers (try multiple selectors)
-                    posts = []
-                    try:
-                        posts = driver.find_elements(By.CSS_SELECTOR, ".reusable-search__result-container")
-                    except Exception:
-                        posts = []
-                    if not posts:
-                        try:
-                            posts = driver.find_elements(By.CSS_SELECTOR, "article, .feed-shared-update-v2")
-                        except Exception:
-                            posts = []
-                    logger.info(f"Scraper: Search '{kw}' found {len(posts)} result elements")
+                # Scroll to load more, until results reach back past the lookback window
+                harvester = _new_harvester(search_selectors, strict=False, max_expand=2)
+                scroll = scroll_through_lookback(drv, search_selectors, LOOKBACK_MINUTES, fixed_steps=3, max_steps=SCROLL_MAX_STEPS, step_timeout=1.5, stop_at_activity=cursor_num, should_stop=_assert_not_stopped, on_step=harvester.harvest if harvester else None)
 
-                    recent_count = 0
-                    for post in posts:
-                        _assert_not_stopped()
-                        # Expand 'See more' to capture full text where possible
-                        try:
-                            more_buttons = post.find_elements(By.XPATH, ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'see more') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'more')]")
-                            for b in more_buttons[:2]:
-                                try:
-                                    b.click(); time.sleep(0.1)
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                        text = ''
-                        try:
-                            text = (post.text or '').strip()
-                        except Exception:
-                            text = ''
-                        if not text:
-                            continue
-                        if not bool(recent_time_re.search(text)):
-                            continue
-
-                        # AI filter: keep only USA hiring posts when enabled
-                        reason = ''
-                        if ai_enabled:
-                            keep, reason = ai_is_usa_hiring_post(text)
-                            # Extra guard: filter out obvious training/promo if not clearly hiring
-                            if keep and is_promo_training(text) and not seems_hiring(text):
-                                keep = False
-                                reason = (reason or '') + ' | promo-training'
-                            # Disallow specific non-USA locations
-                            if keep:
-                                bad_loc = is_disallowed_location(text)
-                                if bad_loc:
-                                    keep = False
-                                    reason = (reason or '') + f' | non-usa-location: {bad_loc}'
-                            if not keep:
-                                ai_stats['skipped'] += 1
-                                continue
-                            else:
-                                ai_stats['kept'] += 1
-                        else:
-                            # Without AI: drop promo/training if not hiring-like
-                            if is_promo_training(text) and not seems_hiring(text):
-                                continue
-                            bad_loc = is_disallowed_location(text)
-                            if bad_loc:
-                                continue
-
-                        emails, phones = extract_contacts_from_text(text)
-                        # Scan anchors for mailto:/tel: (search results often use anchors)
-                        try:
-                            anchors = post.find_elements(By.TAG_NAME, 'a')
-                            # Try to extract a stable LinkedIn id
-                            stable_id = _extract_linkedin_activity_id_from_anchors(anchors)
-                            for a in anchors:
-                                try:
-                                    href = (a.get_attribute('href') or '')
-                                    if href.startswith('mailto:'):
-                                        addr = href.split(':', 1)[1].split('?')[0]
-                                        if addr and addr not in emails:
-                                            emails.append(addr)
-                                    if href.startswith('tel:'):
-                                        tel = href.split(':', 1)[1]
-                                        if tel and tel not in phones:
-                                            phones.append(tel)
-                                except Exception:
-                                    pass
-                        except Exception:
-                            anchors = []
-                            stable_id = None
-                        # Build a stable id from activity if available; else normalized text
-                        if not stable_id:
-                            stable_id = f"txt:{hashlib.sha256((_normalize_text_for_id(text) + '|kw:' + kw).encode('utf-8')).hexdigest()}"
-                        jid = stable_id
-                        all_job_posts.append({
-                            'text': text,
-                            'raw_text': text,
-                            'emails': emails,
-                            'phones': phones,
-                            'group_name': f"Search: {kw}",
-                            'group_url': search_url,
-                            'id': jid,
-                            'ai_reason': reason
-                        })
-                        recent_count += 1
-
-                    # status summary line for UI
-                    try:
-                        gs = scraper_status.get('groups_summary', [])
-                        gs.append({'name': f"Search: {kw}", 'url': search_url, 'recent_count': recent_count})
-                        scraper_status['groups_summary'] = gs
-                        scraper_status['last_found_total'] = len(all_job_posts)
-                    except Exception:
-                        pass
+                # Collect post containers (first selector that matches) and expand 'See more', in one round trip
+                posts = _read_page_posts(drv, search_selectors, strict=False, max_expand=2, api_capture=worker.api_capture, meter=worker.meter, harvester=harvester)
+                search_metrics = finish_source_metrics(worker)
+                if harvester is not None:
+                    search_metrics.update(harvester.summary())
+                logger.info(f"Scraper: Search '{kw}' found {len(posts)} result elements after {scroll['steps']} scroll(s) ({scroll['reason']}; new per step: {search_metrics.get('posts_per_step', 'n/a')})")
+
+                recent_count = 0
+                for post in posts:
+                    _assert_not_stopped()
+                    # Only extraction happens here (text + mailto:/tel: links, activity id or keyword-salted
+                    # text hash); the AI/heuristic filter runs in the classify stage
+                    job = build_job(post, 'search', f"Search: {kw}", search_url, salt='|kw:' + kw, max_age_minutes=LOOKBACK_MINUTES)
+                    if job is None or below_cursor(cursor_num, job):
+                        continue
+                    note_cursor(source, job)
+                    pipe.put('classify', job)
+                    recent_count += 1
+
+                # status summary line for UI
+                try:
+                    gs = scraper_status.get('groups_summary', [])
+                    gs.append({'name': f"Search: {kw}", 'url': search_url, 'recent_count': recent_count, 'scrolls': scroll['steps'], 'scroll_stop': scroll['reason'], **search_metrics})
+                    scraper_status['groups_summary'] = gs
                 except Exception:
-                    logger.exception(f"Scraper: Error during keyword search for '{kw}'")
+                    pass
+            except StopRequested:
+                raise
+            except Exception as e:
+                if is_browser_crash(e):
+                    # run_sources retries the search once on a fresh browser
+                    raise
+                logger.exception(f"Scraper: Error during keyword search for '{kw}'")
 
         # --- Scrape Groups ---
         target_groups = groups if groups else []
+        # Keywords passed in (string) or None; compiled once into the post term matcher
+        group_kw_list = [k.strip().lower() for k in keywords.split(',') if k.strip()] if keywords else []
+        group_kw_matcher = build_post_matcher(group_kw_list) if group_kw_list else None
 
-        for group in target_groups:
+        def scrape_group(worker, group):
+            drv = worker.driver
             _assert_not_stopped()
             scraper_status['progress'] = f"Scraping group: {group['name']}..."
             logger.info(f"Scraper: Scraping group: {group['name']}...")
-            driver.get(group['url'])
-            time.sleep(4)
-
-            # Scroll to load more posts
-            for _ in range(3):
-                _assert_not_stopped()
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                # Stop-aware sleep
-                for __ in range(20):
-                    if stop_event.is_set():
-                        _assert_not_stopped()
-                    time.sleep(0.1)
-
-            posts = driver.find_elements(By.CSS_SELECTOR, ".feed-shared-update-v2")
-            logger.info(f"Scraper: Found {len(posts)} raw post elements in group '{group['name']}'")
-            recent_count = 0
-            sample_texts = []
-            for post in posts:
+            source = f"group:{group['url']}"
+            cursor_num = (cursors.get(source) or {}).get('activity_id')
+            try:
                 _assert_not_stopped()
-                # Try to expand the post if there's a 'See more' button/link so we get full text
-                try:
-                    see_more_buttons = post.find_elements(By.XPATH, ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'see more')]")
-                    for b in see_more_buttons:
-                        try:
-                            b.click()
-                            time.sleep(0.2)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-
-                post_text = post.text.strip()
-                if not post_text:
-                    continue
-
-                # Clean the post: remove UI artifacts like Likes, Comments, Shares and profile snippets
-                lines = [l.strip() for l in post_text.splitlines() if l.strip()]
-                cleaned_lines = []
-                prev = None
-                in_comment_section = False
-                for l in lines:
-                    low = l.lower()
-                    # Skip feed UI numbering like 'Feed post number 24'
-                    if low.startswith('feed post number'):
-                        continue
-                    # If we reach the comments header like '1 comment' or '2 comments', stop including further content
-                    if not in_comment_section:
-                        if low == '1 comment' or bool(re.match(r"^\d+\s+comments?$", low)):
-                            in_comment_section = True
-                            continue
-                    if in_comment_section:
-                        # Drop all subsequent lines from comments area
-                        continue
-                    # Skip social interaction lines
-                    if low.startswith('like') or low.startswith('likes') or low.startswith('comment') or low.startswith('comments') or 'share' in low:
-                        continue
-                    # Skip follow/connect/profile action lines
-                    if low.startswith('follow') or low.startswith('connect') or low.startswith('followed') or low.startswith('follow us'):
-                        continue
-                    # Remove premium indicators
-                    if 'premium' in low:
-                        continue
-                    # Skip small profile/headline fragments (heuristic)
-                    if len(l.split()) <= 3 and ('pronoun' in low or 'headline' in low or low.endswith('•')):
-                        continue
-                    # Skip degree/grade lines like '3rd', '2nd', '1st', '3rd+' etc if very short
-                    if re.search(r"\b\d+(st|nd|rd|th)\b", low) and len(l.split()) <= 4:
-                        continue
-                    # Skip common degree keywords
-                    if any(x in low for x in ('b.sc', 'bsc', 'm.sc', 'msc', 'bachelor', 'master', 'degree', 'mba', 'phd')):
-                        continue
-                    # Collapse consecutive duplicate lines (e.g., poster name repeated)
-                    if prev is not None and l == prev:
+                start_source_metrics(worker)
+                drv.get(_linkedin_url(group['url'], base_url))
+                group_selectors = ['.feed-shared-update-v2']
+                wait_for_posts(drv, group_selectors, timeout=4, should_stop=_assert_not_stopped)
+
+                # Scroll until the group's posts reach back past the lookback window (quiet groups stop early)
+                harvester = _new_harvester(group_selectors, strict=True, max_expand=0)
+                scroll = scroll_through_lookback(drv, group_selectors, LOOKBACK_MINUTES, fixed_steps=3, max_steps=SCROLL_MAX_STEPS, step_timeout=2, stop_at_activity=cursor_num, should_stop=_assert_not_stopped, on_step=harvester.harvest if harvester else None)
+
+                # Expand every 'See more' and read all posts in one round trip
+                posts = _read_page_posts(drv, group_selectors, strict=True, max_expand=0, api_capture=worker.api_capture, meter=worker.meter, harvester=harvester)
+                group_metrics = finish_source_metrics(worker)
+                if harvester is not None:
+                    group_metrics.update(harvester.summary())
+                logger.info(f"Scraper: Found {len(posts)} raw post elements in group '{group['name']}' after {scroll['steps']} scroll(s) ({scroll['reason']}; new per step: {group_metrics.get('posts_per_step', 'n/a')})")
+                recent_count = 0
+                sample_texts = []
+                for post in posts:
+                    _assert_not_stopped()
+                    # Strict cleaning (UI artifacts, profile snippets), recency check, de-obfuscated contacts with
+                    # mailto:/tel: links outside comments as fallback, stable id. The AI/heuristic filter runs
+                    # afterwards in the classify stage, off the browser thread.
+                    job = build_job(post, 'group', group['name'], group['url'], max_age_minutes=LOOKBACK_MINUTES)
+                    if job is None or below_cursor(cursor_num, job):
                         continue
-                    cleaned_lines.append(l)
-                    prev = l
-                cleaned_text = '\n'.join(cleaned_lines).strip()
+                    note_cursor(source, job)
 
-                # Determine whether this post looks recent using regex
-                is_recent = bool(recent_time_re.search(post_text))
-                if not is_recent:
-                    continue
-
-                # Keyword logic: keywords passed in (string) or None
-                kw_list = []
-                if keywords:
-                    kw_list = [k.strip().lower() for k in keywords.split(',') if k.strip()]
-
-                matches_keyword = False
-                if kw_list:
-                    for kw in kw_list:
-                        if kw in post_text.lower() or kw in cleaned_text.lower():
-                            matches_keyword = True
-                            break
-
-                # AI filter: keep only USA hiring posts when enabled
-                reason = ''
-                if ai_enabled:
-                    keep, reason = ai_is_usa_hiring_post(post_text)
-                    # Extra guard: filter out obvious training/promo if not clearly hiring
-                    try:
-                        if keep and is_promo_training(post_text) and not seems_hiring(post_text):
-                            keep = False
-                            reason = (reason or '') + ' | promo-training'
-                    except Exception:
-                        pass
-                    # Disallow specific non-USA locations
-                    try:
-                        if keep:
-                            bad_loc = is_disallowed_location(post_text)
-                            if bad_loc:
-                                keep = False
-                                reason = (reason or '') + f' | non-usa-location: {bad_loc}'
-                    except Exception:
-                        pass
-                    if not keep:
-                        ai_stats['skipped'] += 1
+                    # Keyword logic: one scan over raw + cleaned text with the run's keyword automaton
+                    matches_keyword = bool(group_kw_matcher is not None and group_kw_matcher.scan(job['raw_text'] + '\x00' + job['text']).get('keyword'))
+                    # "Require keywords": only posts mentioning one of the run's keywords go on to classify/send
+                    if require_keywords and group_kw_matcher is not None and not matches_keyword:
+                        mark_handled(job)
                         continue
-                    else:
-                        ai_stats['kept'] += 1
-                else:
-                    # Without AI: drop promo/training if not hiring-like
-                    try:
-                        if is_promo_training(post_text) and not seems_hiring(post_text):
-                            continue
-                        bad_loc = is_disallowed_location(post_text)
-                        if bad_loc:
-                            continue
-                    except Exception:
-                        pass
 
-                # Extract emails and phone numbers (robust). Also check for mailto:/tel: anchors inside the post DOM
-                def extract_contacts_from_text(t: str):
-                    # Stricter email regex to avoid false positives like 'October@9'
-                    email_re = re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,15}\b")
-                    txt = t or ''
-                    emails = email_re.findall(txt)
-                    # Try tolerant collapse and deobfuscation (at/dot)
-                    if not emails and txt:
-                        collapsed = re.sub(r"\s*@\s*", "@", txt)
-                        collapsed = re.sub(r"\s*\.\s*", ".", collapsed)
-                        emails = email_re.findall(collapsed)
-                    if not emails and txt:
-                        deob = re.sub(r"\bat\b", "@", txt, flags=re.IGNORECASE)
-                        deob = re.sub(r"\bdot\b", ".", deob, flags=re.IGNORECASE)
-                        emails = email_re.findall(deob)
-                    phones = re.findall(r"\+?\d[\d\-\s().]{6,}\d", txt)
-                    # normalize unique
-                    emails = list(dict.fromkeys(emails))
-                    phones = list(dict.fromkeys(phones))
-                    return emails, phones
-
-                # Prefer contacts from cleaned (no-comments) text; fallback to raw only if none
-                emails, phones = extract_contacts_from_text(cleaned_text)
-                if not emails and not phones:
-                    emails2, phones2 = extract_contacts_from_text(post_text)
-                    if emails2:
-                        emails = emails2
-                    if phones2:
-                        phones = phones2
-
-                # Check for mailto: and tel: links; avoid pulling from comment areas
+                    recent_count += 1
+                    pipe.put('classify', job)
+                    if job['emails']:
+                        logger.info(f"Scraper: Found emails in post: {job['emails']}")
+                    if len(sample_texts) < 3:
+                        sample_texts.append(job['text'][:300])
+
+                logger.info(f"Scraper: For group '{group['name']}' recent posts: {recent_count} (load {group_metrics['load_ms']} ms, {group_metrics['kb_transferred']} KB, {group_metrics['blocked_requests']} blocked)")
+                if sample_texts:
+                    logger.info(f"Scraper: Sample recent post(s) from '{group['name']}': {sample_texts}")
+                # update a concise group-level summary that the UI can read
                 try:
-                    anchors = post.find_elements(By.TAG_NAME, 'a')
-                    stable_id = _extract_linkedin_activity_id_from_anchors(anchors)
-                    # Only use anchor-based contacts if we didn't already extract from text
-                    if (not emails) and (not phones):
-                        contact_anchors = post.find_elements(
-                            By.XPATH,
-                            ".//a[starts-with(@href,'mailto:') or starts-with(@href,'tel:')][not(ancestor::*[contains(translate(@class,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'comment')])]"
-                        )
-                        for a in contact_anchors:
-                            try:
-                                href = (a.get_attribute('href') or '')
-                                if href.startswith('mailto:'):
-                                    addr = href.split(':', 1)[1].split('?')[0]
-                                    if addr and addr not in emails:
-                                        emails.append(addr)
-                                if href.startswith('tel:'):
-                                    tel = href.split(':', 1)[1]
-                                    if tel and tel not in phones:
-                                        phones.append(tel)
-                            except Exception:
-                                pass
+                    # append or update groups_summary for UI
+                    gs = scraper_status.get('groups_summary', [])
+                    gs.append({'name': group['name'], 'url': group['url'], 'recent_count': recent_count, 'scrolls': scroll['steps'], 'scroll_stop': scroll['reason'], **group_metrics})
+                    scraper_status['groups_summary'] = gs
                 except Exception:
-                    anchors = []
-                    stable_id = None
-
-                recent_count += 1
-                # compute a stable id: prefer LinkedIn activity/post path; else normalized text
-                if not stable_id:
-                    stable_id = f"txt:{hashlib.sha256(_normalize_text_for_id(post_text).encode('utf-8')).hexdigest()}"
-                hash_id = stable_id
-                job = {
-                    'text': cleaned_text or post_text,
-                    'raw_text': post_text,
-                    'emails': emails,
-                    'phones': phones,
-                    'group_name': group['name'],
-                    'group_url': group['url'],
-                    'id': hash_id,
-                    'ai_reason': reason
-                }
-                all_job_posts.append(job)
-                if emails:
-                    logger.info(f"Scraper: Found emails in post: {emails}")
-                if len(sample_texts) < 3:
-                    sample_texts.append((cleaned_text or post_text)[:300])
-
-            logger.info(f"Scraper: For group '{group['name']}' recent posts: {recent_count}")
-            if sample_texts:
-                logger.info(f"Scraper: Sample recent post(s) from '{group['name']}': {sample_texts}")
-            # update a concise group-level summary that the UI can read
+                    logger.exception('Scraper: failed to update groups_summary status')
+            except StopRequested:
+                raise
+            except Exception as e:
+                if is_browser_crash(e):
+                    # run_sources retries the group once on a fresh browser
+                    raise
+                logger.exception(f"Scraper: Error scraping group '{group['name']}'")
+
+        def scrape_source(worker, source):
+            kind, value = source
+            if kind == 'search':
+                scrape_search(worker, value)
+            else:
+                scrape_group(worker, value)
+
+        sources = [('search', kw) for kw in kw_list] if use_keywords_search else []
+        sources += [('group', g) for g in target_groups]
+        def open_session_browser(name, cookies):
+            """A new browser signed in with cookies (no password login), or None if the session did not carry over."""
+            _assert_not_stopped()
+            drv = (_warm_pool.take(linkedin_user) if _warm_pool is not None else None) or _new_chrome()
+            extra_drivers.append(drv)
+            set_cookies(drv, cookies)
+            if not _linkedin_signed_in(drv, base_url):
+                logger.warning(f'Scraper: {name} is not signed in with the shared session; not using it')
+                extra_drivers.remove(drv)
+                drv.quit()
+                return None
+            meter = NetworkMeter()
+            capture = None
+            if SCRAPER_EXTRACTOR == 'api':
+                capture = VoyagerCapture()
+                meter.add_listener(capture.on_event)
+            return BrowserWorker(drv, meter, capture, name)
+
+        session_cookies = driver.get_cookies()
+
+        def relaunch_worker(worker):
+            # Carry over the browser's current cookies (LinkedIn may have rotated li_at); a crashed one can't tell us
+            nonlocal driver
             try:
-                # append or update groups_summary for UI
-                gs = scraper_status.get('groups_summary', [])
-                gs.append({'name': group['name'], 'url': group['url'], 'recent_count': recent_count})
-                scraper_status['groups_summary'] = gs
-                # also update a running total for immediate UI feedback
-                scraper_status['last_found_total'] = len(all_job_posts)
+                cookies = worker.driver.get_cookies() or session_cookies
             except Exception:
-                logger.exception('Scraper: failed to update groups_summary status')
-
-        # Summarize AI filtering and proceed to filter out already-sent jobs
-        scraper_status['ai_filter_stats'] = ai_stats
-        scraper_status['progress'] = f'Found {len(all_job_posts)} potential jobs after AI filter. Filtering for new ones...'
-        logger.info(scraper_status['progress'])
-
-        # --- Filter New Jobs ---
-        try:
-            # Union DB ids with file-based ids (fallback) so a transient DB error doesn't cause duplicates
-            sent_job_ids = set(get_sent_job_ids() or set())
-        except Exception:
-            # fallback to file-based approach if DB fails
-            logger.exception('Scraper: Failed to read sent job ids from DB; falling back to JSON file')
-            sent_job_ids = set()
-        # Also read JSON file to add to the set (regardless) for extra safety
-        try:
-            if os.path.exists(SENT_JOBS_FILE):
-                with open(SENT_JOBS_FILE, 'r', encoding='utf-8') as f:
-                    sent_jobs = json.load(f) or []
-                for job in sent_jobs:
-                    jid = (job.get('id') or '').strip()
-                    if jid:
-                        sent_job_ids.add(jid)
-        except Exception:
-            logger.exception('Scraper: Ignoring errors reading file-based sent jobs while unioning ids')
-
-        new_jobs = [job for job in all_job_posts if job['id'] not in sent_job_ids]
-
-        # Compute unique extracted emails from new_jobs so the UI can show a live count
-        try:
-            unique_emails = set()
-            for job in new_jobs:
-                try:
-                    emails = job.get('emails') or []
-                    if not emails:
-                        # fallback to extracting from text
-                        try:
-                            emails, _ = extract_contacts_from_text(job.get('text') or job.get('raw_text') or '')
-                        except Exception:
-                            emails = []
-                    for e in emails:
-                        k = (e or '').strip().lower()
-                        if k:
-                            unique_emails.add(k)
-                except Exception:
-                    continue
+                cookies = session_cookies
+            old = worker.driver
             try:
-                scraper_status['extracted_emails_count'] = len(unique_emails)
-                scraper_status['extracted_emails_sample'] = list(unique_emails)[:5]
+                old.quit()
             except Exception:
                 pass
-        except Exception:
-            logger.exception('Failed computing extracted emails count for status')
+            if old is driver:
+                driver = None
+            elif old in extra_drivers:
+                extra_drivers.remove(old)
+            fresh = open_session_browser(worker.name, cookies)
+            if fresh is None:
+                raise RuntimeError(f'{worker.name}: could not restore the LinkedIn session in a new browser')
+            worker.driver, worker.meter, worker.api_capture = fresh.driver, fresh.meter, fresh.api_capture
+
+        # Extra browsers only pay off with several sources; the account cap bounds them either way
+        workers = [main_worker]
+        extra = min(SCRAPER_BROWSERS, SCRAPER_MAX_PER_ACCOUNT, len(sources)) - 1
+        if extra > 0:
+            scraper_status['progress'] = f'Starting {extra} more browser(s) for {len(sources)} sources...'
+            logger.info(scraper_status['progress'])
+            workers += launch_workers(extra, lambda i: open_session_browser(f'browser-{i}', session_cookies))
+        supervisor = BrowserSupervisor(relaunch_worker, max_pages=BROWSER_RECYCLE_PAGES, max_rss_mb=BROWSER_MAX_RSS_MB, max_js_heap_mb=BROWSER_MAX_JS_HEAP_MB)
+        scraper_status['browser_health'] = supervisor.stats
+        # Placeholder while scraping; replaced by the per-worker stats once all sources are done
+        scraper_status['browser_pool'] = {'workers': len(workers), 'sources': len(sources)}
+        scraper_status['browser_pool'] = run_sources(workers, sources, scrape_source, limiter=_account_limiter, account=linkedin_user, should_stop=_assert_not_stopped, supervisor=supervisor)
+        logger.info(f"Scraper: Scraped {len(sources)} source(s) with {len(workers)} browser(s) in {scraper_status['browser_pool']['seconds']}s")
+
+        # Scraping is done; free the browser while the remaining queued posts drain through the pipeline
+        scraper_status['progress'] = 'Scraping finished; waiting for queued posts to be classified and sent...'
+        logger.info(scraper_status['progress'])
+        for drv in ([driver] if driver is not None else []) + extra_drivers:
+            try:
+                drv.quit()
+            except Exception:
+                logger.warning('Scraper: Error quitting driver')
+        driver = None
+        extra_drivers.clear()
+        pipe.close()
+        _assert_not_stopped()
+        if hold_emails_only:
+            # Nothing was emailed or written to sent_jobs; the next normal run must still see these posts
+            logger.info('Scraper: Not advancing source cursors in hold-emails-only mode')
+        else:
+            cursor_stats['advanced'] = _save_source_cursors(cursor_state['posts'], cursor_state['handled'])
+        logger.info(f"Scraper: Pipeline finished: {pipe.stats()} (first email after {scraper_status.get('first_email_seconds')}s)")
 
-        # If running in "hold emails only" mode, collect and persist extracted emails and skip sending.
+        # If running in "hold emails only" mode, persist extracted emails; nothing was sent.
         if hold_emails_only:
             try:
-                scraper_status['progress'] = f'Hold mode: collecting emails from {len(new_jobs)} new job(s)...'
-                logger.info(scraper_status['progress'])
-                unique = {}
-                for job in new_jobs:
-                    # prefer job['emails'] (list); if empty, try extracting from text
-                    emails = job.get('emails') or []
-                    if not emails:
-                        try:
-                            emails, _ = extract_contacts_from_text(job.get('text') or job.get('raw_text') or '')
-                        except Exception:
-                            emails = []
-                    for e in emails:
-                        key = (e or '').strip().lower()
-                        if not key:
-                            continue
-                        if key not in unique:
-                            unique[key] = {
-                                'email': key,
-                                'job_id': job.get('id'),
-                                'group_name': job.get('group_name'),
-                                'group_url': job.get('group_url'),
-                                'snippet': (job.get('text') or '')[:500]
-                            }
-                extracted_list = list(unique.values())
+                extracted_list = list(hold_unique.values())
                 try:
                     write_json_atomic(EXTRACTED_EMAILS_FILE, extracted_list)
                     scraper_status['progress'] = f'Hold mode: saved {len(extracted_list)} unique email(s) to {EXTRACTED_EMAILS_FILE}'
@@ -1706,191 +2212,16 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
                     logger.info(scraper_status['progress'])
                 except Exception:
                     logger.exception('Failed to write extracted emails to file')
-                # Do not attempt to send emails in hold mode; exit the scraper task.
             except Exception:
                 logger.exception('Error while collecting emails in hold mode')
-            finally:
-                if 'driver' in locals():
-                    try:
-                        driver.quit()
-                    except Exception:
-                        pass
-                scraper_status['is_running'] = False
-                return
+            return
 
-        # --- Send Emails ---
-        # We'll track which jobs were actually sent and only save those.
-        sent_jobs_local = []
-        if new_jobs:
-            scraper_status['progress'] = f'Sending {len(new_jobs)} new job emails...'
+        if send_state['error']:
+            # If login fails or other sending error occurs, avoid saving any jobs so they will be retried next run
+            scraper_status['progress'] = f"Email Error: {send_state['error']}. Make sure your SMTP credentials (or App Password) are correct."
+        elif send_state['attempts']:
+            scraper_status['progress'] = f'Successfully sent {len(sent_jobs_local)} emails.'
             logger.info(scraper_status['progress'])
-            try:
-                # Build a sender pool: either from settings['senders'] or fallback to single env creds
-                settings_local = load_settings() or {}
-                senders = []
-                try:
-                    configured = settings_local.get('senders')
-                    if configured and isinstance(configured, list) and configured:
-                        for s in configured:
-                            # Expect structure: {'user':..., 'pass':..., 'host': 'smtp.example.com', 'port': 465, 'use_ssl': True}
-                            user = s.get('user') or s.get('email')
-                            pwd = s.get('pass') or s.get('password')
-                            host = s.get('host') or os.getenv('SMTP_HOST') or 'smtp.gmail.com'
-                            port = int(s.get('port') or os.getenv('SMTP_PORT') or (465))
-                            use_ssl = bool(s.get('use_ssl') if 'use_ssl' in s else True)
-                            if user and pwd:
-                                senders.append({'user': user, 'pass': pwd, 'host': host, 'port': port, 'use_ssl': use_ssl})
-                except Exception:
-                    logger.exception('Scraper: Failed to parse configured senders; falling back to env')
-
-                if not senders:
-                    # fallback to single configured env credentials for backward-compat
-                    if gmail_user and gmail_pass:
-                        senders = [{'user': gmail_user, 'pass': gmail_pass, 'host': os.getenv('SMTP_HOST') or 'smtp.gmail.com', 'port': int(os.getenv('SMTP_PORT') or 465), 'use_ssl': True}]
-                    else:
-                        raise RuntimeError('No sender credentials configured (settings.senders or GMAIL_USER/GMAIL_PASS)')
-
-                # Ensure on-disk sent jobs list is available for compatibility (not used for uniqueness now)
-                try:
-                    if os.path.exists(SENT_JOBS_FILE):
-                        with open(SENT_JOBS_FILE, 'r', encoding='utf-8') as f:
-                            existing = json.load(f)
-                    else:
-                        existing = []
-                except json.JSONDecodeError:
-                    logger.warning(f"Scraper: {SENT_JOBS_FILE} is empty or invalid JSON; starting with empty list")
-                    existing = []
-                except Exception:
-                    logger.exception(f"Scraper: Unexpected error reading {SENT_JOBS_FILE}; starting with empty list")
-                    existing = []
-
-                # Rotate senders across messages (round-robin)
-                for i, job in enumerate(new_jobs):
-                    _assert_not_stopped()
-                    scraper_status['progress'] = f'Sending email {i+1}/{len(new_jobs)}...'
-                    logger.info(scraper_status['progress'])
-                    sender = senders[i % len(senders)]
-
-                    # Compose message (include raw text and AI reason when present)
-                    short_id = job['id'][:8]
-                    ts = datetime.utcnow().strftime('%Y%m%d%H%M%S')
-                    # Try to extract a role/title for a clearer subject
-                    role = extract_role_from_text(job.get('raw_text') or job.get('text') or '')
-                    if role:
-                        subject = f"New job found: \"{role}\" — found in \"{job['group_name']}\" [{short_id}-{ts}]"
-                    else:
-                        subject = f"New LinkedIn Job Lead: From '{job['group_name']}' [{short_id}-{ts}]"
-                    contacts = ''
-                    if job.get('emails'):
-                        contacts += 'Emails: ' + ', '.join(job.get('emails')) + '\n'
-                    if job.get('phones'):
-                        contacts += 'Phones: ' + ', '.join(job.get('phones')) + '\n'
-                    # Compose message: include cleaned content and always attach the full raw post so the recipient
-                    # can read and decide. Also set Reply-To to the first extracted contact email when available.
-                    content = job.get('text') or ''
-                    raw = job.get('raw_text') or ''
-                    # Always append the raw post after a separator so recipient has full context
-                    if raw and raw.strip() and raw.strip() != (content or '').strip():
-                        full_content = f"{content}\n\n----- Full Raw Post -----\n{raw}"
-                    else:
-                        full_content = content
-                    if job.get('ai_reason'):
-                        full_content = f"{full_content}\n\n(AI reason: {job.get('ai_reason')})"
-                    body = (
-                        f"A new potential job opportunity was found.\n\n"
-                        f"Group: {job['group_name']}\nGroup URL: {job['group_url']}\n"
-                        f"------------------------------------\n\n{full_content}\n\n{contacts}"
-                    )
-                    msg = MIMEText(body)
-                    msg['Subject'] = subject
-                    msg['From'] = sender['user']
-                    # If an extracted contact exists, set Reply-To so recipient's Reply will go to that contact
-                    reply_to = None
-                    try:
-                        extracted_contacts = (job.get('emails') or [])
-                        if extracted_contacts:
-                            reply_to = extracted_contacts[0]
-                    except Exception:
-                        reply_to = None
-                    if reply_to:
-                        try:
-                            msg['Reply-To'] = reply_to
-                        except Exception:
-                            pass
-                    msg['To'] = recipient_emails
-                    # Add a stable X-Job-ID header so recipients can correlate messages
-                    try:
-                        msg_id = f"<{uuid.uuid4()}@linkedin-scraper>"
-                        msg['Message-ID'] = msg_id
-                        msg['X-Job-ID'] = job['id']
-                    except Exception:
-                        logger.exception('Scraper: Failed to set message headers')
-
-                    # Send using the chosen sender credentials (login per-send for simplicity)
-                    try:
-                        # Sanitize recipient list and log attempt (masking sensitive parts)
-                        recipients_raw = recipient_emails or ''
-                        recipient_list = [r.strip() for r in (recipients_raw.split(',') if recipients_raw else []) if r.strip()]
-                        logger.info(f"Scraper: Attempting send: sender={sender.get('user')} to recipients={recipient_list}")
-                        if not recipient_list:
-                            logger.warning('Scraper: No recipients configured; skipping send for job id %s', job.get('id'))
-                        else:
-                            if sender.get('use_ssl'):
-                                server = smtplib.SMTP_SSL(sender.get('host'), int(sender.get('port')))
-                            else:
-                                server = smtplib.SMTP(sender.get('host'), int(sender.get('port')))
-                                server.starttls()
-                            try:
-                                server.login(sender.get('user'), sender.get('pass'))
-                                server.sendmail(sender.get('user'), recipient_list, msg.as_string())
-                                server.quit()
-                            except smtplib.SMTPAuthenticationError as e:
-                                logger.exception('SMTP auth failed for sender %s', sender.get('user'))
-                                try:
-                                    scraper_status['last_smtp_error'] = f'auth:{str(e)}'
-                                except Exception:
-                                    pass
-                                raise
-                            except Exception as e:
-                                logger.exception('SMTP send failed for sender %s', sender.get('user'))
-                                try:
-                                    scraper_status['last_smtp_error'] = f'send:{str(e)}'
-                                except Exception:
-                                    pass
-                                raise
-
-                        # Persist this job to DB immediately so it won't be re-sent
-                        try:
-                            if add_sent_job(job):
-                                logger.info(f"Scraper: Persisted sent job id {job['id'][:60]} to DB immediately")
-                            else:
-                                logger.info(f"Scraper: Sent job id {job['id'][:60]} already exists or failed to persist")
-                        except Exception:
-                            logger.exception('Scraper: Failed to persist sent job to DB immediately')
-
-                        sent_jobs_local.append(job)
-                        scraper_status['last_sent_count'] = len(sent_jobs_local)
-                        scraper_status['last_sent_to'] = recipient_emails
-                        logger.info(f"Scraper: Email sent for job id {job['id'][:60]} using sender {sender.get('user')}")
-                    except Exception:
-                        logger.exception(f"Scraper: Failed to send email for job id {job['id'][:60]} using sender {sender.get('user')}")
-                    # Stop-aware delay between emails
-                    waited = 0.0
-                    step = 0.1
-                    total = max(0.0, float(delay_seconds))
-                    while waited < total:
-                        if stop_event.is_set():
-                            _assert_not_stopped()
-                        time.sleep(step)
-                        waited += step
-
-                scraper_status['progress'] = f'Successfully sent {len(sent_jobs_local)} emails.'
-                logger.info(scraper_status['progress'])
-            except Exception as e:
-                # If login fails or other sending error occurs, avoid saving any jobs so they will be retried next run
-                scraper_status['progress'] = f'Email Error: {str(e)}. Make sure your SMTP credentials (or App Password) are correct.'
-                logger.exception('Scraper: Email sending/login error')
-                sent_jobs_local = []
         else:
             scraper_status['progress'] = 'No new jobs found this time.'
             logger.info(scraper_status['progress'])
@@ -1940,11 +2271,14 @@ def scraper_task(gmail_user, gmail_pass, recipient_emails, linkedin_user, linked
         scraper_status['progress'] = f'An error occurred: {str(e)}'
         logger.exception('Scraper: Unhandled exception')
     finally:
-        if 'driver' in locals():
+        for drv in ([driver] if driver is not None else []) + extra_drivers:
             try:
-                driver.quit()
+                drv.quit()
             except Exception:
                 logger.warning('Scraper: Error quitting driver')
+        if pipe is not None:
+            # On stop the stage workers discard queued items, so this returns promptly
+            pipe.close()
         scraper_status['is_running'] = False
         # The task is done, but we leave the final message for the user to see.
 
@@ -2117,6 +2451,10 @@ def status():
         report['stop_requested'] = stop_event.is_set()
     except Exception:
         report['stop_requested'] = False
+    try:
+        report['ai_http_latency'] = _gemini_http.stats()
+    except Exception:
+        report['ai_http_latency'] = {}
     return jsonify(report)
 
 
@@ -2167,7 +2505,7 @@ def test_ai():
     """Quick connectivity check to Gemini."""
     if not GEMINI_API_KEY or not GEMINI_API_URL:
         return jsonify({'ok': False, 'error': 'GEMINI_API_KEY or GEMINI_API_URL not set'}), 400
-    keep, reason = ai_is_usa_hiring_post("We are hiring a Software Engineer in the United States. Remote in US only.")
+    keep, reason = ai_is_usa_hiring_post("We are hiring a Software Engineer in the United States. Remote in US only.", use_cache=False)
     return jsonify({'ok': True, 'keep': keep, 'reason': reason})
 
 
@@ -2202,6 +2540,62 @@ def admin_clear_sent_jobs():
         return jsonify({'ok': False, 'error': 'failed to clear sent jobs'}), 500
 
 
+@app.route('/admin/source-cursors', methods=['GET'])
+@admin_required
+def admin_list_source_cursors():
+    """Return the per-source cursors (newest activity id seen per group URL / search keyword)."""
+    try:
+        cursors = get_source_cursors()
+        return jsonify({'ok': True, 'count': len(cursors), 'cursors': cursors})
+    except Exception:
+        logger.exception('Admin: Failed to list source cursors')
+        return jsonify({'ok': False, 'error': 'failed to list source cursors'}), 500
+
+
+@app.route('/admin/source-cursors/clear', methods=['POST'])
+@admin_required
+def admin_clear_source_cursors():
+    """Clear one source's cursor (JSON {"source": "group:<url>" | "search:<keyword>"}) or all of them."""
+    try:
+        body = request.get_json(silent=True) or {}
+        cleared = clear_source_cursors(body.get('source') or None)
+        return jsonify({'ok': True, 'cleared': cleared})
+    except Exception:
+        logger.exception('Admin: Failed to clear source cursors')
+        return jsonify({'ok': False, 'error': 'failed to clear source cursors'}), 500
+
+
+@app.route('/admin/linkedin-sessions', methods=['GET'])
+@admin_required
+def admin_list_linkedin_sessions():
+    """Return the accounts with a stored LinkedIn session and when it was saved (cookie values are not exposed)."""
+    try:
+        sessions = list_linkedin_sessions()
+        return jsonify({'ok': True, 'count': len(sessions), 'sessions': sessions})
+    except Exception:
+        logger.exception('Admin: Failed to list LinkedIn sessions')
+        return jsonify({'ok': False, 'error': 'failed to list LinkedIn sessions'}), 500
+
+
+@app.route('/admin/linkedin-sessions/clear', methods=['POST'])
+@admin_required
+def admin_clear_linkedin_sessions():
+    """Forget one account's stored cookies (JSON {"account": "<email>"}) or all of them; also removes the Chrome profile."""
+    try:
+        import shutil
+        body = request.get_json(silent=True) or {}
+        account = _account_key(body.get('account')) or None
+        cleared = clear_linkedin_sessions(account)
+        if account:
+            shutil.rmtree(account_profile_dir(CHROME_PROFILE_ROOT, account), ignore_errors=True)
+        else:
+            shutil.rmtree(CHROME_PROFILE_ROOT, ignore_errors=True)
+        return jsonify({'ok': True, 'cleared': cleared})
+    except Exception:
+        logger.exception('Admin: Failed to clear LinkedIn sessions')
+        return jsonify({'ok': False, 'error': 'failed to clear LinkedIn sessions'}), 500
+
+
 @app.route('/admin/backup', methods=['POST'])
 @admin_required
 def admin_backup_db():
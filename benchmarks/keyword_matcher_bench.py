@@ -0,0 +1,132 @@
+"""Microbenchmark: per-post cost of the promo/hiring/location/keyword filters.
+
+Compares the previous per-term `any(term in text.lower())` passes (promo, hiring, location,
+then one pass per user keyword, each over raw and cleaned text) with a single
+keyword_matcher scan over both. Post texts are the visible text blocks of the gzipped
+pages in data/html, plus optionally the texts of already-sent jobs from the DB.
+
+Usage: python benchmarks/keyword_matcher_bench.py [--db PATH] [--keywords "java,python"] [--repeat N]
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+from html.parser import HTMLParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from keyword_matcher import (  # noqa: E402
+    DISALLOWED_LOCATIONS,
+    HIRING_TERMS,
+    PROMO_TERMS,
+    build_post_matcher,
+)
+
+
+class _VisibleText(HTMLParser):
+    """Collects text nodes outside script/style as separate blocks."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocks = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style', 'noscript'):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style', 'noscript') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip and data.strip():
+            self.blocks.append(' '.join(data.split()))
+
+
+def load_fixture_texts(pattern):
+    texts = []
+    for path in sorted(glob.glob(pattern)):
+        with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+            parser = _VisibleText()
+            parser.feed(f.read())
+        # The whole page's visible text as one post, plus each text block on its own
+        texts.append('\n'.join(parser.blocks))
+        texts.extend(parser.blocks)
+    return texts
+
+
+def load_db_texts(db_path):
+    from db import get_all_sent_jobs
+    return [j.get('raw_text') or j.get('text') or '' for j in get_all_sent_jobs(db_path=db_path)]
+
+
+def legacy_filters(raw, cleaned, kw_list):
+    # Previous behaviour: separate lowercase + any() pass per term class, per text variant
+    out = []
+    for text in (raw, cleaned):
+        low = text.lower()
+        promo = any(p in low for p in PROMO_TERMS)
+        low = text.lower()
+        hiring = any(h in low for h in HIRING_TERMS)
+        low = text.lower()
+        loc = 'puerto rico' in low or '#hpepuertorico' in low or ' hpepuertorico' in low
+        out.append((promo, hiring, loc))
+    matched = any(kw in raw.lower() or kw in cleaned.lower() for kw in kw_list)
+    return out, matched
+
+
+def matcher_filters(matcher, raw, cleaned):
+    return matcher.scan(raw + '\x00' + cleaned)
+
+
+def _time_per_post(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for t in texts:
+            fn(t)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / max(1, len(texts)) * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--fixtures', default=os.path.join(ROOT, 'data', 'html', '*.html.gz'))
+    ap.add_argument('--db', help='also benchmark on sent_jobs texts from this SQLite DB')
+    ap.add_argument('--keywords', default='java,python,data engineer,devops,salesforce')
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args(argv)
+
+    texts = load_fixture_texts(args.fixtures)
+    if args.db:
+        texts.extend(load_db_texts(args.db))
+    texts = [t for t in texts if t]
+    if not texts:
+        print(json.dumps({'error': 'no texts found', 'fixtures': args.fixtures}))
+        return 1
+    kw_list = [k.strip().lower() for k in args.keywords.split(',') if k.strip()]
+    matcher = build_post_matcher(kw_list)
+    # The group loop checks the raw text and its cleaned form; use the same text for both here
+    legacy_us = _time_per_post(lambda t: legacy_filters(t, t, kw_list), texts, args.repeat)
+    matcher_us = _time_per_post(lambda t: matcher_filters(matcher, t, t), texts, args.repeat)
+    result = {
+        'posts': len(texts),
+        'avg_chars': round(sum(len(t) for t in texts) / len(texts), 1),
+        'terms': len(PROMO_TERMS) + len(HIRING_TERMS) + len(DISALLOWED_LOCATIONS) + len(kw_list),
+        'backend': matcher.backend,
+        'legacy_us_per_post': round(legacy_us, 2),
+        'matcher_us_per_post': round(matcher_us, 2),
+        'speedup': round(legacy_us / matcher_us, 2) if matcher_us else None,
+    }
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
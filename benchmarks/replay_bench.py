@@ -0,0 +1,210 @@
+"""Replay benchmark: per-post cost of the text pipeline over the recorded pages in data/html.
+
+Each snapshot is parsed with page_parser and every post goes through the same per-post work
+as the scraper: build_job (cleaning, contact extraction, ids), _normalize_text_for_id (AI cache
+key), extract_role_from_text (email subject) and the promo/hiring/location filters. Pages with
+no post containers (e.g. login/checkpoint captures) contribute no posts. --fake-pages adds pages
+rendered by fake_linkedin from its synthetic corpus, and they are used by default when the
+snapshots and --db yield no posts. `sources` in the output says how many posts came from each.
+
+Reports posts/sec, p50/p99 per-post latency and peak memory, and writes the result as JSON
+(default benchmarks/results/replay_<commit>.json). --compare prints the change against an
+earlier result file.
+
+Usage: python benchmarks/replay_bench.py [--fixtures GLOB] [--db PATH] [--fake-pages N] [--repeat N] [--out PATH] [--compare PATH]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from keyword_matcher import (  # noqa: E402
+    build_post_matcher,
+    is_disallowed_location,
+    is_promo_training,
+    match_post_terms,
+    seems_hiring,
+)
+from page_parser import PARSER_BACKEND, page_post_items, read_snapshot  # noqa: E402
+from post_text import _normalize_text_for_id, build_job, extract_role_from_text  # noqa: E402
+
+# fake_linkedin pages replayed when the snapshots and the DB have no posts
+DEFAULT_FAKE_PAGES = 30
+# Page types the fake pages rotate through, with the canonical URL page_parser reads the mode from
+FAKE_PAGE_URLS = (
+    ('feed', 'https://www.linkedin.com/feed/'),
+    ('group', 'https://www.linkedin.com/groups/{n}/'),
+    ('search', 'https://www.linkedin.com/search/results/content/?keywords=hiring&n={n}'),
+)
+# Compared metrics and whether lower is better
+METRICS = {'posts_per_sec': False, 'p50_us': True, 'p99_us': True, 'peak_tracemalloc_kb': True}
+
+
+def fake_pages(count, page_size=10):
+    """HTML of count pages rendered by fake_linkedin from its synthetic corpus (feed, group and search in turn)."""
+    from fake_linkedin import FakeLinkedIn
+    fake = FakeLinkedIn(page_size=page_size)
+    for n in range(count):
+        kind, url = FAKE_PAGE_URLS[n % len(FAKE_PAGE_URLS)]
+        yield fake.render_page(kind, f'replay-{n}', 'Replay', url.format(n=n))
+
+
+def load_posts(pattern, db_path=None, fake_page_count=None):
+    """[(mode, post item)] from the snapshots, sent_jobs and fake pages, plus per-source counts.
+
+    fake_page_count=None renders DEFAULT_FAKE_PAGES fake pages only when the other sources have no posts.
+    """
+    posts, sources, pages = [], {'snapshots': 0, 'db': 0, 'fake_pages': 0, 'pages_without_posts': 0}, 0
+
+    def add_page(html, source):
+        nonlocal pages
+        pages += 1
+        _, mode, items = page_post_items(html)
+        sources[source] += len(items)
+        sources['pages_without_posts'] += not items
+        posts.extend((mode, item) for item in items)
+
+    for path in sorted(glob.glob(pattern)):
+        add_page(read_snapshot(path), 'snapshots')
+    if db_path:
+        from db import get_all_sent_jobs
+        for j in get_all_sent_jobs(db_path=db_path):
+            text = j.get('raw_text') or j.get('text') or ''
+            if text:
+                sources['db'] += 1
+                posts.append(('group', {'text': text, 'hrefs': [], 'contact_hrefs': []}))
+    if fake_page_count is None:
+        fake_page_count = 0 if posts else DEFAULT_FAKE_PAGES
+    for html in fake_pages(fake_page_count):
+        add_page(html, 'fake_pages')
+    return posts, sources, pages
+
+
+def process_post(mode, item, matcher):
+    """The scraper's per-post work, minus the browser and the network."""
+    job = build_job(item, mode, 'Replay', '', require_recent=False)
+    if job is None:
+        return None
+    _normalize_text_for_id(job['raw_text'])
+    extract_role_from_text(job['raw_text'])
+    matches = match_post_terms(job['raw_text'] + '\x00' + job['text'], matcher)
+    return (is_promo_training('', matches), seems_hiring('', matches), is_disallowed_location('', matches), bool(matches.get('keyword')))
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def run(posts, matcher, repeat):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for mode, item in posts:
+            t0 = time.perf_counter_ns()
+            process_post(mode, item, matcher)
+            latencies.append(time.perf_counter_ns() - t0)
+    elapsed = time.perf_counter() - started
+    # Peak allocations from a separate pass: tracing slows Python down and would skew the timings
+    tracemalloc.start()
+    for mode, item in posts:
+        process_post(mode, item, matcher)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        'posts_per_sec': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_us': round(_percentile(latencies, 0.50) / 1000, 2) if latencies else None,
+        'p99_us': round(_percentile(latencies, 0.99) / 1000, 2) if latencies else None,
+        'peak_tracemalloc_kb': round(peak / 1024, 1),
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current, previous, tolerance_pct=10.0):
+    """{metric: {before, after, change_pct, regression}} for the metrics both results have.
+
+    A change counts as a regression only when it is worse by more than tolerance_pct (run-to-run noise).
+    """
+    out = {}
+    for name, lower_is_better in METRICS.items():
+        before, after = previous.get(name), current.get(name)
+        if not before or after is None:
+            continue
+        change = (after - before) / before * 100
+        out[name] = {
+            'before': before,
+            'after': after,
+            'change_pct': round(change, 1),
+            'regression': change > tolerance_pct if lower_is_better else change < -tolerance_pct,
+        }
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--fixtures', default=os.path.join(ROOT, 'data', 'html', '*.html.gz'))
+    ap.add_argument('--db', help='also replay sent_jobs texts from this SQLite DB')
+    ap.add_argument('--fake-pages', type=int, help=f'also replay N pages rendered by fake_linkedin (default: {DEFAULT_FAKE_PAGES} when the other sources have no posts)')
+    ap.add_argument('--keywords', default='java,python,data engineer,devops,salesforce')
+    ap.add_argument('--repeat', type=int, default=20)
+    ap.add_argument('--out', help='result file (default benchmarks/results/replay_<commit>.json); "-" for stdout only')
+    ap.add_argument('--compare', help='earlier result file to diff against')
+    ap.add_argument('--tolerance', type=float, default=10.0, help='percent change treated as noise by --compare')
+    args = ap.parse_args(argv)
+
+    posts, sources, pages = load_posts(args.fixtures, args.db, args.fake_pages)
+    if not posts:
+        print(json.dumps({'error': 'no posts found', 'fixtures': args.fixtures}))
+        return 1
+    matcher = build_post_matcher(k.strip().lower() for k in args.keywords.split(','))
+    # Warm-up pass so regex compilation and caches are not charged to the first posts
+    for mode, item in posts:
+        process_post(mode, item, matcher)
+    commit = _git_commit()
+    result = {
+        'benchmark': 'replay',
+        'commit': commit,
+        'python': platform.python_version(),
+        'parser_backend': PARSER_BACKEND,
+        'matcher_backend': matcher.backend,
+        'pages': pages,
+        'posts': len(posts),
+        'sources': sources,
+        'repeat': args.repeat,
+    }
+    result.update(run(posts, matcher, max(1, args.repeat)))
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            result['compare'] = {'against': args.compare, 'metrics': compare(result, json.load(f), args.tolerance)}
+    print(json.dumps(result, indent=2))
+    if args.out != '-':
+        out = args.out or os.path.join(ROOT, 'benchmarks', 'results', f"replay_{commit or 'local'}.json")
+        os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+            f.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
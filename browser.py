@@ -0,0 +1,307 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from selenium.webdriver.chrome.options import Options
+
+# psutil is optional: without it browser RSS is read from /proc (Linux only)
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# URL patterns (Network.setBlockedURLs wildcards) dropped per resource category. LinkedIn serves
+# images and video from media.licdn.com / dms.licdn.com without file extensions, so those hosts are
+# listed next to the extension patterns.
+BLOCK_PATTERNS: Dict[str, List[str]] = {
+    'images': [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+        '*media.licdn.com/dms/image/*', '*media-exp*.licdn.com/dms/image/*',
+    ],
+    'media': [
+        '*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.m4a', '*.ogg',
+        '*dms.licdn.com/playlist/*', '*media.licdn.com/playlist/*',
+    ],
+    'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'analytics': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+        '*bat.bing.com*', '*facebook.net*', '*connect.facebook.com*', '*ads.linkedin.com*',
+        '*px.ads.linkedin.com*', '*linkedin.com/li/track*', '*li.protechts.net*',
+        '*demdex.net*', '*omtrdc.net*', '*scorecardresearch.com*', '*hotjar.com*',
+    ],
+}
+
+
+def parse_block_categories(value: Optional[str], headless: bool) -> List[str]:
+    """Categories to block from a comma-separated setting; 'auto' (or empty) = all when headless, none otherwise."""
+    value = (value or 'auto').strip().lower()
+    if value == 'auto':
+        return list(BLOCK_PATTERNS) if headless else []
+    if value in ('none', 'off', '0', 'false'):
+        return []
+    if value in ('all', 'on', '1', 'true'):
+        return list(BLOCK_PATTERNS)
+    cats = [c.strip() for c in value.split(',') if c.strip()]
+    unknown = [c for c in cats if c not in BLOCK_PATTERNS]
+    if unknown:
+        logger.warning(f'Browser: unknown resource block categories {unknown}; known: {sorted(BLOCK_PATTERNS)}')
+    return [c for c in cats if c in BLOCK_PATTERNS]
+
+
+def build_chrome_options(headless: bool = False, window_size: Optional[str] = None, block: Sequence[str] = (), performance_log: bool = True, user_data_dir: Optional[str] = None) -> Options:
+    """Chrome options for the scraper.
+
+    headless=True is the lean profile: new headless mode, no GPU, no extensions, fixed window
+    size. Blocked image categories are also switched off in Chrome's content settings, so the
+    renderer never decodes them. performance_log enables the CDP event log NetworkMeter reads.
+    user_data_dir keeps cookies/local storage between runs (see account_profile_dir).
+    """
+    opts = Options()
+    opts.add_argument('--no-sandbox')
+    opts.add_argument('--disable-dev-shm-usage')
+    if user_data_dir:
+        opts.add_argument(f'--user-data-dir={user_data_dir}')
+    if headless:
+        opts.add_argument('--headless=new')
+        opts.add_argument('--disable-gpu')
+        opts.add_argument('--disable-extensions')
+        opts.add_argument('--mute-audio')
+        opts.add_argument('--hide-scrollbars')
+    if window_size:
+        opts.add_argument(f'--window-size={window_size}')
+    if 'images' in block:
+        opts.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if performance_log:
+        opts.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return opts
+
+
+def account_profile_dir(root: str, account: str) -> str:
+    """Chrome profile directory of a LinkedIn account under root (hashed, so the path holds no e-mail address)."""
+    key = hashlib.sha1((account or '').strip().lower().encode('utf-8')).hexdigest()[:16]
+    return os.path.join(root, f'account-{key}')
+
+
+def set_cookies(driver, cookies: Iterable[Dict[str, Any]]) -> int:
+    """Load cookies saved from driver.get_cookies() into the browser via CDP, without navigating first.
+
+    Returns how many were set (0 if CDP is unavailable or the list is empty).
+    """
+    params = []
+    for c in cookies or ():
+        if not c.get('name') or not c.get('domain'):
+            continue
+        p = {k: c[k] for k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly') if k in c}
+        if c.get('sameSite') in ('Strict', 'Lax', 'None'):
+            p['sameSite'] = c['sameSite']
+        if c.get('expiry'):
+            p['expires'] = c['expiry']
+        params.append(p)
+    if not params:
+        return 0
+    try:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+        return len(params)
+    except Exception as e:
+        logger.warning(f'Browser: restoring cookies via CDP failed ({str(e)[:120]})')
+        return 0
+
+
+def cookie_names(driver) -> Optional[set]:
+    """Names of every cookie the browser holds (all domains, via CDP), or None if CDP is unavailable."""
+    try:
+        return {c.get('name') for c in driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies') or ()}
+    except Exception:
+        return None
+
+
+def apply_resource_blocking(driver, categories: Iterable[str]) -> int:
+    """Block the categories' URL patterns for every request of this browser via CDP. Returns the pattern count (0 if unsupported)."""
+    patterns = [p for c in categories for p in BLOCK_PATTERNS.get(c, ())]
+    if not patterns:
+        return 0
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        return len(patterns)
+    except Exception as e:
+        logger.warning(f'Browser: resource blocking via CDP failed ({str(e)[:120]}); loading everything')
+        return 0
+
+
+# Navigation timing of the current document, in ms from navigation start
+PAGE_TIMING_JS = r"""
+const nav = performance.getEntriesByType ? performance.getEntriesByType('navigation')[0] : null;
+if (!nav) return null;
+const res = performance.getEntriesByType('resource');
+return {
+    dom_content_loaded_ms: Math.round(nav.domContentLoadedEventEnd),
+    load_ms: Math.round(nav.loadEventEnd || performance.now()),
+    transfer_bytes: (nav.transferSize || 0) + res.reduce((n, r) => n + (r.transferSize || 0), 0),
+    resources: res.length,
+};
+"""
+
+
+def page_timing(driver) -> Optional[Dict[str, Any]]:
+    """Load timing (and a same-origin byte estimate) of the current page from the Performance API, or None."""
+    try:
+        return driver.execute_script(PAGE_TIMING_JS)
+    except Exception:
+        return None
+
+
+class NetworkMeter:
+    """Network totals from Chrome's performance log (CDP Network.* events).
+
+    drain() returns what the events logged since the previous drain add up to: bytes on the
+    wire (encodedDataLength of finished loads), requests, and requests that failed or were
+    blocked. Other consumers can subscribe to the same events with add_listener(fn), called as
+    fn(method, params) for every event, since the log can only be read once; poll() reads the log
+    and feeds the listeners without resetting the totals.
+    If the log is unavailable (driver started without performance logging), drain() returns None.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self.available = True
+        self._totals = self._empty()
+
+    @staticmethod
+    def _empty() -> Dict[str, int]:
+        return {'bytes': 0, 'requests': 0, 'failed': 0, 'blocked': 0}
+
+    def add_listener(self, fn: Callable[[str, Dict[str, Any]], None]):
+        with self._lock:
+            self._listeners.append(fn)
+
+    def poll(self, driver) -> bool:
+        """Read the pending log entries into the running totals and the listeners. False if the log is unavailable."""
+        if not self.available:
+            return False
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logger.info(f'Browser: performance log unavailable ({str(e)[:120]}); network metrics fall back to the Performance API')
+            self.available = False
+            return False
+        with self._lock:
+            listeners = list(self._listeners)
+            totals = self._totals
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except Exception:
+                continue
+            method, params = message.get('method', ''), message.get('params') or {}
+            if method == 'Network.requestWillBeSent':
+                totals['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                totals['bytes'] += int(params.get('encodedDataLength') or 0)
+            elif method == 'Network.loadingFailed':
+                if params.get('blockedReason'):
+                    totals['blocked'] += 1
+                else:
+                    totals['failed'] += 1
+            for fn in listeners:
+                try:
+                    fn(method, params)
+                except Exception:
+                    logger.exception('Browser: performance log listener failed')
+        return True
+
+    def drain(self, driver) -> Optional[Dict[str, int]]:
+        if not self.poll(driver):
+            return None
+        with self._lock:
+            totals, self._totals = self._totals, self._empty()
+        return totals
+
+
+def source_metrics(driver, meter: NetworkMeter) -> Dict[str, Any]:
+    """Bytes/requests since the last drain plus the current page's load timing, for one scraped source."""
+    net = meter.drain(driver)
+    timing = page_timing(driver) or {}
+    out: Dict[str, Any] = {
+        'load_ms': timing.get('load_ms'),
+        'dom_content_loaded_ms': timing.get('dom_content_loaded_ms'),
+    }
+    if net is not None:
+        out.update({'kb_transferred': round(net['bytes'] / 1024, 1), 'requests': net['requests'], 'blocked_requests': net['blocked'], 'failed_requests': net['failed']})
+    else:
+        # Same-origin resources only: cross-origin entries report 0 bytes without Timing-Allow-Origin
+        out.update({'kb_transferred': round((timing.get('transfer_bytes') or 0) / 1024, 1), 'requests': timing.get('resources')})
+    return out
+
+
+def _proc_tree_rss_linux(root_pid: int) -> Optional[int]:
+    # Children via /proc/<pid>/stat (field 4 is the parent pid), RSS via /proc/<pid>/statm (pages)
+    try:
+        parents: Dict[int, int] = {}
+        for name in os.listdir('/proc'):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat', 'rb') as f:
+                    stat = f.read().decode('utf-8', 'replace')
+                parents[int(name)] = int(stat.rsplit(')', 1)[1].split()[1])
+            except Exception:
+                continue
+        tree, frontier = set(), [root_pid]
+        while frontier:
+            pid = frontier.pop()
+            tree.add(pid)
+            frontier.extend(c for c, ppid in parents.items() if ppid == pid and c not in tree)
+        page = os.sysconf('SC_PAGE_SIZE')
+        total = 0
+        for pid in tree:
+            try:
+                with open(f'/proc/{pid}/statm') as f:
+                    total += int(f.read().split()[1]) * page
+            except Exception:
+                continue
+        return total
+    except Exception:
+        return None
+
+
+def browser_rss_bytes(driver) -> Optional[int]:
+    """Resident memory of the browser: chromedriver plus every Chrome process under it, or None if unknown."""
+    try:
+        pid = driver.service.process.pid
+    except Exception:
+        return None
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            total = 0
+            for p in [proc] + proc.children(recursive=True):
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+        except psutil.Error:
+            return None
+    if os.path.isdir('/proc'):
+        return _proc_tree_rss_linux(pid)
+    return None
+
+
+def js_heap_bytes(driver) -> Optional[int]:
+    """JS heap in use by the current page (CDP Performance.getMetrics JSHeapUsedSize), or None if unavailable."""
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {}).get('metrics') or ()
+    except Exception:
+        return None
+    for m in metrics:
+        if m.get('name') == 'JSHeapUsedSize':
+            return int(m.get('value') or 0)
+    return None
@@ -0,0 +1,325 @@
+"""Several signed-in browsers scraping sources (groups, keyword searches) in parallel.
+
+run_sources() hands the sources out through one shared queue: each worker takes the next source
+as soon as its browser is free, so a slow group does not hold the others up. AccountLimiter caps
+how many pages of the same LinkedIn account load at once, across workers and runs.
+BrowserSupervisor replaces a worker's browser between sources once it has served enough pages
+or grown past a memory ceiling, and after a crash (retrying the source it was on).
+"""
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from browser import browser_rss_bytes, js_heap_bytes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrowserWorker:
+    """One browser and what is attached to it (network meter, optional API capture)."""
+    driver: Any
+    meter: Any
+    api_capture: Any = None
+    name: str = 'browser-0'
+    sources: int = 0
+    busy_seconds: float = 0.0
+    # Sources served by the current browser (reset when it is recycled)
+    pages: int = 0
+    recycles: int = 0
+
+
+class AccountLimiter:
+    """At most per_account concurrent source loads per LinkedIn account."""
+
+    def __init__(self, per_account: int = 2):
+        self.per_account = max(1, int(per_account))
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, account: str, should_stop: Optional[Callable[[], None]] = None):
+        key = (account or '').strip().lower()
+        with self._lock:
+            sem = self._slots.setdefault(key, threading.BoundedSemaphore(self.per_account))
+        # Stop-aware acquire: should_stop raises when the run is cancelled
+        while not sem.acquire(timeout=0.5):
+            if should_stop is not None:
+                should_stop()
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+# WebDriver error texts meaning the browser or its tab is gone (as opposed to a page-level failure)
+_CRASH_MARKERS = (
+    'tab crashed', 'session deleted', 'invalid session id', 'chrome not reachable', 'disconnected',
+    'no such window', 'target window already closed', 'connection refused', 'max retries exceeded',
+)
+
+
+def is_browser_crash(exc: BaseException) -> bool:
+    msg = str(exc).lower()
+    return any(m in msg for m in _CRASH_MARKERS)
+
+
+class BrowserSupervisor:
+    """Recycles a worker's browser after max_pages sources, above max_rss_mb (Chrome process tree)
+    or max_js_heap_mb (page JS heap), or when it stops responding. 0 disables a limit.
+
+    relaunch(worker) does the actual replacement: quit the old browser, start a new one with the
+    session restored and swap it into worker (driver, meter, api_capture).
+    """
+
+    def __init__(self, relaunch: Callable[[BrowserWorker], None], max_pages: int = 0, max_rss_mb: int = 0, max_js_heap_mb: int = 0):
+        self._relaunch = relaunch
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_js_heap_mb = max_js_heap_mb
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            'recycles': 0, 'by_reason': {}, 'retried_sources': 0,
+            'last_rss_mb': None, 'peak_rss_mb': None, 'last_js_heap_mb': None, 'peak_js_heap_mb': None,
+        }
+
+    def _note(self, key: str, value_mb: Optional[float]):
+        if value_mb is None:
+            return
+        with self._lock:
+            self.stats[f'last_{key}'] = value_mb
+            self.stats[f'peak_{key}'] = max(self.stats[f'peak_{key}'] or 0, value_mb)
+
+    def recycle_reason(self, worker: BrowserWorker) -> Optional[str]:
+        if self.max_pages and worker.pages >= self.max_pages:
+            return 'pages'
+        try:
+            worker.driver.current_url
+        except Exception:
+            return 'crashed'
+        rss = browser_rss_bytes(worker.driver) if self.max_rss_mb else None
+        rss_mb = round(rss / 1048576, 1) if rss is not None else None
+        self._note('rss_mb', rss_mb)
+        if self.max_rss_mb and rss_mb is not None and rss_mb > self.max_rss_mb:
+            return 'rss'
+        heap = js_heap_bytes(worker.driver) if self.max_js_heap_mb else None
+        heap_mb = round(heap / 1048576, 1) if heap is not None else None
+        self._note('js_heap_mb', heap_mb)
+        if self.max_js_heap_mb and heap_mb is not None and heap_mb > self.max_js_heap_mb:
+            return 'js-heap'
+        return None
+
+    def recycle(self, worker: BrowserWorker, reason: str, retry: bool = False):
+        """Replace worker's browser now; retry=True counts the current source as retried on the new one."""
+        logger.info(f'Browser pool: recycling {worker.name} ({reason}) after {worker.pages} page(s)')
+        self._relaunch(worker)
+        worker.pages = 0
+        worker.recycles += 1
+        with self._lock:
+            self.stats['recycles'] += 1
+            self.stats['by_reason'][reason] = self.stats['by_reason'].get(reason, 0) + 1
+            if retry:
+                self.stats['retried_sources'] += 1
+
+    def before_source(self, worker: BrowserWorker):
+        reason = self.recycle_reason(worker)
+        if reason:
+            self.recycle(worker, reason)
+
+
+def launch_workers(count: int, factory: Callable[[int], Optional[BrowserWorker]]) -> List[BrowserWorker]:
+    """Start count browsers concurrently with factory(index); failed or rejected (None) launches are left out."""
+    results: Dict[int, BrowserWorker] = {}
+
+    def launch(i):
+        try:
+            worker = factory(i)
+        except Exception:
+            logger.exception(f'Browser pool: failed to start browser {i}')
+            return
+        if worker is not None:
+            results[i] = worker
+
+    threads = [threading.Thread(target=launch, args=(i,), name=f'browser-launch-{i}', daemon=True) for i in range(1, count + 1)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [results[i] for i in sorted(results)]
+
+
+def run_sources(workers: List[BrowserWorker], sources: Iterable[Any], handler: Callable[[BrowserWorker, Any], None],
+                limiter: Optional[AccountLimiter] = None, account: str = '', should_stop: Optional[Callable[[], None]] = None,
+                supervisor: Optional[BrowserSupervisor] = None) -> Dict[str, Any]:
+    """Run handler(worker, source) for every source, one source per worker at a time.
+
+    The handler deals with per-source errors itself; an exception escaping it (including a stop
+    request raised by should_stop) makes the other workers finish their current source and take
+    no new ones, and is re-raised here. With a supervisor, browsers are checked (and recycled)
+    before each source, and a source whose browser crashed is retried once on a fresh browser; if
+    it crashes that one too, it is skipped (the next before_source replaces the browser).
+    With one worker everything runs on the calling thread.
+    Returns {workers, sources, seconds, per_worker}.
+    """
+    todo: 'queue.Queue' = queue.Queue()
+    for s in sources:
+        todo.put(s)
+    total = todo.qsize()
+    failure: List[BaseException] = []
+    started = time.time()
+
+    def work(worker):
+        while not failure:
+            try:
+                source = todo.get_nowait()
+            except queue.Empty:
+                return
+            t0 = time.time()
+            try:
+                if should_stop is not None:
+                    should_stop()
+                if supervisor is not None:
+                    supervisor.before_source(worker)
+                if limiter is not None:
+                    with limiter.slot(account, should_stop):
+                        run_one(worker, source)
+                else:
+                    run_one(worker, source)
+            except BaseException as e:
+                failure.append(e)
+                return
+            finally:
+                worker.sources += 1
+                worker.pages += 1
+                worker.busy_seconds += time.time() - t0
+
+    def run_one(worker, source):
+        try:
+            handler(worker, source)
+        except Exception as e:
+            if supervisor is None or not is_browser_crash(e):
+                raise
+            logger.warning(f'Browser pool: {worker.name} crashed ({str(e)[:120]}); retrying the source on a new browser')
+            supervisor.recycle(worker, 'crashed', retry=True)
+            try:
+                handler(worker, source)
+            except Exception as again:
+                if not is_browser_crash(again):
+                    raise
+                logger.error(f'Browser pool: {worker.name} crashed again on the same source ({str(again)[:120]}); skipping it')
+
+    if len(workers) <= 1:
+        if workers:
+            work(workers[0])
+    else:
+        threads = [threading.Thread(target=work, args=(w,), name=f'scraper-{w.name}', daemon=True) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    if failure:
+        raise failure[0]
+    return {
+        'workers': len(workers),
+        'sources': total,
+        'seconds': round(time.time() - started, 1),
+        'per_worker': {w.name: {'sources': w.sources, 'busy_seconds': round(w.busy_seconds, 1), 'recycles': w.recycles} for w in workers},
+    }
+
+
+class WarmBrowserPool:
+    """Idle, pre-launched browsers kept ready so a run does not pay for Chrome's cold start.
+
+    factory() returns (driver, account) or None; account is the LinkedIn account the browser was
+    pre-signed-in for ('' for a plain browser, usable by any run). take(account) hands out a
+    matching idle browser that still responds, or None, and refills the pool in the background.
+    """
+
+    def __init__(self, factory: Callable[[], Optional[tuple]], size: int = 1):
+        self._factory = factory
+        self.size = max(0, int(size))
+        self._lock = threading.Lock()
+        self._idle: List[tuple] = []
+        self._filling = False
+        self._closed = False
+        self.stats: Dict[str, Any] = {'size': self.size, 'idle': 0, 'launched': 0, 'failed': 0, 'hits': 0, 'misses': 0, 'discarded': 0, 'last_launch_seconds': None}
+
+    def start(self):
+        """Fill the pool on a background thread (no-op if already filling or size is 0)."""
+        with self._lock:
+            if self._filling or self._closed or len(self._idle) >= self.size:
+                return
+            self._filling = True
+        threading.Thread(target=self._fill, name='warm-browser-pool', daemon=True).start()
+
+    def _fill(self):
+        try:
+            while True:
+                with self._lock:
+                    if self._closed or len(self._idle) >= self.size:
+                        return
+                t0 = time.time()
+                try:
+                    entry = self._factory()
+                except Exception:
+                    logger.exception('Browser pool: failed to pre-launch a browser')
+                    entry = None
+                if entry is None:
+                    with self._lock:
+                        self.stats['failed'] += 1
+                    return
+                with self._lock:
+                    if self._closed:
+                        _quit(entry[0])
+                        return
+                    self._idle.append(entry)
+                    self.stats['launched'] += 1
+                    self.stats['idle'] = len(self._idle)
+                    self.stats['last_launch_seconds'] = round(time.time() - t0, 2)
+        finally:
+            with self._lock:
+                self._filling = False
+
+    def take(self, account: str = '') -> Optional[Any]:
+        key = (account or '').strip().lower()
+        driver = None
+        while driver is None:
+            with self._lock:
+                idx = next((i for i, (_, acc) in enumerate(self._idle) if acc in ('', key)), None)
+                if idx is None:
+                    self.stats['misses'] += 1
+                    break
+                candidate, _ = self._idle.pop(idx)
+                self.stats['idle'] = len(self._idle)
+            try:
+                candidate.current_url
+                driver = candidate
+            except Exception:
+                # Died while idle (crash, closed window)
+                with self._lock:
+                    self.stats['discarded'] += 1
+                _quit(candidate)
+        if driver is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+        self.start()
+        return driver
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self.stats['idle'] = 0
+        for driver, _ in idle:
+            _quit(driver)
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
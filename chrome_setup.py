@@ -0,0 +1,116 @@
+"""Locate the Chrome binary and a matching chromedriver, with their versions.
+
+resolve() checks a previously resolved entry first: as long as the binary and driver still exist
+and Chrome's version is unchanged, the entry is reused as is, with no webdriver-manager lookup and
+no network. Only a version mismatch, or a missing file, triggers a new resolution. The entry is a
+plain dict, so callers can keep it anywhere (the app stores it in the settings table).
+"""
+import glob
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+
+def chrome_candidates() -> List[str]:
+    """Chrome/Chromium binaries to try, in order: CHROME_BIN, then the usual Linux, macOS and Windows locations."""
+    paths = [os.getenv('CHROME_BIN', '')]
+    for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome'):
+        paths.append(shutil.which(name) or '')
+    paths += [
+        '/usr/bin/google-chrome', '/usr/bin/google-chrome-stable', '/opt/google/chrome/chrome',
+        '/usr/bin/chromium', '/usr/bin/chromium-browser', '/snap/bin/chromium',
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe"),
+    ]
+    return list(dict.fromkeys(p for p in paths if p))
+
+
+def find_chrome_binary() -> Optional[str]:
+    return next((p for p in chrome_candidates() if os.path.isfile(p)), None)
+
+
+def _run_version(path: str) -> Optional[str]:
+    try:
+        out = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=15).stdout
+    except Exception:
+        return None
+    m = _VERSION_RE.search(out or '')
+    return m.group(0) if m else None
+
+
+def chrome_version(binary: str) -> Optional[str]:
+    """Full Chrome version ('120.0.6099.109'), or None if it can't be determined."""
+    if sys.platform.startswith('win'):
+        # chrome.exe --version opens a browser window on Windows; the install keeps a folder per version instead
+        versions = [d for d in glob.glob(os.path.join(os.path.dirname(binary), '*')) if _VERSION_RE.fullmatch(os.path.basename(d))]
+        if not versions:
+            return None
+        return max((os.path.basename(d) for d in versions), key=lambda v: tuple(int(x) for x in v.split('.')))
+    return _run_version(binary)
+
+
+def chromedriver_version(path: str) -> Optional[str]:
+    return _run_version(path)
+
+
+def major(version: Optional[str]) -> Optional[int]:
+    m = _VERSION_RE.search(version or '')
+    return int(m.group(1)) if m else None
+
+
+def _driver_candidates() -> List[str]:
+    paths = [os.getenv('CHROMEDRIVER_PATH', ''), shutil.which('chromedriver') or '']
+    return list(dict.fromkeys(p for p in paths if p and os.path.isfile(p)))
+
+
+def resolve(cached: Optional[Dict[str, Any]] = None, install: Optional[Callable[[], str]] = None) -> Dict[str, Any]:
+    """The Chrome binary and chromedriver to use: {binary, binary_version, chromedriver, chromedriver_version, source, resolved_at}.
+
+    A cached entry is returned unchanged (source 'cache') while both files exist and the installed
+    Chrome still reports the cached version. Otherwise a chromedriver with Chrome's major version is
+    looked for in CHROMEDRIVER_PATH / PATH, and only then install() (webdriver-manager) is called.
+    binary is None when no Chrome is installed; chromedriver is None when none matched (Selenium then
+    falls back to its own driver lookup).
+    """
+    binary = (cached or {}).get('binary')
+    if not binary or not os.path.isfile(binary) or (os.getenv('CHROME_BIN') and os.getenv('CHROME_BIN') != binary):
+        binary = find_chrome_binary()
+    if not binary:
+        return {'binary': None, 'binary_version': None, 'chromedriver': None, 'chromedriver_version': None, 'source': 'missing'}
+    version = chrome_version(binary)
+    if (cached and cached.get('binary') == binary and cached.get('chromedriver') and os.path.isfile(cached['chromedriver'])
+            and version and cached.get('binary_version') == version):
+        return {**cached, 'source': 'cache'}
+    if cached and cached.get('binary_version') and version != cached.get('binary_version'):
+        logger.info(f"Chrome setup: Chrome version changed ({cached.get('binary_version')} -> {version}); resolving chromedriver again")
+
+    entry = {'binary': binary, 'binary_version': version, 'chromedriver': None, 'chromedriver_version': None, 'source': None,
+             'resolved_at': datetime.utcnow().isoformat() + 'Z'}
+    for path in _driver_candidates():
+        drv_version = chromedriver_version(path)
+        if version is None or major(drv_version) == major(version):
+            entry.update(chromedriver=path, chromedriver_version=drv_version, source='local')
+            return entry
+        logger.info(f'Chrome setup: skipping {path} (chromedriver {drv_version} does not match Chrome {version})')
+    if install is not None:
+        try:
+            path = install()
+            entry.update(chromedriver=path, chromedriver_version=chromedriver_version(path), source='download')
+            if version and major(entry['chromedriver_version']) not in (None, major(version)):
+                logger.warning(f"Chrome setup: downloaded chromedriver {entry['chromedriver_version']} does not match Chrome {version}")
+            return entry
+        except Exception as e:
+            logger.warning(f'Chrome setup: webdriver-manager failed ({str(e)[:200]}); leaving the chromedriver lookup to Selenium')
+    entry['source'] = 'selenium'
+    return entry
@@ -2,7 +2,7 @@ import os
 import sqlite3
 import json
 import threading
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Set, List
 
 # Allow overriding the DB path via environment variable DB_PATH. Default to app.db
@@ -29,6 +29,9 @@ def init_db(db_path: Optional[str] = None):
 
     settings table: key (TEXT PRIMARY KEY), value (TEXT JSON)
     sent_jobs table: id (TEXT PRIMARY KEY), payload (TEXT JSON), created_at (TEXT)
+    ai_verdicts table: key (TEXT PRIMARY KEY), keep (INTEGER), reason (TEXT), model_url (TEXT), created_at (TEXT), text (TEXT)
+    source_cursors table: source (TEXT PRIMARY KEY), activity_id (INTEGER), post_time (TEXT), updated_at (TEXT)
+    linkedin_sessions table: account (TEXT PRIMARY KEY), cookies (TEXT JSON), updated_at (TEXT)
     """
     with _lock:
         conn = _get_conn(db_path)
@@ -48,6 +51,16 @@ def init_db(db_path: Optional[str] = None):
                 cur.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
 
             cur.execute("CREATE TABLE IF NOT EXISTS sent_jobs (id TEXT PRIMARY KEY, payload TEXT NOT NULL, created_at TEXT)")
+            cur.execute("CREATE TABLE IF NOT EXISTS ai_verdicts (key TEXT PRIMARY KEY, keep INTEGER NOT NULL, reason TEXT, model_url TEXT, created_at TEXT NOT NULL)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_ai_verdicts_created_at ON ai_verdicts(created_at)")
+            # Post text was added later (training data for the local pre-classifier); migrate older DBs
+            cols = {r['name'] for r in cur.execute('PRAGMA table_info(ai_verdicts)').fetchall()}
+            if 'text' not in cols:
+                cur.execute('ALTER TABLE ai_verdicts ADD COLUMN text TEXT')
+            # Newest LinkedIn activity id seen per scraped source (group URL / search keyword)
+            cur.execute("CREATE TABLE IF NOT EXISTS source_cursors (source TEXT PRIMARY KEY, activity_id INTEGER NOT NULL, post_time TEXT, updated_at TEXT NOT NULL)")
+            # Browser cookies (li_at etc.) of the last successful LinkedIn login per account
+            cur.execute("CREATE TABLE IF NOT EXISTS linkedin_sessions (account TEXT PRIMARY KEY, cookies TEXT NOT NULL, updated_at TEXT NOT NULL)")
             conn.commit()
         finally:
             conn.close()
@@ -140,6 +153,218 @@ def get_all_sent_jobs(db_path: Optional[str] = None) -> List[Dict[str, Any]]:
             conn.close()
 
 
+def get_ai_verdict(key: str, ttl_seconds: Optional[float] = None, db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return a cached AI verdict {keep, reason, model_url, created_at} or None if missing/expired."""
+    if not key:
+        return None
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT keep, reason, model_url, created_at FROM ai_verdicts WHERE key = ?', (key,))
+            r = cur.fetchone()
+            if not r:
+                return None
+            if ttl_seconds:
+                cutoff = (datetime.utcnow() - timedelta(seconds=ttl_seconds)).isoformat() + 'Z'
+                if (r['created_at'] or '') < cutoff:
+                    return None
+            return {'keep': bool(r['keep']), 'reason': r['reason'] or '', 'model_url': r['model_url'] or '', 'created_at': r['created_at']}
+        finally:
+            conn.close()
+
+def put_ai_verdict(key: str, keep: bool, reason: str, model_url: Optional[str] = None, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None, text: Optional[str] = None, db_path: Optional[str] = None) -> bool:
+    """Store an AI verdict (optionally with the post text), then drop expired rows and the oldest rows beyond max_entries."""
+    if not key:
+        return False
+    created_at = datetime.utcnow().isoformat() + 'Z'
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                'INSERT INTO ai_verdicts(key, keep, reason, model_url, created_at, text) VALUES(?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET keep=excluded.keep, reason=excluded.reason, model_url=excluded.model_url, created_at=excluded.created_at, '
+                'text=COALESCE(excluded.text, ai_verdicts.text)',
+                (key, 1 if keep else 0, reason or '', model_url or '', created_at, text)
+            )
+            if ttl_seconds:
+                cutoff = (datetime.utcnow() - timedelta(seconds=ttl_seconds)).isoformat() + 'Z'
+                cur.execute('DELETE FROM ai_verdicts WHERE created_at < ?', (cutoff,))
+            if max_entries and max_entries > 0:
+                cur.execute('DELETE FROM ai_verdicts WHERE key IN (SELECT key FROM ai_verdicts ORDER BY created_at DESC LIMIT -1 OFFSET ?)', (int(max_entries),))
+            conn.commit()
+            return True
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            conn.close()
+
+
+def get_ai_verdict_history(limit: Optional[int] = None, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return stored AI verdicts that include post text, newest first: [{key, keep, reason, text}]."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            sql = "SELECT key, keep, reason, text FROM ai_verdicts WHERE text IS NOT NULL AND text != '' ORDER BY created_at DESC"
+            if limit and limit > 0:
+                cur.execute(sql + ' LIMIT ?', (int(limit),))
+            else:
+                cur.execute(sql)
+            return [{'key': r['key'], 'keep': bool(r['keep']), 'reason': r['reason'] or '', 'text': r['text']} for r in cur.fetchall()]
+        finally:
+            conn.close()
+
+
+def get_source_cursors(db_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Return every source cursor: {source: {activity_id, post_time, updated_at}}."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT source, activity_id, post_time, updated_at FROM source_cursors')
+            return {r['source']: {'activity_id': r['activity_id'], 'post_time': r['post_time'], 'updated_at': r['updated_at']} for r in cur.fetchall()}
+        finally:
+            conn.close()
+
+
+def advance_source_cursor(source: str, activity_id: int, post_time: Optional[str] = None, db_path: Optional[str] = None) -> bool:
+    """Move a source's cursor forward to activity_id; never moves it back. Returns True if it moved."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                'INSERT INTO source_cursors(source, activity_id, post_time, updated_at) VALUES(?, ?, ?, ?) '
+                'ON CONFLICT(source) DO UPDATE SET activity_id=excluded.activity_id, post_time=excluded.post_time, updated_at=excluded.updated_at '
+                'WHERE excluded.activity_id > source_cursors.activity_id',
+                (source, int(activity_id), post_time, datetime.utcnow().isoformat() + 'Z'),
+            )
+            conn.commit()
+            return cur.rowcount > 0
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            conn.close()
+
+
+def source_cursor_targets(posts: Dict[str, Dict[str, int]], handled: Set[str]) -> Dict[str, int]:
+    """Where each source's cursor may move after a run: {source: activity id}.
+
+    posts maps source -> {job id: activity id} for the posts a run saw; handled holds the job ids
+    that were emailed, were already in sent_jobs or were rejected by the filters. A cursor only moves
+    to the newest handled post below the oldest unhandled one, so a post that was held, failed to
+    send or never reached the sender comes up again next run. Sources with nothing to move to are left out.
+    """
+    targets = {}
+    for source, ids in posts.items():
+        pending = [num for jid, num in ids.items() if jid not in handled]
+        limit = min(pending) if pending else None
+        done = [num for jid, num in ids.items() if jid in handled and (limit is None or num < limit)]
+        if done:
+            targets[source] = max(done)
+    return targets
+
+
+def clear_source_cursors(source: Optional[str] = None, db_path: Optional[str] = None) -> int:
+    """Delete one source's cursor (or all of them) so the next run scrolls its full lookback again. Returns rows deleted."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            if source:
+                cur.execute('DELETE FROM source_cursors WHERE source = ?', (source,))
+            else:
+                cur.execute('DELETE FROM source_cursors')
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
+
+
+def _account_key(account: Optional[str]) -> str:
+    # One spelling per LinkedIn account for the sessions table (matches browser.account_profile_dir)
+    return (account or '').strip().lower()
+
+
+def get_linkedin_session(account: str, db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Stored session of a LinkedIn account: {cookies: [...], updated_at}, or None."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT cookies, updated_at FROM linkedin_sessions WHERE account = ?', (_account_key(account),))
+            r = cur.fetchone()
+            if not r:
+                return None
+            try:
+                cookies = json.loads(r['cookies'])
+            except Exception:
+                return None
+            return {'cookies': cookies, 'updated_at': r['updated_at']}
+        finally:
+            conn.close()
+
+
+def save_linkedin_session(account: str, cookies: List[Dict[str, Any]], db_path: Optional[str] = None) -> bool:
+    """Store (replace) the browser cookies of a LinkedIn account after a successful login."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                'INSERT OR REPLACE INTO linkedin_sessions(account, cookies, updated_at) VALUES(?, ?, ?)',
+                (_account_key(account), json.dumps(cookies), datetime.utcnow().isoformat() + 'Z'),
+            )
+            conn.commit()
+            return True
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            conn.close()
+
+
+def list_linkedin_sessions(db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Accounts with a stored session and when it was saved (no cookie values)."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT account, updated_at FROM linkedin_sessions ORDER BY account')
+            return [{'account': r['account'], 'updated_at': r['updated_at']} for r in cur.fetchall()]
+        finally:
+            conn.close()
+
+
+def clear_linkedin_sessions(account: Optional[str] = None, db_path: Optional[str] = None) -> int:
+    """Forget one account's stored cookies (or all of them) so the next run logs in with the password. Returns rows deleted."""
+    with _lock:
+        conn = _get_conn(db_path)
+        try:
+            cur = conn.cursor()
+            if account:
+                cur.execute('DELETE FROM linkedin_sessions WHERE account = ?', (_account_key(account),))
+            else:
+                cur.execute('DELETE FROM linkedin_sessions')
+            conn.commit()
+            return cur.rowcount
+        finally:
+            conn.close()
+
+
 def db_info(db_path: Optional[str] = None) -> Dict[str, Any]:
     """Return resolved DB path and whether it looks like it's inside OneDrive.
 
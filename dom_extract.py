@@ -0,0 +1,244 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+# Runs inside the page (execute_async_script). Finds the post containers for the first selector
+# that matches, clicks their "see more" buttons, waits once for the expanded text to render, then
+# returns everything the scraper needs from each post as plain JSON.
+# With onlyNew (PostHarvester) containers already read are skipped and the result is {posts, visible}.
+# Virtualized lists reuse nodes for other posts, so a container is marked with what it held when read:
+# its data-urn, or a hash of its first 120 characters of text (actor line and opening, which "see more"
+# does not change) when it has none.
+EXTRACT_POSTS_JS = r"""
+const selectors = arguments[0], strict = arguments[1], maxExpand = arguments[2], settleMs = arguments[3],
+      onlyNew = arguments[4];
+const done = arguments[arguments.length - 1];
+let posts = [];
+for (const sel of selectors) {
+    posts = Array.from(document.querySelectorAll(sel));
+    if (posts.length) break;
+}
+const urnOf = (p) => {
+    const urnEl = p.matches('[data-urn]') ? p : p.querySelector('[data-urn]');
+    return urnEl ? (urnEl.getAttribute('data-urn') || '') : '';
+};
+const markOf = (p) => {
+    const u = urnOf(p);
+    if (u) return u;
+    const t = (p.innerText || '').trim().slice(0, 120);
+    let h = 0;
+    for (let i = 0; i < t.length; i++) h = (h * 31 + t.charCodeAt(i)) | 0;
+    return 'txt:' + h;
+};
+const visible = posts.length, marks = [];
+if (onlyNew) {
+    posts = posts.filter((p) => {
+        const m = markOf(p);
+        if (p.getAttribute('data-scraper-read') === m) return false;
+        marks.push(m);
+        return true;
+    });
+}
+const isExpander = (b) => {
+    const t = (b.textContent || '').toLowerCase();
+    return strict ? t.includes('see more') : (t.includes('see more') || t.includes('more'));
+};
+let clicked = 0;
+for (const p of posts) {
+    let n = 0;
+    for (const b of p.querySelectorAll('button')) {
+        if (maxExpand && n >= maxExpand) break;
+        if (!isExpander(b)) continue;
+        n++;
+        try { b.click(); clicked++; } catch (e) {}
+    }
+}
+const collect = () => posts.map((p) => {
+    const anchors = Array.from(p.querySelectorAll('a[href]'));
+    const hrefs = anchors.map((a) => a.href || a.getAttribute('href') || '');
+    // mailto:/tel: links outside comment threads (an ancestor whose class mentions "comment")
+    const contactHrefs = anchors
+        .filter((a) => /^(mailto|tel):/i.test(a.getAttribute('href') || ''))
+        .filter((a) => !(a.parentElement && a.parentElement.closest('[class*="comment" i]')))
+        .map((a) => a.getAttribute('href'));
+    const timeEl = p.querySelector('.update-components-actor__sub-description, .feed-shared-actor__sub-description, time');
+    return {
+        text: (p.innerText || '').trim(),
+        hrefs: hrefs,
+        contact_hrefs: contactHrefs,
+        urn: urnOf(p),
+        time_label: timeEl ? (timeEl.innerText || timeEl.textContent || '').trim() : '',
+    };
+});
+setTimeout(() => {
+    try {
+        const items = collect();
+        if (!onlyNew) return done(items);
+        posts.forEach((p, i) => { p.setAttribute('data-scraper-read', marks[i]); });
+        done({posts: items, visible: visible});
+    } catch (e) { done({error: String(e)}); }
+}, clicked ? settleMs : 0);
+"""
+
+# Pages/posts extracted, time spent, and how often the per-element fallback had to be used
+EXTRACT_STATS: Dict[str, Any] = {'pages': 0, 'posts': 0, 'seconds': 0.0, 'fallbacks': 0}
+# Scroll-time harvesting (PostHarvester): pages, harvest steps, posts kept, posts that were no longer in the
+# DOM by the end of scrolling (what a single read after scrolling would have missed), time spent, failures
+HARVEST_STATS: Dict[str, Any] = {'pages': 0, 'steps': 0, 'posts': 0, 'recovered': 0, 'seconds': 0.0, 'failures': 0}
+_stats_lock = threading.Lock()
+
+
+def _extract_posts_webdriver(driver, selectors: Sequence[str], strict: bool, max_expand: int, settle: float) -> List[Dict[str, Any]]:
+    # Per-element fallback (one WebDriver round trip per call) for drivers where the script fails
+    posts = []
+    for sel in selectors:
+        try:
+            posts = driver.find_elements(By.CSS_SELECTOR, sel)
+        except Exception:
+            posts = []
+        if posts:
+            break
+    if strict:
+        more_xpath = ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'see more')]"
+    else:
+        more_xpath = ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'see more') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), 'more')]"
+    out = []
+    for post in posts:
+        try:
+            buttons = post.find_elements(By.XPATH, more_xpath)
+            for b in (buttons[:max_expand] if max_expand else buttons):
+                try:
+                    b.click()
+                    time.sleep(settle)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+        item = {'text': '', 'hrefs': [], 'contact_hrefs': [], 'urn': '', 'time_label': ''}
+        try:
+            item['text'] = (post.text or '').strip()
+            item['hrefs'] = [a.get_attribute('href') or '' for a in post.find_elements(By.TAG_NAME, 'a')]
+            contact = post.find_elements(
+                By.XPATH,
+                ".//a[starts-with(@href,'mailto:') or starts-with(@href,'tel:')][not(ancestor::*[contains(translate(@class,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'comment')])]"
+            )
+            item['contact_hrefs'] = [a.get_attribute('href') or '' for a in contact]
+            item['urn'] = post.get_attribute('data-urn') or ''
+        except Exception:
+            pass
+        out.append(item)
+    return out
+
+
+def extract_posts(driver, selectors: Sequence[str], strict: bool = False, max_expand: int = 2, settle: float = 0.3) -> List[Dict[str, Any]]:
+    """Expand and read every post on the current page in a single WebDriver round trip.
+
+    selectors are CSS selectors tried in order; the first that matches any element defines the
+    posts. strict=True only clicks buttons saying "see more" (all of them); otherwise buttons
+    containing "more" also count, up to max_expand per post (0 = no limit). settle is how long
+    to wait once, after all clicks, for the expanded text to render.
+
+    Returns a list of {text, hrefs, contact_hrefs, urn, time_label}: hrefs are all anchor hrefs,
+    contact_hrefs the mailto:/tel: links outside comment threads, urn the container's data-urn.
+    Falls back to per-element WebDriver calls if the script cannot run.
+    """
+    started = time.perf_counter()
+    items = None
+    try:
+        result = driver.execute_async_script(EXTRACT_POSTS_JS, list(selectors), bool(strict), int(max_expand or 0), int(settle * 1000), False)
+        if isinstance(result, list):
+            items = result
+        else:
+            logger.warning(f"DOM extract: script returned {str(result)[:200]}; using per-element fallback")
+    except Exception as e:
+        logger.warning(f"DOM extract: script failed ({str(e)[:120]}); using per-element fallback")
+    fallback = items is None
+    if fallback:
+        items = _extract_posts_webdriver(driver, selectors, strict, max_expand, settle)
+    with _stats_lock:
+        EXTRACT_STATS['pages'] += 1
+        EXTRACT_STATS['posts'] += len(items)
+        EXTRACT_STATS['seconds'] = round(EXTRACT_STATS['seconds'] + time.perf_counter() - started, 3)
+        if fallback:
+            EXTRACT_STATS['fallbacks'] += 1
+    return items
+
+
+class PostHarvester:
+    """Reads posts while a page is scrolled, for lists that drop off-screen posts from the DOM.
+
+    LinkedIn's feed and search results are virtualized: posts scrolled far enough away are removed
+    (or their nodes reused), so one extract_posts() after scrolling misses them. Call harvest(driver)
+    before every scroll step and once at the end (scroll_through_lookback's on_step): it expands and
+    reads the rendered posts not read yet, in one round trip. finish() returns everything seen, in
+    page order, deduplicated by urn (or text); a later, longer read of a post replaces the earlier one.
+
+    steps holds {visible, new, total} per harvest. If the script fails the harvester stops and
+    finish() returns [], so the caller falls back to a single extract_posts().
+    """
+
+    def __init__(self, selectors: Sequence[str], strict: bool = False, max_expand: int = 2, settle: float = 0.3):
+        self.selectors = list(selectors)
+        self.strict = bool(strict)
+        self.max_expand = int(max_expand or 0)
+        self.settle = settle
+        self.steps: List[Dict[str, int]] = []
+        self.failed = False
+        self._items: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+        self._seconds = 0.0
+
+    def harvest(self, driver) -> int:
+        """Read the posts rendered right now that were not read before; returns how many were new."""
+        if self.failed:
+            return 0
+        started = time.perf_counter()
+        try:
+            result = driver.execute_async_script(EXTRACT_POSTS_JS, self.selectors, self.strict, self.max_expand, int(self.settle * 1000), True)
+            if not isinstance(result, dict) or not isinstance(result.get('posts'), list):
+                raise ValueError(f'unexpected result {str(result)[:200]}')
+        except Exception as e:
+            logger.warning(f'DOM extract: harvesting during scroll failed ({str(e)[:120]}); reading the page once at the end')
+            self.failed = True
+            with _stats_lock:
+                HARVEST_STATS['failures'] += 1
+            return 0
+        new = 0
+        for item in result['posts']:
+            key = item.get('urn') or (item.get('text') or '').strip()
+            if not key:
+                continue
+            idx = self._index.get(key)
+            if idx is None:
+                self._index[key] = len(self._items)
+                self._items.append(item)
+                new += 1
+            elif len(item.get('text') or '') > len(self._items[idx].get('text') or ''):
+                self._items[idx] = item
+        self.steps.append({'visible': int(result.get('visible') or 0), 'new': new, 'total': len(self._items)})
+        self._seconds += time.perf_counter() - started
+        return new
+
+    @property
+    def recovered(self) -> int:
+        # Posts no longer rendered at the last harvest
+        return max(0, len(self._items) - self.steps[-1]['visible']) if self.steps else 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {'harvest_steps': len(self.steps), 'posts_per_step': [s['new'] for s in self.steps], 'recovered_posts': self.recovered}
+
+    def finish(self) -> List[Dict[str, Any]]:
+        if self.failed:
+            return []
+        with _stats_lock:
+            HARVEST_STATS['pages'] += 1
+            HARVEST_STATS['steps'] += len(self.steps)
+            HARVEST_STATS['posts'] += len(self._items)
+            HARVEST_STATS['recovered'] += self.recovered
+            HARVEST_STATS['seconds'] = round(HARVEST_STATS['seconds'] + self._seconds, 3)
+        return list(self._items)
@@ -0,0 +1,515 @@
+"""Local stand-in for the LinkedIn pages the scraper drives, for reproducible Selenium load tests.
+
+Serves /login, /feed/, /groups/<id>/ and /search/results/content/ with infinite-scroll pagination,
+"see more" buttons, the Posts pill and Sort by menu on search results, and an optional checkpoint
+page after login. --render-window N keeps only the last N posts in the DOM, like LinkedIn's
+virtualized lists drop off-screen posts while scrolling. Nothing leaves the machine, so pages/minute, driver memory and wait-strategy
+changes can be measured run after run against the same content.
+
+Post texts come from saved pages (--fixtures, parsed with page_parser), from the sent_jobs table
+(--db), or, when neither yields posts, from a seeded synthetic corpus of hiring, training-promo and
+off-topic posts. Point the scraper at the server with LINKEDIN_BASE_URL=http://127.0.0.1:<port>.
+
+Usage: python fake_linkedin.py [--port 8765] [--fixtures GLOB] [--db PATH] [--page-size 10] [--pages 5]
+                               [--latency-ms 0] [--render-window 0] [--checkpoint] [--checkpoint-clear-after 5]
+"""
+import glob
+import hashlib
+import html as html_lib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# Characters shown before the "see more" button; the rest is revealed on click
+TRUNCATE_AT = 220
+
+_FIRST_NAMES = ('Maria', 'James', 'Priya', 'Chen', 'Ahmed', 'Sofia', 'David', 'Aisha', 'Luca', 'Grace')
+_LAST_NAMES = ('Garcia', 'Smith', 'Patel', 'Wang', 'Khan', 'Rossi', 'Johnson', 'Okafor', 'Nguyen', 'Brown')
+_ROLES = ('Java Developer', 'Python Engineer', 'Data Engineer', 'DevOps Engineer', 'Salesforce Developer',
+          'QA Automation Engineer', 'React Developer', 'Business Analyst', '.NET Developer', 'Cloud Architect')
+_CITIES = ('Austin, TX', 'Dallas, TX', 'Charlotte, NC', 'Chicago, IL', 'Remote (USA)', 'Jersey City, NJ',
+           'Atlanta, GA', 'Seattle, WA', 'San Juan, Puerto Rico', 'Bangalore, India')
+_HIRING = (
+    "We are hiring a {role} in {city}. {kind} role, 10+ years required. Please send your resume to {email} or call {phone}. "
+    "Must have strong experience with microservices, CI/CD and cloud platforms; immediate joiners preferred.",
+    "Urgent requirement: {role} | {city} | {kind}. Looking for candidates with hands-on experience and good communication. "
+    "Share resume at {email}. Visa: USC/GC/H1B. Rate DOE.",
+    "#hiring {role} - {city} ({kind}). My client is actively hiring; apply now by emailing {email}. "
+    "Interview process is two rounds over video, start ASAP.",
+)
+_PROMO = (
+    "New batch starting Monday! Join our {role} training with placement assistance and mock interview prep. "
+    "Register today for a free demo class. Limited seats, discount for early enrollment.",
+    "Upskill with our certification course for {role}. Job support and resume writing included. "
+    "Call {phone} to enroll in the next weekend batch.",
+)
+_OTHER = (
+    "Grateful to celebrate 5 years at my company today. Thank you to the amazing team in {city} for the support!",
+    "Some thoughts on building reliable data pipelines: idempotency, backfills and observability matter more than tools.",
+    "Excited to share that I completed the AWS Solutions Architect exam this week. On to the next challenge.",
+)
+
+
+def synthetic_posts(count: int = 200, seed: int = 0) -> List[str]:
+    """Deterministic mix of post texts: ~60% hiring (with contacts), ~20% training promos, ~20% off-topic."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(count):
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        fields = {
+            'role': rng.choice(_ROLES),
+            'city': rng.choice(_CITIES),
+            'kind': rng.choice(('Contract', 'C2C', 'W2', 'Full-time', 'Contract to hire')),
+            'email': f"{first.lower()}.{last.lower()}{i}@example-staffing.com",
+            'phone': f"+1 ({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        }
+        roll = rng.random()
+        pool = _HIRING if roll < 0.6 else _PROMO if roll < 0.8 else _OTHER
+        out.append(rng.choice(pool).format(**fields))
+    return out
+
+
+def load_corpus(fixtures: Optional[str] = None, db_path: Optional[str] = None, seed: int = 0) -> List[str]:
+    """Post texts from saved pages and/or sent_jobs; synthetic posts if those yield none."""
+    texts: List[str] = []
+    if fixtures:
+        from page_parser import POST_SELECTORS, extract_post_items, read_snapshot
+        selectors = list(dict.fromkeys(s for group in POST_SELECTORS.values() for s in group))
+        for path in sorted(glob.glob(fixtures)):
+            texts.extend(item['text'] for item in extract_post_items(read_snapshot(path), selectors) if item.get('text'))
+    if db_path:
+        from db import get_all_sent_jobs
+        texts.extend(j.get('raw_text') or j.get('text') or '' for j in get_all_sent_jobs(db_path=db_path))
+    texts = [t.strip() for t in texts if t and t.strip()]
+    return texts or synthetic_posts(seed=seed)
+
+
+def _age_label(minutes: int) -> str:
+    if minutes < 60:
+        return f'{max(1, minutes)}m'
+    if minutes < 24 * 60:
+        return f'{minutes // 60}h'
+    return f'{minutes // (24 * 60)}d'
+
+
+_LOGIN_HTML = """<!doctype html>
+<html><head><title>LinkedIn Login, Sign in | LinkedIn</title></head>
+<body>
+<main>
+  <h1>Sign in</h1>
+  <form method="post" action="/checkpoint/lg/login-submit">
+    <input id="username" name="session_key" type="text" autocomplete="username">
+    <input id="password" name="session_password" type="password" autocomplete="current-password">
+    <button type="submit" class="btn__primary--large">Sign in</button>
+  </form>
+</main>
+</body></html>
+"""
+
+_CHECKPOINT_HTML = """<!doctype html>
+<html><head><title>Security Verification | LinkedIn</title>{refresh}</head>
+<body>
+<main>
+  <h1>Let's do a quick security check</h1>
+  <p>Are you a human? Complete the verification to continue.</p>
+  <form method="get" action="/checkpoint/clear"><button type="submit">Verify</button></form>
+</main>
+</body></html>
+"""
+
+_PAGE_HTML = """<!doctype html>
+<html><head>
+<title>{title} | LinkedIn</title>
+<link rel="canonical" href="{canonical}">
+<style>
+  body {{ font-family: sans-serif; margin: 0 auto; max-width: 720px; }}
+  .feed-shared-update-v2 {{ border: 1px solid #ddd; margin: 12px 0; padding: 12px; min-height: 360px; }}
+  [role=listbox] {{ border: 1px solid #999; padding: 4px; }}
+</style>
+</head>
+<body>
+<header class="global-nav"><a href="/feed/">Home</a></header>
+{filters}
+<main class="scaffold-finite-scroll__content">
+  <h1>{title}</h1>
+  <{list_tag} id="fake-feed">{posts}</{list_tag}>
+  <div id="fake-loader" aria-busy="false"></div>
+</main>
+<script>
+(function () {{
+  var cfg = {config};
+  var page = 1, loading = false, done = cfg.pages <= 1;
+  function maybeLoad() {{
+    if (loading || done) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 800) return;
+    loading = true;
+    document.getElementById('fake-loader').setAttribute('aria-busy', 'true');
+    fetch('/_fake/posts?' + new URLSearchParams({{kind: cfg.kind, key: cfg.key, sort: cfg.sort, page: page}}), {{credentials: 'same-origin'}})
+      .then(function (r) {{ return r.text(); }})
+      .then(function (html) {{
+        if (!html.trim()) {{ done = true; return; }}
+        var feed = document.getElementById('fake-feed');
+        feed.insertAdjacentHTML('beforeend', html);
+        // Virtualized list: drop the oldest posts, keeping their height as padding so the scroll position holds
+        var dropped = 0;
+        while (cfg.window && feed.children.length > cfg.window) {{
+          dropped += feed.firstElementChild.getBoundingClientRect().height + 24;
+          feed.firstElementChild.remove();
+        }}
+        if (dropped) feed.style.paddingTop = (parseFloat(feed.style.paddingTop || '0') + dropped) + 'px';
+        page += 1;
+        if (page >= cfg.pages) done = true;
+      }})
+      .finally(function () {{
+        loading = false;
+        document.getElementById('fake-loader').setAttribute('aria-busy', 'false');
+      }});
+  }}
+  window.addEventListener('scroll', maybeLoad, {{passive: true}});
+  document.addEventListener('click', function (e) {{
+    var more = e.target.closest('.see-more');
+    if (more) {{
+      var rest = more.parentElement.querySelector('.fake-more');
+      if (rest) rest.hidden = false;
+      more.remove();
+      return;
+    }}
+    if (e.target.closest('#sort-trigger')) {{
+      var box = document.getElementById('sort-menu');
+      box.hidden = !box.hidden;
+      document.getElementById('sort-trigger').setAttribute('aria-expanded', String(!box.hidden));
+      return;
+    }}
+    var opt = e.target.closest('#sort-menu [role=option]');
+    if (opt) {{
+      document.querySelectorAll('#sort-menu [role=option]').forEach(function (o) {{ o.setAttribute('aria-checked', String(o === opt)); }});
+      document.getElementById('show-results').hidden = false;
+      return;
+    }}
+    if (e.target.closest('#show-results')) {{
+      var latest = document.querySelector('#sort-menu [data-sort=latest]').getAttribute('aria-checked') === 'true';
+      var url = new URL(window.location.href);
+      if (latest) url.searchParams.set('sortBy', '"date_posted"'); else url.searchParams.delete('sortBy');
+      window.location.href = url.toString();
+    }}
+  }});
+}})();
+</script>
+</body></html>
+"""
+
+_SEARCH_FILTERS = """<div class="search-reusables__filters-bar">
+  <button class="artdeco-pill artdeco-pill--selected" type="button"><span>Posts</span></button>
+  <div class="artdeco-dropdown">
+    <button id="sort-trigger" type="button" aria-haspopup="listbox" aria-expanded="false"><span>Sort by: {sort_label}</span></button>
+    <div id="sort-menu" role="listbox" hidden>
+      <div role="option" data-sort="top" aria-checked="{top_checked}"><span>Top match</span></div>
+      <div role="option" data-sort="latest" aria-checked="{latest_checked}"><span>Latest</span></div>
+    </div>
+    <button id="show-results" type="button" hidden>Show results</button>
+  </div>
+</div>
+"""
+
+
+class FakeLinkedIn:
+    """The fake site: post corpus, page layout settings and request counters.
+
+    start() serves it from a background thread (port=0 picks a free port) and returns the base
+    URL; stats() reports what was served, including page views per minute.
+    """
+
+    def __init__(self, corpus: Optional[List[str]] = None, host: str = '127.0.0.1', port: int = 8765,
+                 page_size: int = 10, pages: int = 5, latency_ms: int = 0, minutes_per_post: int = 7,
+                 checkpoint: bool = False, checkpoint_clear_after: Optional[float] = None,
+                 require_login: bool = True, seed: int = 0, render_window: int = 0):
+        self.corpus = corpus or synthetic_posts(seed=seed)
+        self.host = host
+        self.port = int(port)
+        self.page_size = max(1, int(page_size))
+        self.pages = max(1, int(pages))
+        self.latency = max(0, int(latency_ms)) / 1000.0
+        self.minutes_per_post = max(1, int(minutes_per_post))
+        self.checkpoint = bool(checkpoint)
+        self.checkpoint_clear_after = checkpoint_clear_after
+        self.require_login = bool(require_login)
+        self.seed = int(seed)
+        # Reference time of the posts' ages and activity ids; fixed for the server's lifetime so ids are stable across runs
+        self._epoch_ms = int(time.time() * 1000)
+        # Posts kept in the DOM while scrolling (0 = all)
+        self.render_window = max(0, int(render_window))
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            'requests': 0, 'page_views': {}, 'scroll_fetches': 0, 'posts_served': 0,
+            'bytes_sent': 0, 'logins': 0, 'checkpoints': 0,
+        }
+        self._started = time.time()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        port = self._httpd.server_address[1] if self._httpd is not None else self.port
+        return f'http://{self.host}:{port}'
+
+    def _count(self, key: str, amount: int = 1, sub: Optional[str] = None):
+        with self._lock:
+            if sub is None:
+                self._stats[key] += amount
+            else:
+                self._stats[key][sub] = self._stats[key].get(sub, 0) + amount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = json.loads(json.dumps(self._stats))
+        elapsed = max(1e-6, time.time() - self._started)
+        views = sum(out['page_views'].values())
+        out.update({'uptime_seconds': round(elapsed, 1), 'page_views_per_minute': round(views / elapsed * 60, 2)})
+        return out
+
+    def reset_stats(self):
+        with self._lock:
+            for key, value in self._stats.items():
+                self._stats[key] = {} if isinstance(value, dict) else 0
+            self._started = time.time()
+
+    # --- content ---
+    def _activity_id(self, kind: str, key: str, index: int) -> str:
+        # Laid out like LinkedIn's: creation time (epoch ms, the post's age before the server started) in the
+        # high bits, so ids order by age and post_text.activity_time decodes the time the label shows
+        digest = hashlib.sha1(f'{self.seed}|{kind}|{key}|{index}'.encode('utf-8')).hexdigest()
+        created_ms = self._epoch_ms - (index + 1) * self.minutes_per_post * 60000
+        return str((created_ms << 22) | (int(digest[:8], 16) & 0x3FFFFF))
+
+    def render_posts(self, kind: str, key: str, page: int, sort: str = 'latest') -> str:
+        """HTML for one page of posts. Ages grow down the list ('top' shuffles them within the page)."""
+        if page >= self.pages:
+            return ''
+        offset = int(hashlib.sha1(f'{kind}|{key}'.encode('utf-8')).hexdigest()[:8], 16)
+        positions = list(range(page * self.page_size, (page + 1) * self.page_size))
+        if sort != 'latest':
+            random.Random(f'{self.seed}|{key}|{page}').shuffle(positions)
+        parts = []
+        for pos in positions:
+            text = self.corpus[(offset + pos) % len(self.corpus)]
+            activity = self._activity_id(kind, key, pos)
+            name = f'{_FIRST_NAMES[pos % len(_FIRST_NAMES)]} {_LAST_NAMES[(pos // len(_FIRST_NAMES)) % len(_LAST_NAMES)]}'
+            head, rest = text[:TRUNCATE_AT], text[TRUNCATE_AT:]
+            more = (
+                f'<span class="fake-more" hidden>{html_lib.escape(rest)}</span>'
+                '<button class="see-more feed-shared-inline-show-more-text__see-more-less-toggle" type="button">…see more</button>'
+            ) if rest else ''
+            contact = re.search(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+', text)
+            mailto = f'<a href="mailto:{html_lib.escape(contact.group(0))}">Email</a>' if contact else ''
+            post = (
+                f'<div class="feed-shared-update-v2" data-urn="urn:li:activity:{activity}">'
+                '<div class="update-components-actor">'
+                f'<div class="update-components-actor__name">{name}</div>'
+                f'<div class="update-components-actor__sub-description">{_age_label((pos + 1) * self.minutes_per_post)} • </div>'
+                '</div>'
+                f'<div class="feed-shared-update-v2__description"><span class="fake-text">{html_lib.escape(head)}</span>{more}</div>'
+                f'<p>{mailto}</p>'
+                f'<a class="update-components-actor__meta-link" href="/feed/update/urn:li:activity:{activity}/">View post</a>'
+                '<div class="social-details-social-counts">'
+                '<button type="button">Like</button> <button type="button">Comment</button> <button type="button">Repost</button>'
+                '</div></div>'
+            )
+            if kind == 'search':
+                post = f'<li class="reusable-search__result-container">{post}</li>'
+            parts.append(post)
+        self._count('posts_served', len(parts))
+        return '\n'.join(parts)
+
+    def render_page(self, kind: str, key: str, title: str, canonical: str, sort: str = 'latest') -> str:
+        filters = ''
+        if kind == 'search':
+            latest = sort == 'latest'
+            filters = _SEARCH_FILTERS.format(
+                sort_label='Latest' if latest else 'Top match',
+                top_checked=str(not latest).lower(),
+                latest_checked=str(latest).lower(),
+            )
+        config = json.dumps({'kind': kind, 'key': key, 'sort': sort, 'pages': self.pages, 'window': self.render_window})
+        return _PAGE_HTML.format(
+            title=html_lib.escape(title),
+            canonical=html_lib.escape(canonical),
+            filters=filters,
+            list_tag='ul' if kind == 'search' else 'div',
+            posts=self.render_posts(kind, key, 0, sort),
+            config=config,
+        )
+
+    def render_checkpoint(self) -> str:
+        refresh = ''
+        if self.checkpoint_clear_after is not None:
+            refresh = f'<meta http-equiv="refresh" content="{float(self.checkpoint_clear_after):g};url=/checkpoint/clear">'
+        return _CHECKPOINT_HTML.format(refresh=refresh)
+
+    # --- server ---
+    def start(self) -> str:
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-linkedin', daemon=True)
+        self._thread.start()
+        self._started = time.time()
+        return self.base_url
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'FakeLinkedIn/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def fake(self) -> FakeLinkedIn:
+        return self.server.fake
+
+    def _logged_in(self) -> bool:
+        return not self.fake.require_login or 'li_at=' in (self.headers.get('Cookie') or '')
+
+    def _send(self, status: int, body: str = '', content_type: str = 'text/html; charset=utf-8', headers: Optional[Dict[str, str]] = None):
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+        self.fake._count('requests')
+        self.fake._count('bytes_sent', len(data))
+
+    def _redirect(self, location: str, cookie: Optional[str] = None):
+        headers = {'Location': location}
+        if cookie:
+            headers['Set-Cookie'] = cookie
+        self._send(303, headers=headers)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        if urlparse(self.path).path.rstrip('/') in ('/checkpoint/lg/login-submit', '/login'):
+            self.fake._count('logins')
+            target = '/checkpoint/challenge/' if self.fake.checkpoint else '/feed/'
+            self._redirect(target, cookie='li_at=fake-session; Path=/; HttpOnly')
+            return
+        self._send(404, 'not found', 'text/plain')
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path, query = url.path, parse_qs(url.query)
+        fake = self.fake
+        if path == '/favicon.ico':
+            self._send(204)
+            return
+        if path == '/_fake/stats':
+            self._send(200, json.dumps(fake.stats()), 'application/json')
+            return
+        if path in ('/', '/login', '/login/'):
+            if path == '/' and self._logged_in():
+                self._redirect('/feed/')
+                return
+            fake._count('page_views', sub='login')
+            self._send(200, _LOGIN_HTML)
+            return
+        if path.startswith('/checkpoint/challenge'):
+            fake._count('checkpoints')
+            fake._count('page_views', sub='checkpoint')
+            self._send(200, fake.render_checkpoint())
+            return
+        if path.startswith('/checkpoint/clear'):
+            self._redirect('/feed/')
+            return
+        if not self._logged_in():
+            self._redirect('/login')
+            return
+        sort = 'latest' if 'date_posted' in (query.get('sortBy') or [''])[0] else 'top'
+        if path == '/_fake/posts':
+            fake._count('scroll_fetches')
+            kind = (query.get('kind') or ['feed'])[0]
+            key = (query.get('key') or [''])[0]
+            page = int((query.get('page') or ['0'])[0] or 0)
+            self._send(200, fake.render_posts(kind, key, page, (query.get('sort') or ['latest'])[0]))
+            return
+        if path.rstrip('/') == '/feed':
+            fake._count('page_views', sub='feed')
+            self._send(200, fake.render_page('feed', 'feed', 'Feed', fake.base_url + '/feed/'))
+            return
+        group = re.match(r'^/groups/([^/]+)', path)
+        if group:
+            fake._count('page_views', sub='group')
+            gid = group.group(1)
+            self._send(200, fake.render_page('group', gid, f'Fake Group {gid}', f'{fake.base_url}/groups/{gid}/'))
+            return
+        if path.rstrip('/') == '/search/results/content':
+            fake._count('page_views', sub='search')
+            keywords = (query.get('keywords') or [''])[0]
+            canonical = f"{fake.base_url}/search/results/content/?{urlencode({'keywords': keywords})}"
+            self._send(200, fake.render_page('search', keywords, f'{keywords} - Search', canonical, sort))
+            return
+        if path.startswith('/feed/update/'):
+            fake._count('page_views', sub='update')
+            self._send(200, f'<html><head><title>Post | LinkedIn</title></head><body><p>{html_lib.escape(path)}</p></body></html>')
+            return
+        self._send(404, 'not found', 'text/plain')
+
+    do_HEAD = do_GET
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--fixtures', help='saved pages (glob) to take post texts from')
+    ap.add_argument('--db', help='take post texts from sent_jobs in this SQLite DB')
+    ap.add_argument('--seed', type=int, default=0, help='synthetic corpus / activity id seed (ids also encode the server start time, so a restart yields newer ones)')
+    ap.add_argument('--page-size', type=int, default=10, help='posts per page and per infinite-scroll fetch')
+    ap.add_argument('--pages', type=int, default=5, help='pages per feed/group/search before the list ends')
+    ap.add_argument('--latency-ms', type=int, default=0, help='delay added to every response')
+    ap.add_argument('--render-window', type=int, default=0, help='posts kept in the DOM while scrolling (0 = all), to mimic virtualized lists')
+    ap.add_argument('--minutes-per-post', type=int, default=7, help='age step between consecutive posts')
+    ap.add_argument('--checkpoint', action='store_true', help='send logins to a security-verification page')
+    ap.add_argument('--checkpoint-clear-after', type=float, help='seconds until the checkpoint page clears itself')
+    ap.add_argument('--no-login', action='store_true', help='serve pages without the login cookie')
+    args = ap.parse_args(argv)
+    fake = FakeLinkedIn(
+        corpus=load_corpus(args.fixtures, args.db, seed=args.seed), host=args.host, port=args.port,
+        page_size=args.page_size, pages=args.pages, latency_ms=args.latency_ms,
+        minutes_per_post=args.minutes_per_post, checkpoint=args.checkpoint,
+        checkpoint_clear_after=args.checkpoint_clear_after, require_login=not args.no_login, seed=args.seed,
+        render_window=args.render_window,
+    )
+    base = fake.start()
+    print(f'Fake LinkedIn serving {len(fake.corpus)} posts at {base} (LINKEDIN_BASE_URL={base}); Ctrl-C to stop', flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(fake.stats(), indent=2))
+        fake.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
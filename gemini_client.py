@@ -0,0 +1,215 @@
+import bisect
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket catches everything above)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000, 10000, 20000, 60000)
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram, one series per label (e.g. generateContent)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, label: str, ms: float, ok: bool = True):
+        with self._lock:
+            s = self._series.get(label)
+            if s is None:
+                s = {'count': 0, 'errors': 0, 'sum_ms': 0.0, 'min_ms': None, 'max_ms': 0.0, 'counts': [0] * (len(self.buckets) + 1)}
+                self._series[label] = s
+            s['count'] += 1
+            if not ok:
+                s['errors'] += 1
+            s['sum_ms'] += ms
+            s['min_ms'] = ms if s['min_ms'] is None else min(s['min_ms'], ms)
+            s['max_ms'] = max(s['max_ms'], ms)
+            s['counts'][bisect.bisect_left(self.buckets, ms)] += 1
+
+    def _quantile(self, counts, total, q) -> Optional[float]:
+        # Upper bound of the bucket holding the q-th observation
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= target:
+                return float(self.buckets[i]) if i < len(self.buckets) else float('inf')
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        out = {}
+        with self._lock:
+            for label, s in self._series.items():
+                total = s['count']
+                labels = [f'<={b}ms' for b in self.buckets] + [f'>{self.buckets[-1]}ms']
+                out[label] = {
+                    'count': total,
+                    'errors': s['errors'],
+                    'avg_ms': round(s['sum_ms'] / total, 1) if total else None,
+                    'min_ms': round(s['min_ms'], 1) if s['min_ms'] is not None else None,
+                    'max_ms': round(s['max_ms'], 1),
+                    'p50_ms': self._quantile(s['counts'], total, 0.5),
+                    'p95_ms': self._quantile(s['counts'], total, 0.95),
+                    'buckets': {labels[i]: c for i, c in enumerate(s['counts']) if c},
+                }
+        return out
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+    pass
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+class CircuitBreaker:
+    """Closed -> open -> half-open breaker with exponential open periods.
+
+    After `failure_threshold` consecutive failures the breaker opens for `open_seconds`,
+    doubling on every consecutive trip up to `max_open_seconds`. A Retry-After hint
+    extends the open period. Once it elapses, a single probe call is let through
+    (half-open): success closes the breaker, failure re-opens it for longer.
+    """
+
+    def __init__(self, failure_threshold: int = 3, open_seconds: float = 30.0, max_open_seconds: float = 600.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.open_seconds = max(0.0, float(open_seconds))
+        self.max_open_seconds = max(self.open_seconds, float(max_open_seconds))
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._trips = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self.stats: Dict[str, Any] = {'state': 'closed', 'consecutive_failures': 0, 'trips': 0, 'rejected': 0, 'open_until': None}
+
+    def _set_state(self, state: str):
+        self.stats['state'] = state
+        self.stats['consecutive_failures'] = self._failures
+        self.stats['trips'] = self._trips
+        if state != 'open':
+            self.stats['open_until'] = None
+
+    def allow(self) -> bool:
+        """True if a call may proceed now. In half-open state only one probe is admitted at a time."""
+        with self._lock:
+            state = self.stats['state']
+            if state == 'closed':
+                return True
+            if state == 'open' and time.monotonic() >= self._opened_until:
+                self._set_state('half_open')
+                state = 'half_open'
+            if state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.stats['state'] == 'open' and time.monotonic() < self._opened_until
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trips = 0
+            self._probe_in_flight = False
+            self._set_state('closed')
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self._failures += 1
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+            if was_probe or self._failures >= self.failure_threshold or retry_after:
+                backoff = min(self.max_open_seconds, self.open_seconds * (2 ** self._trips))
+                if retry_after:
+                    backoff = min(self.max_open_seconds, max(backoff, retry_after))
+                self._trips += 1
+                self._opened_until = time.monotonic() + backoff
+                self._set_state('open')
+                self.stats['open_until'] = (datetime.now(timezone.utc) + timedelta(seconds=backoff)).isoformat()
+            else:
+                self.stats['consecutive_failures'] = self._failures
+
+    def release(self):
+        """Give back a half-open probe slot when the call ended without a verdict on API health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class GeminiClient:
+    """Shared HTTP client for generativelanguage.googleapis.com.
+
+    One requests.Session with a sized connection pool keeps TLS connections alive across
+    posts instead of handshaking on every call. The urllib3 pool is thread-safe, so all
+    classification threads share it. Connection failures and transient 500/502/504 responses
+    are retried with exponential backoff by the adapter; 429 and 503 are not (see CircuitBreaker). Every call is timed into a latency histogram.
+    """
+
+    def __init__(self, pool_size: int = 8, retries: int = 2, backoff_factor: float = 0.5):
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            # A read timeout means Gemini already spent the full timeout; don't pay it again
+            read=0,
+            status=retries,
+            backoff_factor=backoff_factor,
+            # 429/503 (overload, usually with Retry-After) go straight back to the caller so CircuitBreaker
+            # does the backing off, instead of a classify thread sleeping inside the adapter on every retry
+            status_forcelist=(500, 502, 504),
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, int(pool_size)), max_retries=retry, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json', 'Connection': 'keep-alive'})
+        self.latency = LatencyHistogram()
+
+    def request(self, method: str, url: str, label: str = 'request', **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        ok = False
+        try:
+            resp = self.session.request(method, url, **kwargs)
+            ok = resp.status_code < 400
+            return resp
+        finally:
+            self.latency.observe(label, (time.perf_counter() - started) * 1000.0, ok=ok)
+
+    def post(self, url: str, label: str = 'generateContent', **kwargs) -> requests.Response:
+        return self.request('POST', url, label=label, **kwargs)
+
+    def get(self, url: str, label: str = 'listModels', **kwargs) -> requests.Response:
+        return self.request('GET', url, label=label, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.latency.snapshot()
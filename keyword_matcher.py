@@ -0,0 +1,112 @@
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+# pyahocorasick is optional: it compiles the terms into a C automaton; without it TermMatcher uses substring checks
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+# Heuristic terms to reduce training/promo posts if AI misses
+PROMO_TERMS = (
+    # Training/education/promotions
+    'training', 'course', 'courses', 'bootcamp', 'boot camp', 'enroll', 'enrollment', 'register', 'registration',
+    'demo', 'free demo', 'webinar', 'workshop', 'tutorial', 'class', 'classes', 'coaching', 'mentorship',
+    'certificate', 'certification', 'mock interview', 'interview prep', 'interview preparation',
+    'linkedin optimization', 'resume service', 'resume writing', 'cv writing', 'portfolio review', 'career guidance',
+    'placement assistance', 'job support', 'proxy support', 'support available', 'training batch', 'new batch',
+    'promo', 'promotion', 'offer', 'discount', 'sale', 'paid course', 'learn', 'learning', 'upskill', 'reskill',
+    'join our training', 'guaranteed placement', 'internship training', 'fee', 'fees', 'tuition'
+)
+HIRING_TERMS = (
+    # Strong hiring/recruiting intent signals
+    'hiring', 'actively hiring', 'hiring now', 'we are hiring', 'we’re hiring', 'immediate hiring',
+    'opening', 'openings', 'job opening', 'job openings', 'position', 'positions', 'role', 'roles',
+    'vacancy', 'vacancies', 'vacant', 'opportunity', 'opportunities', 'apply', 'apply now', 'send resume',
+    'send cv', 'share resume', 'share your resume', 'resume to', 'cv to', 'email your resume', 'refer candidates',
+    'looking for', 'we are looking for', 'seeking', 'need', 'required', 'requirement', 'requirements',
+    'recruiting', 'recruitment', 'recruiter', 'talent acquisition',
+    # Employment types and conditions
+    'contract', 'c2c', 'w2', '1099', 'full-time', 'full time', 'fulltime', 'part-time', 'part time', 'parttime',
+    'contract to hire', 'contract-to-hire', 'temp to perm', 'temp-to-perm', 'immediate joiners', 'start asap',
+    'onsite', 'on-site', 'remote', 'remote only', 'hybrid', 'work from home'
+)
+# Disallowed (treated as non-USA) locations: matched term -> name reported in the skip reason
+DISALLOWED_LOCATIONS = {
+    # Exclude Puerto Rico explicitly per requirement (treat as non-USA)
+    'puerto rico': 'puerto rico',
+    '#hpepuertorico': 'puerto rico',
+    ' hpepuertorico': 'puerto rico',
+}
+
+
+class TermMatcher:
+    """Multi-pattern substring matcher: reports every term found in a text, grouped by label.
+
+    Terms are grouped by label (e.g. 'promo', 'hiring'). Matching is case-insensitive plain
+    substring matching, the same semantics as `term in text.lower()`. With pyahocorasick
+    installed the terms are compiled into one Aho-Corasick automaton and each text is scanned
+    once in C. Without it, each distinct term is checked with `in` against a single lowercased
+    copy of the text; a pure-Python automaton was measured slower than that on post-sized texts.
+    """
+
+    def __init__(self, terms: Optional[Mapping[str, Iterable[str]]] = None):
+        # term -> labels it belongs to (a user keyword can also be a hiring term)
+        self._labels: Dict[str, Tuple[str, ...]] = {}
+        for label, items in (terms or {}).items():
+            for term in items:
+                term = (term or '').lower()
+                if term and label not in self._labels.get(term, ()):
+                    self._labels[term] = self._labels.get(term, ()) + (label,)
+        self._automaton = None
+        if ahocorasick is not None and self._labels:
+            automaton = ahocorasick.Automaton()
+            for term, labels in self._labels.items():
+                automaton.add_word(term, (term, labels))
+            automaton.make_automaton()
+            self._automaton = automaton
+        self.backend = 'pyahocorasick' if self._automaton is not None else 'substring'
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Return {label: set of matched terms} for every label with at least one match."""
+        low = (text or '').lower()
+        found: Dict[str, Set[str]] = {}
+        if self._automaton is not None:
+            matches = (v for _, v in self._automaton.iter(low))
+        else:
+            matches = ((t, labels) for t, labels in self._labels.items() if t in low)
+        for term, labels in matches:
+            for label in labels:
+                found.setdefault(label, set()).add(term)
+        return found
+
+
+def build_post_matcher(keywords: Optional[Iterable[str]] = None) -> TermMatcher:
+    """Automaton for the post filters: promo, hiring and disallowed-location terms, plus optional user keywords ('keyword')."""
+    terms = {'promo': PROMO_TERMS, 'hiring': HIRING_TERMS, 'location': tuple(DISALLOWED_LOCATIONS)}
+    kws = tuple(k.strip() for k in (keywords or ()) if k and k.strip())
+    if kws:
+        terms['keyword'] = kws
+    return TermMatcher(terms)
+
+
+POST_MATCHER = build_post_matcher()
+
+
+def match_post_terms(text: str, matcher: Optional[TermMatcher] = None) -> Dict[str, Set[str]]:
+    """Scan a post once and return every matched term class ({'promo': {...}, 'hiring': {...}, ...})."""
+    return (matcher or POST_MATCHER).scan(text)
+
+
+def is_promo_training(text: str, matches: Optional[Dict[str, Set[str]]] = None) -> bool:
+    return bool((match_post_terms(text) if matches is None else matches).get('promo'))
+
+
+def seems_hiring(text: str, matches: Optional[Dict[str, Set[str]]] = None) -> bool:
+    return bool((match_post_terms(text) if matches is None else matches).get('hiring'))
+
+
+def is_disallowed_location(text: str, matches: Optional[Dict[str, Set[str]]] = None) -> str | None:
+    found = (match_post_terms(text) if matches is None else matches).get('location')
+    if not found:
+        return None
+    return DISALLOWED_LOCATIONS[sorted(found)[0]]
@@ -0,0 +1,156 @@
+import re
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+# NumPy is optional: without it the local pre-classifier is simply disabled and every post goes to Gemini
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams plus adjacent-word bigrams."""
+    words = _TOKEN_RE.findall((text or '').lower())
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+class HashedBowClassifier:
+    """Logistic regression over a hashed bag-of-words, trained and scored with NumPy.
+
+    Tokens are hashed (crc32) into n_features buckets and each document is kept as an
+    array of bucket indices, so training and scoring stay sparse: a score is the sum of
+    the weights at those indices. extra_features(text) may add synthetic tokens (e.g.
+    '__hiring__' when the keyword heuristics fire) so the model can lean on them.
+    """
+
+    def __init__(self, n_features: int = 1 << 15, l2: float = 1e-4, extra_features: Optional[Callable[[str], Iterable[str]]] = None):
+        if np is None:
+            raise RuntimeError('numpy is required for the local classifier')
+        self.n_features = int(n_features)
+        self.l2 = float(l2)
+        self.extra_features = extra_features
+        self.weights = np.zeros(self.n_features, dtype=np.float64)
+        self.bias = 0.0
+
+    def _indices(self, text: str):
+        tokens = tokenize(text)
+        if self.extra_features is not None:
+            try:
+                tokens.extend(self.extra_features(text))
+            except Exception:
+                pass
+        n = self.n_features
+        # Binary presence: repeated tokens count once
+        return np.unique(np.fromiter((zlib.crc32(t.encode('utf-8')) % n for t in tokens), dtype=np.int64, count=len(tokens)))
+
+    def _featurize(self, texts: Sequence[str]):
+        docs = [self._indices(t) for t in texts]
+        lengths = np.array([len(d) for d in docs], dtype=np.int64)
+        flat = np.concatenate(docs) if docs else np.zeros(0, dtype=np.int64)
+        # reduceat needs in-range offsets even for empty docs; their sums are masked to 0 below
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(docs) else np.zeros(0, dtype=np.int64)
+        return flat, offsets, lengths
+
+    def _scores(self, flat, offsets, lengths):
+        if not len(lengths):
+            return np.zeros(0)
+        if not len(flat):
+            return np.full(len(lengths), self.bias)
+        w = self.weights[flat]
+        sums = np.add.reduceat(w, np.minimum(offsets, len(flat) - 1))
+        sums[lengths == 0] = 0.0
+        return sums + self.bias
+
+    def fit(self, texts: Sequence[str], labels: Sequence[int], epochs: int = 50, lr: float = 1.0) -> 'HashedBowClassifier':
+        """Full-batch gradient descent on the log loss with L2 regularization."""
+        flat, offsets, lengths = self._featurize(texts)
+        y = np.asarray(labels, dtype=np.float64)
+        n = max(1, len(y))
+        doc_of = np.repeat(np.arange(len(lengths)), lengths)
+        for _ in range(int(epochs)):
+            p = 1.0 / (1.0 + np.exp(-self._scores(flat, offsets, lengths)))
+            err = p - y
+            grad = np.zeros(self.n_features)
+            np.add.at(grad, flat, err[doc_of])
+            self.weights -= lr * (grad / n + self.l2 * self.weights)
+            if len(err):
+                self.bias -= lr * float(err.mean())
+        return self
+
+    def predict_proba(self, texts: Sequence[str]):
+        """Probability that each text is a keep (hiring + USA) post."""
+        return 1.0 / (1.0 + np.exp(-self._scores(*self._featurize(texts))))
+
+
+class LocalPreClassifier:
+    """Confidence cascade in front of Gemini.
+
+    Posts scoring >= pos_threshold are kept and <= neg_threshold are dropped locally;
+    anything in between returns None and should be sent to Gemini. fit() holds out a
+    slice of the data and disables the cascade if its confident decisions are right less
+    than min_accuracy of the time there, so a weak model never silently replaces the AI.
+    """
+
+    def __init__(self, pos_threshold: float = 0.9, neg_threshold: float = 0.1, min_samples: int = 200, min_accuracy: float = 0.95, extra_features: Optional[Callable[[str], Iterable[str]]] = None):
+        self.pos_threshold = float(pos_threshold)
+        self.neg_threshold = float(neg_threshold)
+        self.min_samples = int(min_samples)
+        self.min_accuracy = float(min_accuracy)
+        self.extra_features = extra_features
+        self.model: Optional[HashedBowClassifier] = None
+        self.stats: Dict[str, Any] = {
+            'enabled': False, 'reason': 'not trained', 'samples': 0, 'positives': 0,
+            'pos_threshold': self.pos_threshold, 'neg_threshold': self.neg_threshold,
+            'holdout_confident_share': None, 'holdout_accuracy': None,
+        }
+
+    def fit(self, texts: Sequence[str], labels: Sequence[int]) -> bool:
+        """Train on (text, keep) pairs. Returns True if the cascade is enabled afterwards."""
+        self.model = None
+        self.stats['enabled'] = False
+        if np is None:
+            self.stats['reason'] = 'numpy not installed'
+            return False
+        y = np.asarray(labels, dtype=np.int64)
+        pos = int(y.sum()) if len(y) else 0
+        self.stats.update({'samples': len(y), 'positives': pos})
+        # Need enough examples of both outcomes to learn anything useful
+        if len(y) < self.min_samples or pos < 10 or len(y) - pos < 10:
+            self.stats['reason'] = f'not enough training data ({len(y)} samples, {pos} positive)'
+            return False
+        # Deterministic 80/20 split for the holdout check
+        order = np.random.default_rng(0).permutation(len(y))
+        cut = int(len(y) * 0.8)
+        train_idx, hold_idx = order[:cut], order[cut:]
+        probe = HashedBowClassifier(extra_features=self.extra_features).fit([texts[i] for i in train_idx], y[train_idx])
+        p = probe.predict_proba([texts[i] for i in hold_idx])
+        confident = (p >= self.pos_threshold) | (p <= self.neg_threshold)
+        share = float(confident.mean()) if len(p) else 0.0
+        accuracy = float(((p[confident] >= 0.5) == (y[hold_idx][confident] == 1)).mean()) if confident.any() else None
+        self.stats.update({'holdout_confident_share': round(share, 3), 'holdout_accuracy': round(accuracy, 3) if accuracy is not None else None})
+        if accuracy is None or accuracy < self.min_accuracy:
+            self.stats['reason'] = f'holdout accuracy below {self.min_accuracy}'
+            return False
+        self.model = HashedBowClassifier(extra_features=self.extra_features).fit(texts, y)
+        self.stats.update({'enabled': True, 'reason': ''})
+        return True
+
+    def decide(self, texts: Sequence[str]) -> List[Optional[tuple]]:
+        """(keep, reason) for confidently scored texts, None for those that need Gemini."""
+        if self.model is None or not texts:
+            return [None] * len(texts)
+        out: List[Optional[tuple]] = []
+        for p in self.model.predict_proba(texts):
+            p = float(p)
+            if p >= self.pos_threshold:
+                out.append((True, f'local-model: hiring p={p:.2f}'))
+            elif p <= self.neg_threshold:
+                out.append((False, f'local-model: not hiring/usa p={p:.2f}'))
+            else:
+                out.append(None)
+        return out
@@ -0,0 +1,330 @@
+"""Offline extraction of LinkedIn posts from saved HTML (driver.page_source or data/html/*.html.gz).
+
+Produces the same job dicts as the live scraper (via post_text.build_job) without a browser.
+lxml (C-backed) is used when installed; otherwise a small html.parser tree builder stands in.
+
+Usage: python page_parser.py [--mode feed|search|group] [--all] data/html/*.html.gz
+"""
+import glob
+import gzip
+import json
+import re
+import sys
+import time
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+from post_text import build_job
+
+# lxml is optional: it parses ~10x faster; without it the stdlib parser is used
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+except Exception:
+    lxml_html = None
+    etree = None
+
+PARSER_BACKEND = 'lxml' if lxml_html is not None else 'html.parser'
+
+# Post container selectors per page type, tried in order (same as the live scraper)
+POST_SELECTORS = {
+    'feed': ['article, .feed-shared-update-v2'],
+    'search': ['.reusable-search__result-container', 'article, .feed-shared-update-v2'],
+    'group': ['.feed-shared-update-v2'],
+}
+
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'head'}
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'tr', 'ul',
+}
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+_TIME_CLASSES = ('update-components-actor__sub-description', 'feed-shared-actor__sub-description')
+
+
+class _Node:
+    """Minimal element with the subset of the lxml API used below (tag, get, text, tail, iteration)."""
+
+    __slots__ = ('tag', 'attrib', 'text', 'tail', 'children', 'parent')
+
+    def __init__(self, tag: str, attrib: Dict[str, str], parent: Optional['_Node']):
+        self.tag = tag
+        self.attrib = attrib
+        self.text = ''
+        self.tail = ''
+        self.children: List['_Node'] = []
+        self.parent = parent
+
+    def get(self, key: str, default=None):
+        return self.attrib.get(key, default)
+
+    def getparent(self):
+        return self.parent
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def iter(self):
+        stack = [self]
+        while stack:
+            el = stack.pop()
+            yield el
+            stack.extend(reversed(el.children))
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('html', {}, None)
+        self._stack = [self.root]
+
+    def _append_text(self, data: str):
+        cur = self._stack[-1]
+        if cur.children:
+            cur.children[-1].tail += data
+        else:
+            cur.text += data
+
+    def handle_starttag(self, tag, attrs):
+        parent = self._stack[-1]
+        node = _Node(tag, {k: (v or '') for k, v in attrs}, parent)
+        parent.children.append(node)
+        if tag not in _VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        parent = self._stack[-1]
+        parent.children.append(_Node(tag, {k: (v or '') for k, v in attrs}, parent))
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed children: pop back to the matching open tag, ignore stray end tags
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._append_text(data)
+
+
+def _parse(html: str):
+    if lxml_html is not None:
+        return lxml_html.document_fromstring(html or '<html></html>')
+    builder = _TreeBuilder()
+    builder.feed(html or '')
+    builder.close()
+    return builder.root
+
+
+def _tag(el) -> str:
+    # lxml yields comments/processing instructions with a non-string tag
+    return el.tag.lower() if isinstance(el.tag, str) else ''
+
+
+def _has_class(el, cls: str) -> bool:
+    return cls in (el.get('class') or '').split()
+
+
+def _matches(el, selector: str) -> bool:
+    # Only the simple forms the scraper uses: 'tag', '.class', 'tag.class', comma-separated groups
+    for part in selector.split(','):
+        part = part.strip()
+        tag, _, cls = part.partition('.')
+        if (not tag or _tag(el) == tag.lower()) and (not cls or _has_class(el, cls)):
+            return True
+    return False
+
+
+# Compiled lxml XPath per selector (the selector forms _matches understands)
+_XPATHS: Dict[str, Any] = {}
+
+
+def _xpath(selector: str):
+    compiled = _XPATHS.get(selector)
+    if compiled is None:
+        alternatives = []
+        for part in selector.split(','):
+            tag, _, cls = part.strip().partition('.')
+            step = f'descendant-or-self::{tag.lower() or "*"}'
+            if cls:
+                # The plain substring test is cheap and rejects most elements before the token match
+                step += f"[contains(@class, '{cls}')][contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+            alternatives.append(step)
+        # A union comes back in document order, like the browser's querySelectorAll
+        compiled = _XPATHS[selector] = etree.XPath(' | '.join(alternatives))
+    return compiled
+
+
+def _select(root, selectors: Sequence[str]) -> list:
+    if etree is not None and not isinstance(root, _Node):
+        for sel in selectors:
+            found = _xpath(sel)(root)
+            if found:
+                return found
+        return []
+    elements = [el for el in root.iter() if _tag(el)]
+    for sel in selectors:
+        found = [el for el in elements if _matches(el, sel)]
+        if found:
+            return found
+    return []
+
+
+def _inner_text(el) -> str:
+    """Approximate the browser's innerText: skip non-rendered tags, line breaks around block elements."""
+    parts: List[str] = []
+
+    def walk(node):
+        tag = _tag(node)
+        if tag in _SKIP_TAGS:
+            return
+        block = tag in _BLOCK_TAGS
+        if block:
+            parts.append('\n')
+        if node.text and tag:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append('\n')
+
+    walk(el)
+    lines = (re.sub(r'\s+', ' ', line).strip() for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _in_comment(el) -> bool:
+    parent = el.getparent()
+    while parent is not None:
+        if 'comment' in (parent.get('class') or '').lower():
+            return True
+        parent = parent.getparent()
+    return False
+
+
+def _post_item(el, base_url: str) -> Dict[str, Any]:
+    hrefs, contact = [], []
+    urn = el.get('data-urn') or ''
+    time_label = ''
+    for d in el.iter():
+        tag = _tag(d)
+        if not tag:
+            continue
+        href = d.get('href') if tag == 'a' else None
+        if href:
+            hrefs.append(urljoin(base_url, href) if base_url else href)
+            if href.lower().startswith(('mailto:', 'tel:')) and not _in_comment(d):
+                contact.append(href)
+        if not urn and d.get('data-urn'):
+            urn = d.get('data-urn')
+        if not time_label and d is not el and (tag == 'time' or any(_has_class(d, c) for c in _TIME_CLASSES)):
+            time_label = _inner_text(d)
+    return {'text': _inner_text(el), 'hrefs': hrefs, 'contact_hrefs': contact, 'urn': urn, 'time_label': time_label}
+
+
+def extract_post_items(html: str, selectors: Sequence[str], base_url: str = '') -> List[Dict[str, Any]]:
+    """Posts found in html as {text, hrefs, contact_hrefs, urn, time_label} (the dom_extract.extract_posts shape)."""
+    return [_post_item(el, base_url) for el in _select(_parse(html), selectors)]
+
+
+def _page_url(root) -> str:
+    for el in root.iter():
+        tag = _tag(el)
+        if tag == 'link' and (el.get('rel') or '').lower() == 'canonical' and el.get('href'):
+            return el.get('href')
+        if tag == 'meta' and (el.get('property') or '').lower() == 'og:url' and el.get('content'):
+            return el.get('content')
+    return ''
+
+
+def _page_title(root) -> str:
+    for el in root.iter():
+        if _tag(el) == 'title':
+            return re.sub(r'\s+', ' ', _inner_text(el) or (el.text or '')).strip()
+    return ''
+
+
+def detect_mode(url: str) -> str:
+    low = (url or '').lower()
+    if '/groups/' in low:
+        return 'group'
+    if '/search/' in low:
+        return 'search'
+    return 'feed'
+
+
+def _page_post_items(root, url: str, mode: Optional[str]) -> Tuple[str, str, List[Dict[str, Any]]]:
+    url = url or _page_url(root)
+    mode = mode or detect_mode(url)
+    return url, mode, [_post_item(el, url) for el in _select(root, POST_SELECTORS.get(mode, POST_SELECTORS['feed']))]
+
+
+def page_post_items(html: str, url: str = '', mode: Optional[str] = None) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """(url, mode, post items) for a page: the raw posts parse_html builds its jobs from.
+
+    url and mode default as in parse_html; items have the dom_extract.extract_posts shape.
+    """
+    return _page_post_items(_parse(html), url, mode)
+
+
+def parse_html(html: str, url: str = '', mode: Optional[str] = None, group_name: Optional[str] = None, salt: str = '', require_recent: bool = True) -> List[Dict[str, Any]]:
+    """Job dicts for every post in a page, built with the same rules as the live scraper.
+
+    url defaults to the page's canonical/og:url and decides the mode (feed/search/group) when not
+    given; group_name defaults to the page title. require_recent=False keeps posts whose time label
+    is not recent (useful for old captures).
+    """
+    root = _parse(html)
+    url, mode, items = _page_post_items(root, url, mode)
+    if group_name is None:
+        title = re.sub(r'\s*\|\s*LinkedIn\s*$', '', _page_title(root))
+        group_name = {'feed': 'Home Feed'}.get(mode, title or mode)
+    jobs = []
+    for item in items:
+        job = build_job(item, mode, group_name, url, salt=salt, require_recent=require_recent)
+        if job is not None:
+            jobs.append(job)
+    return jobs
+
+
+def read_snapshot(path: str) -> str:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def parse_snapshot(path: str, **kwargs) -> List[Dict[str, Any]]:
+    """parse_html over a saved page (.html or .html.gz)."""
+    return parse_html(read_snapshot(path), **kwargs)
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('paths', nargs='*', default=['data/html/*.html.gz'])
+    ap.add_argument('--mode', choices=sorted(POST_SELECTORS))
+    ap.add_argument('--all', action='store_true', help='keep posts without a recent time label')
+    args = ap.parse_args(argv)
+    files = [p for pattern in args.paths for p in sorted(glob.glob(pattern))]
+    started = time.perf_counter()
+    pages = []
+    for path in files:
+        jobs = parse_snapshot(path, mode=args.mode, require_recent=not args.all)
+        pages.append({'path': path, 'jobs': jobs})
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'backend': PARSER_BACKEND,
+        'pages': len(files),
+        'jobs': sum(len(p['jobs']) for p in pages),
+        'pages_per_sec': round(len(files) / elapsed, 1) if elapsed else None,
+        'results': pages,
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
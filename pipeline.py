@@ -0,0 +1,221 @@
+import queue
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marker pushed into a stage queue once per worker to ask it to exit
+_SENTINEL = object()
+
+
+class Stage:
+    """A pipeline stage: a bounded input queue drained by one or more worker threads.
+
+    handler(item) is called for every item. Handlers pass results downstream by
+    calling put() on the next stage themselves, which keeps routing decisions
+    (e.g. skip classification for home-feed posts) in the caller's code.
+
+    With batch_size > 1 the handler instead receives a list of up to batch_size
+    items: a worker takes the first available item and then waits at most
+    batch_wait seconds for more before handling what it has.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], None], workers: int = 1, maxsize: int = 100, stop_event: Optional[threading.Event] = None, batch_size: int = 1, batch_wait: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers or 1))
+        self.batch_size = max(1, int(batch_size or 1))
+        self.batch_wait = max(0.0, float(batch_wait or 0.0))
+        self.queue: queue.Queue = queue.Queue(maxsize=max(0, int(maxsize or 0)))
+        self.stop_event = stop_event
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        # Live counters; the dict is shared with scraper_status so /status sees updates
+        self.stats: Dict[str, Any] = {'workers': self.workers, 'queued': 0, 'processed': 0, 'errors': 0}
+
+    def _stopped(self) -> bool:
+        return bool(self.stop_event is not None and self.stop_event.is_set())
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f'stage-{self.name}-{i}', daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def put(self, item: Any) -> bool:
+        """Enqueue an item, blocking while the queue is full (backpressure).
+
+        Returns False if a stop was requested before the item could be queued.
+        """
+        while True:
+            if self._stopped():
+                return False
+            try:
+                self.queue.put(item, timeout=0.2)
+                self.stats['queued'] = self.queue.qsize()
+                return True
+            except queue.Full:
+                continue
+
+    def close(self):
+        """Ask workers to exit once everything already queued has been handled."""
+        for _ in self._threads:
+            while True:
+                try:
+                    self.queue.put(_SENTINEL, timeout=0.2)
+                    break
+                except queue.Full:
+                    # On stop the workers drain without handling, so space frees up quickly
+                    continue
+
+    def join(self, timeout: Optional[float] = None):
+        for t in self._threads:
+            t.join(timeout)
+
+    def _run(self):
+        if self.batch_size > 1:
+            return self._run_batched()
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _SENTINEL:
+                    return
+                self.stats['queued'] = self.queue.qsize()
+                if self._stopped():
+                    # Drain without doing work so producers blocked on put() are released
+                    continue
+                try:
+                    self.handler(item)
+                    with self._lock:
+                        self.stats['processed'] += 1
+                except Exception:
+                    with self._lock:
+                        self.stats['errors'] += 1
+                    if not self._stopped():
+                        logger.exception(f'Pipeline: stage {self.name} failed handling an item')
+            finally:
+                self.queue.task_done()
+
+    def _run_batched(self):
+        done = False
+        while not done:
+            batch = []
+            first = self.queue.get()
+            if first is _SENTINEL:
+                self.queue.task_done()
+                return
+            batch.append(first)
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _SENTINEL:
+                    # Handle what we already have, then exit
+                    self.queue.task_done()
+                    done = True
+                    break
+                batch.append(item)
+            self.stats['queued'] = self.queue.qsize()
+            try:
+                if self._stopped():
+                    continue
+                try:
+                    self.handler(batch)
+                    with self._lock:
+                        self.stats['processed'] += len(batch)
+                except Exception:
+                    with self._lock:
+                        self.stats['errors'] += 1
+                    if not self._stopped():
+                        logger.exception(f'Pipeline: stage {self.name} failed handling a batch of {len(batch)}')
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class Pipeline:
+    """Ordered set of stages that are started together and shut down upstream-first."""
+
+    def __init__(self, stop_event: Optional[threading.Event] = None):
+        self.stop_event = stop_event
+        self.stages: Dict[str, Stage] = {}
+        self._closed = False
+
+    def add_stage(self, name: str, handler: Callable[[Any], None], workers: int = 1, maxsize: int = 100, batch_size: int = 1, batch_wait: float = 0.0) -> Stage:
+        stage = Stage(name, handler, workers=workers, maxsize=maxsize, stop_event=self.stop_event, batch_size=batch_size, batch_wait=batch_wait)
+        self.stages[name] = stage
+        return stage
+
+    def start(self):
+        for stage in self.stages.values():
+            stage.start()
+        return self
+
+    def put(self, name: str, item: Any) -> bool:
+        return self.stages[name].put(item)
+
+    def close(self):
+        """Drain and stop every stage in order, so downstream stages see all upstream output.
+
+        Safe to call more than once. When the stop event is set, workers discard
+        queued items instead of handling them, so this returns quickly.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for stage in self.stages.values():
+            try:
+                stage.close()
+                stage.join()
+            except Exception:
+                logger.exception(f'Pipeline: failed shutting down stage {stage.name}')
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stage.stats for name, stage in self.stages.items()}
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiter: refills at `rate` tokens/second, banking up to `capacity`.
+
+    A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate or 0.0)
+        self.capacity = max(1.0, float(capacity or 1.0))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {'acquired': 0, 'waited': 0, 'wait_seconds': 0.0}
+
+    def acquire(self, tokens: float = 1.0, stop_event: Optional[threading.Event] = None, timeout: Optional[float] = None) -> bool:
+        """Block until `tokens` are available. Returns False on stop or timeout."""
+        if self.rate <= 0:
+            return True
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    waited = now - started
+                    self.stats['acquired'] += 1
+                    if waited > 0.001:
+                        self.stats['waited'] += 1
+                        self.stats['wait_seconds'] = round(self.stats['wait_seconds'] + waited, 3)
+                    return True
+                need = (tokens - self._tokens) / self.rate
+            if stop_event is not None and stop_event.is_set():
+                return False
+            if deadline is not None and time.monotonic() + need > deadline:
+                return False
+            # Sleep in short slices so a stop request is noticed promptly
+            time.sleep(min(need, 0.25))
@@ -0,0 +1,331 @@
+"""Pure post-text helpers shared by the live scraper, the offline HTML parser and the benchmarks.
+
+Nothing here touches Selenium, Flask or the database, so it can be imported on its own.
+"""
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+
+# --- ID STABILITY HELPERS ---
+def _normalize_text_for_id(text: str) -> str:
+    """Normalize post text to reduce duplicate emails from minor UI/time changes.
+
+    - Lowercase
+    - Remove 'recent time' words like '2h', '5 hr', '10m', 'just now'
+    - Remove common social counters like '123 likes', '45 comments', 'share'
+    - Collapse whitespace
+    """
+    if not text:
+        return ''
+    t = text.lower()
+    try:
+        # remove time words
+        t = re.sub(r"\b\d+\s*(?:h|hr|hrs|hour|hours|m|min|mins|minute|minutes)\b", " ", t)
+        t = re.sub(r"\bjust now\b", " ", t)
+        # remove interaction counters/labels
+        t = re.sub(r"\b\d+\s+likes?\b", " ", t)
+        t = re.sub(r"\b\d+\s+comments?\b", " ", t)
+        t = re.sub(r"\bshares?\b", " ", t)
+        t = re.sub(r"\bfollow(ing)?\b", " ", t)
+        t = re.sub(r"\bpremium\b", " ", t)
+        # collapse whitespace
+        t = re.sub(r"\s+", " ", t).strip()
+    except Exception:
+        t = text.strip().lower()
+    return t
+
+def _extract_linkedin_activity_id_from_anchors(anchors: list) -> str | None:
+    """Try to extract a stable LinkedIn activity/update ID from anchor hrefs.
+    anchors may be WebElements or plain href strings (e.g. from dom_extract.extract_posts).
+    Returns an id string like 'activity:1234567890' or None.
+    """
+    if not anchors:
+        return None
+    try:
+        for a in anchors:
+            try:
+                href = (a if isinstance(a, str) else a.get_attribute('href')) or ''
+            except Exception:
+                href = ''
+            if not href:
+                continue
+            h = href.lower()
+            if 'activity:' in h:
+                # urn:li:activity:12345
+                try:
+                    idx = h.index('activity:')
+                    part = h[idx:]
+                    # keep up to next non-digit boundary
+                    m = re.search(r"activity:(\d+)", part)
+                    if m:
+                        return f"activity:{m.group(1)}"
+                except Exception:
+                    pass
+            # Some links look like /feed/update/urn:li:activity:1234 or contain '/updates/' with share id
+            if '/feed/update/' in h and 'activity:' in h:
+                try:
+                    m = re.search(r"activity:(\d+)", h)
+                    if m:
+                        return f"activity:{m.group(1)}"
+                except Exception:
+                    pass
+            if '/posts/' in h:
+                # As a fallback, hash the posts URL path (stable enough)
+                try:
+                    p = urlparse(h)
+                    if p.path:
+                        return f"postpath:{hashlib.sha1(p.path.encode('utf-8')).hexdigest()}"
+                except Exception:
+                    pass
+    except Exception:
+        return None
+    return None
+
+
+def extract_role_from_text(text: str) -> str | None:
+    """Heuristic extraction of a role/title from post text.
+
+    Returns a short role string like 'Python Developer' or 'Senior Software Engineer', or None.
+    This is intentionally conservative: we try a few regexes in order and return the first reasonable match.
+    """
+    if not text:
+        return None
+    t = text.replace('\n', ' ').strip()
+    try:
+        # 1) Look for explicit phrases like 'looking for', 'hiring', 'seeking' followed by a title
+        m = re.search(r"(?:looking for|we're looking for|we are looking for|hiring|we're hiring|we are hiring|seeking|open for|open role for)\s+(?:an?|the)?\s*([A-Za-z0-9+.#\s\-]{3,80}?)\b(?:\.|,|\band|for|in|\(|$)", t, re.I)
+        if m:
+            candidate = m.group(1).strip(' .,:;\\/')
+            if 3 <= len(candidate) <= 80:
+                return ' '.join(candidate.split())
+
+        # 2) Role keywords e.g. 'Python Developer', 'Java Engineer', 'Full Stack Developer'
+        # Capture up to 4 words ending with a role keyword
+        role_kw = r"(?:developer|engineer|manager|designer|architect|consultant|analyst|specialist|lead|scientist|administrator|admin|devops|full[ -]?stack|backend|frontend|mobile|engineer)"
+        m2 = re.search(rf"([A-Za-z0-9+#\.\-\s]{{0,60}}\b{role_kw})", t, re.I)
+        if m2:
+            candidate = m2.group(1).strip(' .,:;\\/')
+            if 3 <= len(candidate) <= 80:
+                return ' '.join(candidate.split())
+
+        # 3) Fallback: look for common language + role combos like 'Python', 'Java' near the word 'developer' elsewhere
+        m3 = re.search(r"(Python|JavaScript|Java|Go|Golang|Ruby|C\+\+|C#|Node|React|Django|Flask)\s+([A-Za-z]{2,20})", t, re.I)
+        if m3:
+            candidate = (m3.group(1) + ' ' + m3.group(2)).strip()
+            return candidate
+    except Exception:
+        pass
+    return None
+
+
+# --- POST TEXT HELPERS (shared by the scrape and classify pipeline stages) ---
+# regex to match recent time indicators like '2h', '5 hr', '10m', 'just now', etc.
+RECENT_TIME_RE = re.compile(r"\b\d+\s*(?:h|hr|m|min)\b|just now|\bjust now\b|\b\d+\s*min\b", re.IGNORECASE)
+
+# Relative post ages as LinkedIn prints them ('35m', '2h', '1d', '3w', '2mo', '1yr', '5 hours ago', 'just now')
+_AGE_RE = re.compile(
+    r"\b(\d+)\s*(mo|mos|months?|m|mins?|minutes?|h|hrs?|hours?|d|days?|w|wks?|weeks?|y|yrs?|years?)\b|\b(just now)\b",
+    re.IGNORECASE,
+)
+# A whole line that is just the actor line's age: '2h', '3d •', '1w • Edited •', '5 hours ago', 'just now'
+_ACTOR_AGE_LINE_RE = re.compile(
+    r"^\s*(?:\d+\s*(?:mo|m|h|d|w|yr|y)|\d+\s+(?:minutes?|hours?|days?|weeks?|months?|years?)\s+ago|just now)"
+    r"\s*(?:•\s*)?(?:edited\s*)?(?:•\s*)?$",
+    re.IGNORECASE,
+)
+_AGE_UNIT_MINUTES = {'m': 1, 'h': 60, 'd': 24 * 60, 'w': 7 * 24 * 60, 'mo': 30 * 24 * 60, 'y': 365 * 24 * 60}
+
+
+def parse_age_minutes(label: str) -> int | None:
+    """Age in minutes of a post from its relative time label ('2h' -> 120, '1d' -> 1440), or None if there is none."""
+    m = _AGE_RE.search(label or '')
+    if not m:
+        return None
+    if m.group(3):
+        return 0
+    unit = m.group(2).lower()
+    key = 'mo' if unit.startswith('mo') else unit[0]
+    return int(m.group(1)) * _AGE_UNIT_MINUTES[key]
+
+
+def post_age_minutes(post: dict) -> int | None:
+    """Age of an extracted post: its time label, else an actor-line age ('2h • Edited') near the top of its text."""
+    age = parse_age_minutes(post.get('time_label') or '')
+    if age is not None:
+        return age
+    # Only a line that is nothing but the age, so '3 years experience' or '2 weeks notice' in the body does not count
+    for line in (post.get('text') or '').splitlines()[:6]:
+        if _ACTOR_AGE_LINE_RE.match(line):
+            return parse_age_minutes(line)
+    return None
+
+
+# Stricter email pattern to avoid false positives like 'October@9'
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,15}\b")
+
+
+def extract_contacts_from_text(t: str, deobfuscate: bool = False):
+    """Return (emails, phones) found in the text, de-duplicated in order of appearance.
+
+    deobfuscate=True additionally rewrites 'name at domain dot com' style addresses.
+    """
+    txt = t or ''
+    emails = _EMAIL_RE.findall(txt)
+    if not emails and txt:
+        # Tolerant collapse for 'name @ domain . com' patterns
+        collapsed = re.sub(r"\s*@\s*", "@", txt)
+        collapsed = re.sub(r"\s*\.\s*", ".", collapsed)
+        emails = _EMAIL_RE.findall(collapsed)
+    if deobfuscate and not emails and txt:
+        deob = re.sub(r"\bat\b", "@", txt, flags=re.IGNORECASE)
+        deob = re.sub(r"\bdot\b", ".", deob, flags=re.IGNORECASE)
+        emails = _EMAIL_RE.findall(deob)
+    phones = re.findall(r"\+?\d[\d\-\s().]{6,}\d", txt)
+    emails = list(dict.fromkeys(emails))
+    phones = list(dict.fromkeys(phones))
+    return emails, phones
+
+
+def clean_post_text(post_text: str, strict: bool = False) -> str:
+    """Remove UI artifacts (likes/comments/shares, comment threads, duplicate lines) from post text.
+
+    strict=True also drops profile fragments (follow/connect, premium, degrees, headlines)
+    which is what group pages need; the feed/search views only need the basic pass.
+    """
+    lines = [l.strip() for l in (post_text or '').splitlines() if l.strip()]
+    cleaned_lines = []
+    prev = None
+    in_comment_section = False
+    for l in lines:
+        low = l.lower()
+        # Skip feed UI numbering like 'Feed post number 24'
+        if strict and low.startswith('feed post number'):
+            continue
+        # If we reach the comments header like '1 comment' or '2 comments', stop including further content
+        if not in_comment_section:
+            if low == '1 comment' or bool(re.match(r"^\d+\s+comments?$", low)):
+                in_comment_section = True
+                continue
+        if in_comment_section:
+            continue
+        # Skip social interaction lines
+        if low.startswith('like') or low.startswith('likes') or low.startswith('comment') or low.startswith('comments') or 'share' in low:
+            continue
+        if strict:
+            # Skip follow/connect/profile action lines
+            if low.startswith('follow') or low.startswith('connect') or low.startswith('followed') or low.startswith('follow us'):
+                continue
+            # Remove premium indicators
+            if 'premium' in low:
+                continue
+            # Skip small profile/headline fragments (heuristic)
+            if len(l.split()) <= 3 and ('pronoun' in low or 'headline' in low or low.endswith('•')):
+                continue
+            # Skip degree/grade lines like '3rd', '2nd', '1st', '3rd+' etc if very short
+            if re.search(r"\b\d+(st|nd|rd|th)\b", low) and len(l.split()) <= 4:
+                continue
+            # Skip common degree keywords
+            if any(x in low for x in ('b.sc', 'bsc', 'm.sc', 'msc', 'bachelor', 'master', 'degree', 'mba', 'phd')):
+                continue
+        # Collapse consecutive duplicate lines (e.g., poster name repeated)
+        if prev is not None and l == prev:
+            continue
+        cleaned_lines.append(l)
+        prev = l
+    return '\n'.join(cleaned_lines).strip()
+
+
+def _text_stable_id(text: str, salt: str = '') -> str:
+    """Fallback job id when no LinkedIn activity id is available: hash of the normalized text."""
+    return f"txt:{hashlib.sha256((_normalize_text_for_id(text) + salt).encode('utf-8')).hexdigest()}"
+
+
+def activity_number(job_id: str) -> int | None:
+    """The numeric LinkedIn activity id of a job id like 'activity:7123...', or None for other id kinds."""
+    m = re.fullmatch(r"activity:(\d+)", job_id or '')
+    return int(m.group(1)) if m else None
+
+
+def activity_time(number: int | None) -> datetime | None:
+    """Creation time encoded in a LinkedIn activity id (its top 41 bits are epoch milliseconds), if plausible."""
+    if not number:
+        return None
+    try:
+        when = datetime.fromtimestamp((int(number) >> 22) / 1000.0, tz=timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+    if when.year < 2010 or when > datetime.now(timezone.utc) + timedelta(days=1):
+        return None
+    return when
+
+
+def split_contact_hrefs(hrefs) -> tuple[list, list]:
+    """(emails, phones) from mailto:/tel: hrefs, in order and without duplicates."""
+    emails: list = []
+    phones: list = []
+    for href in hrefs or ():
+        href = href or ''
+        if href.startswith('mailto:'):
+            addr = href.split(':', 1)[1].split('?')[0]
+            if addr and addr not in emails:
+                emails.append(addr)
+        if href.startswith('tel:'):
+            tel = href.split(':', 1)[1]
+            if tel and tel not in phones:
+                phones.append(tel)
+    return emails, phones
+
+
+def build_job(post: dict, mode: str, group_name: str, group_url: str, salt: str = '', require_recent: bool = True, max_age_minutes: int | None = None) -> dict | None:
+    """Turn an extracted post ({text, hrefs, contact_hrefs}) into the scraper's job dict.
+
+    mode selects the per-page rules the scraper applies:
+    - 'feed': basic cleaning; contacts from cleaned text, falling back to raw text
+    - 'search': raw text; contacts from text plus every mailto:/tel: link
+    - 'group': strict cleaning; de-obfuscated contacts from cleaned then raw text, then
+      mailto:/tel: links outside comments
+    salt is mixed into the text-hash id (keyword searches use '|kw:<keyword>').
+    Returns None for empty posts, and for non-recent ones unless require_recent=False.
+    With max_age_minutes, posts whose parsed age is older than that are dropped as well.
+    """
+    raw = (post.get('text') or '').strip()
+    if not raw or (require_recent and not RECENT_TIME_RE.search(raw)):
+        return None
+    if max_age_minutes is not None:
+        age = post_age_minutes(post)
+        if age is not None and age > max_age_minutes:
+            return None
+    hrefs = post.get('hrefs') or []
+    if mode == 'search':
+        cleaned = ''
+        emails, phones = extract_contacts_from_text(raw)
+        link_emails, link_phones = split_contact_hrefs(hrefs)
+        emails += [e for e in link_emails if e not in emails]
+        phones += [p for p in link_phones if p not in phones]
+        text = raw
+    else:
+        strict = mode == 'group'
+        cleaned = clean_post_text(raw, strict=strict)
+        # Prefer contacts from cleaned (no-comments) text; fallback to raw only if none
+        emails, phones = extract_contacts_from_text(cleaned, deobfuscate=strict)
+        if not emails and not phones:
+            emails2, phones2 = extract_contacts_from_text(raw, deobfuscate=strict)
+            if emails2:
+                emails = emails2
+            if phones2:
+                phones = phones2
+        if strict and not emails and not phones:
+            emails, phones = split_contact_hrefs(post.get('contact_hrefs') or [])
+        text = cleaned or raw
+    return {
+        'text': text,
+        'raw_text': raw,
+        'emails': emails,
+        'phones': phones,
+        'group_name': group_name,
+        'group_url': group_url,
+        'id': _extract_linkedin_activity_id_from_anchors(hrefs) or _text_stable_id(raw, salt),
+        'ai_reason': ''
+    }
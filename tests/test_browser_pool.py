@@ -0,0 +1,35 @@
+import pytest
+
+from browser_pool import BrowserSupervisor, BrowserWorker, run_sources
+
+
+class Driver:
+    current_url = 'https://www.linkedin.com/feed/'
+
+
+def _pool(handler, sources):
+    worker = BrowserWorker(Driver(), None)
+    supervisor = BrowserSupervisor(lambda w: setattr(w, 'driver', Driver()))
+    run_sources([worker], sources, handler, supervisor=supervisor)
+    return supervisor.stats
+
+
+def test_crashed_source_is_retried_once_then_skipped():
+    seen = []
+
+    def handler(worker, source):
+        seen.append(source)
+        if source == 'bad':
+            raise RuntimeError('tab crashed')
+
+    stats = _pool(handler, ['a', 'bad', 'b'])
+    assert seen == ['a', 'bad', 'bad', 'b']
+    assert stats['retried_sources'] == 1
+
+
+def test_other_errors_escaping_the_handler_stop_the_run():
+    def handler(worker, source):
+        raise ValueError('bug')
+
+    with pytest.raises(ValueError):
+        _pool(handler, ['a', 'b'])
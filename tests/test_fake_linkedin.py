@@ -0,0 +1,19 @@
+import re
+from datetime import datetime, timezone
+
+from fake_linkedin import FakeLinkedIn
+from post_text import activity_time
+
+
+def test_activity_ids_follow_post_age():
+    fake = FakeLinkedIn(page_size=5, pages=2, minutes_per_post=7)
+    html = fake.render_posts('group', 'g1', 0) + fake.render_posts('group', 'g1', 1)
+    ids = [int(i) for i in re.findall(r'data-urn="urn:li:activity:(\d+)"', html)]
+    assert len(ids) == 10 and ids == sorted(ids, reverse=True)
+    now = datetime.now(timezone.utc)
+    for pos, num in enumerate(ids):
+        # The labels round ('63m' shows as '1h'); the id carries the exact age
+        decoded = (now - activity_time(num)).total_seconds() / 60
+        assert abs(decoded - (pos + 1) * 7) < 1
+    # Stable for the server's lifetime, so a second run meets its cursor
+    assert fake.render_posts('group', 'g1', 0) == fake.render_posts('group', 'g1', 0)
@@ -0,0 +1,88 @@
+import email.utils
+import time
+
+import pytest
+
+import gemini_client
+from gemini_client import CircuitBreaker, GeminiClient, parse_retry_after
+
+
+def test_adapter_leaves_overload_responses_to_the_breaker():
+    retry = GeminiClient().session.get_adapter('https://generativelanguage.googleapis.com').max_retries
+    assert not retry.respect_retry_after_header
+    assert not retry.is_retry('POST', 503, has_retry_after=True)
+    assert not retry.is_retry('POST', 429, has_retry_after=True)
+    assert retry.is_retry('POST', 502)
+    # A read timeout already cost the full timeout
+    assert retry.read == 0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(gemini_client.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_parse_retry_after_seconds_and_dates():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(' 1.5 ') == 1.5
+    assert parse_retry_after('-3') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    in_a_minute = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55 <= parse_retry_after(in_a_minute) <= 60
+    assert parse_retry_after(email.utils.formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+def test_breaker_opens_after_threshold_and_probes_once(clock):
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow() and breaker.stats['state'] == 'closed'
+    breaker.record_failure()
+    assert breaker.is_open() and not breaker.allow()
+    assert breaker.stats['rejected'] == 1
+
+    clock[0] += 30
+    # Half-open: one probe at a time
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.stats['state'] == 'closed' and breaker.allow()
+
+
+def test_breaker_backoff_doubles_and_is_capped(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, max_open_seconds=25)
+    breaker.record_failure()
+    clock[0] += 9.9
+    assert breaker.is_open()
+    clock[0] += 0.1
+    assert breaker.allow()
+    # Failed probe: open again for twice as long
+    breaker.record_failure()
+    clock[0] += 19.9
+    assert breaker.is_open()
+    clock[0] += 0.1
+    assert breaker.allow()
+    breaker.record_failure()
+    clock[0] += 25
+    assert not breaker.is_open()
+
+
+def test_retry_after_opens_immediately_for_at_least_that_long(clock):
+    breaker = CircuitBreaker(failure_threshold=5, open_seconds=10)
+    breaker.record_failure(retry_after=45)
+    clock[0] += 44
+    assert breaker.is_open()
+    clock[0] += 1
+    assert not breaker.is_open()
+
+
+def test_release_frees_the_probe_without_a_verdict(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=1)
+    breaker.record_failure()
+    clock[0] += 1
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
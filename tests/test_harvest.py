@@ -0,0 +1,93 @@
+from dom_extract import HARVEST_STATS, PostHarvester
+from waits import scroll_through_lookback
+
+
+class VirtualizedFeed:
+    """Fake driver for a list of `total` posts that keeps `window` rendered and moves `step` down per scroll."""
+
+    def __init__(self, total=40, window=10, step=5):
+        self.total, self.window, self.step = total, window, step
+        self.top = 0
+        self.read = set()
+
+    def _rendered(self):
+        return range(self.top, min(self.top + self.window, self.total))
+
+    def execute_async_script(self, script, *args):
+        if len(args) == 5 and args[4]:
+            # EXTRACT_POSTS_JS in onlyNew mode
+            fresh = [i for i in self._rendered() if i not in self.read]
+            self.read.update(fresh)
+            posts = [{'text': f'Post {i}', 'urn': f'urn:li:activity:{i}', 'hrefs': [], 'contact_hrefs': [], 'time_label': f'{i}m'} for i in fresh]
+            return {'posts': posts, 'visible': len(self._rendered())}
+        # WAIT_JS after a scroll
+        self.top = min(self.top + self.step, self.total - self.window)
+        return {'reason': 'new-posts'}
+
+    def execute_script(self, script, *args):
+        # POST_MARKERS_JS
+        return [[f'{i}m', str(i + 1)] for i in self._rendered()]
+
+
+def test_harvest_keeps_posts_the_list_dropped():
+    feed = VirtualizedFeed()
+    harvester = PostHarvester(['.post'])
+    scroll = scroll_through_lookback(feed, ['.post'], 1000, max_steps=20, on_step=harvester.harvest)
+    items = harvester.finish()
+    # The node count stays at 10 while scrolling; that alone must not look like the end of the list
+    assert scroll['reason'] == 'end' and scroll['steps'] > 2
+    assert [i['urn'] for i in items] == [f'urn:li:activity:{i}' for i in range(40)]
+    summary = harvester.summary()
+    assert summary['posts_per_step'][:3] == [10, 5, 5] and sum(summary['posts_per_step']) == 40
+    assert summary['recovered_posts'] == 30
+
+
+def test_later_longer_read_replaces_a_truncated_one():
+    class Driver:
+        def __init__(self):
+            self.reads = [
+                [{'urn': '', 'text': 'Jane\n2h\nWe are hiring…see more'}, {'urn': 'urn:li:activity:1', 'text': 'short'}],
+                [{'urn': 'urn:li:activity:1', 'text': 'short, now expanded'}, {'urn': '', 'text': 'Jane\n2h\nWe are hiring…see more'}],
+            ]
+
+        def execute_async_script(self, script, *args):
+            return {'posts': self.reads.pop(0), 'visible': 2}
+
+    driver, harvester = Driver(), PostHarvester(['.post'])
+    assert harvester.harvest(driver) == 2
+    assert harvester.harvest(driver) == 0
+    assert [i['text'] for i in harvester.finish()] == ['Jane\n2h\nWe are hiring…see more', 'short, now expanded']
+
+
+def test_script_failure_falls_back_to_a_single_read():
+    class Broken:
+        def execute_async_script(self, script, *args):
+            raise RuntimeError('javascript error')
+
+    failures = HARVEST_STATS['failures']
+    harvester = PostHarvester(['.post'])
+    assert harvester.harvest(Broken()) == 0
+    assert harvester.failed and harvester.finish() == []
+    assert HARVEST_STATS['failures'] == failures + 1
+
+
+class UnlabelledFeed(VirtualizedFeed):
+    """Posts whose time labels no longer parse (e.g. a new layout)."""
+
+    def __init__(self):
+        super().__init__(total=200, window=10, step=5)
+        self.scrolls = 0
+
+    def execute_async_script(self, script, *args):
+        self.scrolls += 1
+        return super().execute_async_script(script, *args)
+
+    def execute_script(self, script, *args):
+        return [['Promoted', None] for _ in self._rendered()]
+
+
+def test_unreadable_labels_fall_back_to_fixed_scrolls():
+    feed = UnlabelledFeed()
+    scroll = scroll_through_lookback(feed, ['.post'], 60, fixed_steps=3, max_steps=25)
+    assert scroll['reason'] == 'fallback'
+    assert scroll['steps'] == feed.scrolls == 3
@@ -0,0 +1,56 @@
+import pytest
+
+import keyword_matcher
+from keyword_matcher import (
+    TermMatcher,
+    build_post_matcher,
+    is_disallowed_location,
+    is_promo_training,
+    match_post_terms,
+    seems_hiring,
+)
+
+
+@pytest.fixture(params=['pyahocorasick', 'substring'])
+def backend(request, monkeypatch):
+    if request.param == 'substring':
+        monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    elif keyword_matcher.ahocorasick is None:
+        pytest.skip('pyahocorasick not installed')
+    return request.param
+
+
+def test_scan_groups_terms_by_label_case_insensitively(backend):
+    matcher = TermMatcher({'fruit': ['Apple', 'pear'], 'colour': ['red', 'apple']})
+    assert matcher.backend == backend
+    assert matcher.scan('A RED Apple and a pear') == {'fruit': {'apple', 'pear'}, 'colour': {'red', 'apple'}}
+    assert matcher.scan('') == {}
+    assert matcher.scan(None) == {}
+
+
+def test_scan_matches_substrings_like_in(backend):
+    # Same semantics as `term in text.lower()`, including overlaps and matches inside words
+    terms = ['hire', 'hiring', 'ring', 'c2c']
+    matcher = TermMatcher({'t': terms})
+    text = 'Now HIRING (c2c/w2)'
+    assert matcher.scan(text)['t'] == {t for t in terms if t in text.lower()}
+
+
+def test_post_matcher_user_keywords(backend):
+    matcher = build_post_matcher([' Java ', '', 'Spring Boot'])
+    found = matcher.scan('Senior JAVA developer, spring boot, we are hiring')
+    assert found['keyword'] == {'java', 'spring boot'}
+    assert 'hiring' in found['hiring']
+    assert 'keyword' not in build_post_matcher().scan('java')
+
+
+def test_filter_helpers(backend):
+    text = 'Free demo class! Enroll in our Java training batch'
+    assert is_promo_training(text)
+    assert not seems_hiring('Enjoying the weekend')
+    assert seems_hiring('We are hiring a QA engineer, send resume')
+    assert is_disallowed_location('Hybrid role in San Juan, Puerto Rico') == 'puerto rico'
+    assert is_disallowed_location('Remote (USA)') is None
+    # Precomputed matches are reused instead of rescanning
+    matches = match_post_terms(text)
+    assert is_promo_training('', matches)
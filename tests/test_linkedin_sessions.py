@@ -0,0 +1,34 @@
+import pytest
+
+from browser import account_profile_dir
+from db import clear_linkedin_sessions, get_linkedin_session, init_db, list_linkedin_sessions, save_linkedin_session
+
+COOKIES = [{'name': 'li_at', 'value': 'x', 'domain': '.linkedin.com'}]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'app.db')
+    init_db(path)
+    return path
+
+
+def test_account_key_ignores_case_and_whitespace(db_path):
+    assert save_linkedin_session(' Me@Example.com ', COOKIES, db_path=db_path)
+    stored = get_linkedin_session('me@example.com', db_path=db_path)
+    assert stored['cookies'] == COOKIES and stored['updated_at']
+    assert [s['account'] for s in list_linkedin_sessions(db_path)] == ['me@example.com']
+    # Same spelling as the Chrome profile directory
+    assert account_profile_dir('/p', ' Me@Example.com ') == account_profile_dir('/p', 'me@example.com')
+    assert clear_linkedin_sessions('ME@example.com  ', db_path=db_path) == 1
+    assert get_linkedin_session('me@example.com', db_path=db_path) is None
+
+
+def test_save_replaces_and_clear_all(db_path):
+    save_linkedin_session('a@x.com', [], db_path=db_path)
+    save_linkedin_session('a@x.com', COOKIES, db_path=db_path)
+    save_linkedin_session('b@x.com', COOKIES, db_path=db_path)
+    assert get_linkedin_session('a@x.com', db_path=db_path)['cookies'] == COOKIES
+    assert get_linkedin_session('', db_path=db_path) is None
+    assert clear_linkedin_sessions(db_path=db_path) == 2
+    assert list_linkedin_sessions(db_path) == []
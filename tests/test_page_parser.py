@@ -0,0 +1,52 @@
+import pytest
+
+import page_parser
+from page_parser import POST_SELECTORS, _inner_text, _TreeBuilder, _select
+
+PAGE = '''<html><head><title>Feed</title></head><body>
+<div class="scaffold"><article class="feed-shared-update-v2" data-urn="urn:li:activity:1">one</article></div>
+<div class="feed-shared-update-v2x">not a post</div>
+<div class=" card  feed-shared-update-v2 ">two</div>
+<li class="reusable-search__result-container"><div class="feed-shared-update-v2">three</div></li>
+<ARTICLE>four</ARTICLE>
+</body></html>'''
+
+
+def _fallback_root(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _texts(elements):
+    return [_inner_text(el) for el in elements]
+
+
+@pytest.mark.skipif(page_parser.lxml_html is None, reason='lxml not installed')
+@pytest.mark.parametrize('mode', sorted(POST_SELECTORS))
+def test_compiled_selectors_match_the_fallback_matcher(mode):
+    selectors = POST_SELECTORS[mode]
+    compiled = _select(page_parser._parse(PAGE), selectors)
+    walked = _select(_fallback_root(PAGE), selectors)
+    assert _texts(compiled) == _texts(walked)
+    assert compiled
+
+
+def test_class_selector_matches_whole_tokens_only():
+    found = _select(_fallback_root(PAGE), ['.feed-shared-update-v2'])
+    assert _texts(found) == ['one', 'two', 'three']
+
+
+@pytest.mark.parametrize('kind,url', [
+    ('group', 'https://www.linkedin.com/groups/42/'),
+    ('search', 'https://www.linkedin.com/search/results/content/?keywords=java'),
+])
+def test_page_post_items_reads_mode_and_posts_from_the_page(kind, url):
+    from fake_linkedin import FakeLinkedIn
+    html = FakeLinkedIn(page_size=3).render_page(kind, 'k', 'Title', url)
+    page_url, mode, items = page_parser.page_post_items(html)
+    assert (page_url, mode) == (url, kind)
+    assert len(items) == 3
+    assert all(i['urn'].startswith('urn:li:activity:') and i['text'] for i in items)
+    assert page_parser.page_post_items('<html><body><p>Security check</p></body></html>')[2] == []
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pipeline
+from pipeline import Pipeline, TokenBucket
+
+
+def test_close_drains_every_stage_in_order():
+    out = []
+    pipe = Pipeline()
+    pipe.add_stage('double', lambda n: pipe.put('collect', n * 2), workers=3, maxsize=2)
+    pipe.add_stage('collect', out.append)
+    pipe.start()
+    for n in range(50):
+        assert pipe.put('double', n)
+    pipe.close()
+    pipe.close()
+    assert sorted(out) == [n * 2 for n in range(50)]
+    assert pipe.stats()['double']['processed'] == 50 and pipe.stats()['collect']['processed'] == 50
+
+
+def test_handler_errors_are_counted_not_fatal():
+    seen = []
+
+    def handler(n):
+        if n % 2:
+            raise ValueError(n)
+        seen.append(n)
+
+    pipe = Pipeline()
+    pipe.add_stage('s', handler)
+    pipe.start()
+    for n in range(6):
+        pipe.put('s', n)
+    pipe.close()
+    assert seen == [0, 2, 4]
+    assert pipe.stats()['s']['errors'] == 3
+
+
+def test_batched_stage_hands_over_lists():
+    batches = []
+    pipe = Pipeline()
+    pipe.add_stage('b', batches.append, batch_size=4, batch_wait=0.5)
+    pipe.start()
+    for n in range(10):
+        pipe.put('b', n)
+    pipe.close()
+    assert all(1 <= len(b) <= 4 for b in batches)
+    assert sorted(n for b in batches for n in b) == list(range(10))
+    assert pipe.stats()['b']['processed'] == 10
+
+
+def test_stop_discards_queued_items_and_refuses_new_ones():
+    stop = threading.Event()
+    release = threading.Event()
+    handled = []
+
+    def handler(n):
+        release.wait(2)
+        handled.append(n)
+
+    pipe = Pipeline(stop_event=stop)
+    pipe.add_stage('s', handler, maxsize=10)
+    pipe.start()
+    for n in range(5):
+        pipe.put('s', n)
+    stop.set()
+    release.set()
+    assert not pipe.put('s', 99)
+    pipe.close()
+    # At most the item already being handled when the stop came
+    assert len(handled) <= 1
+
+
+def test_token_bucket_zero_rate_never_limits():
+    bucket = TokenBucket(0)
+    assert all(bucket.acquire() for _ in range(1000))
+
+
+def test_token_bucket_banks_capacity_then_refills(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(pipeline.time, 'monotonic', lambda: now[0])
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    # Empty: a token takes 0.5s, more than the timeout allows
+    assert not bucket.acquire(timeout=0.1)
+    now[0] += 0.5
+    assert bucket.acquire(timeout=0)
+    now[0] += 60
+    assert sum(bucket.acquire(timeout=0) for _ in range(10)) == 3
+    assert bucket.stats['acquired'] == 7
+
+
+def test_token_bucket_waits_for_a_token_and_honours_stop():
+    bucket = TokenBucket(rate=20, capacity=1)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - started >= 0.03
+    assert bucket.stats['waited'] == 1
+    stop = threading.Event()
+    stop.set()
+    assert not TokenBucket(rate=0.01).acquire(tokens=2, stop_event=stop)
@@ -0,0 +1,47 @@
+import pytest
+
+from post_text import parse_age_minutes, post_age_minutes
+
+
+@pytest.mark.parametrize('label, minutes', [
+    ('35m', 35),
+    ('2h', 120),
+    ('2h • Edited •', 120),
+    ('1d', 24 * 60),
+    ('3w', 3 * 7 * 24 * 60),
+    ('2mo', 2 * 30 * 24 * 60),
+    ('1yr', 365 * 24 * 60),
+    ('5 hours ago', 300),
+    ('10 min', 10),
+    ('Just now', 0),
+    ('', None),
+    ('Promoted', None),
+])
+def test_parse_age_minutes(label, minutes):
+    assert parse_age_minutes(label) == minutes
+
+
+def test_time_label_wins():
+    assert post_age_minutes({'time_label': '4h', 'text': 'Jane Doe\n1d •\nhello'}) == 240
+
+
+@pytest.mark.parametrize('text, minutes', [
+    ('Jane Doe\nRecruiter at Acme\n2h • Edited •\nWe are hiring', 120),
+    ('Jane Doe\n3d •\nhello', 3 * 24 * 60),
+    ('Jane Doe\n1w\nhello', 7 * 24 * 60),
+    ('Jane Doe\n5 hours ago\nhello', 300),
+])
+def test_actor_line_fallback(text, minutes):
+    assert post_age_minutes({'text': text}) == minutes
+
+
+@pytest.mark.parametrize('text', [
+    'Jane Doe\n3 years experience\nJava developer',
+    'Hiring now\n2 weeks notice is fine',
+    'Jane Doe\nSenior dev 5y\nhello',
+    'Jane Doe\nRecruiter\nAcme\nTeam\nNY\nhello\n2h',
+    '',
+])
+def test_body_text_is_not_an_age(text):
+    # Counts and durations in the post body must not drop the post as too old
+    assert post_age_minutes({'text': text}) is None
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from db import (
+    advance_source_cursor,
+    clear_source_cursors,
+    get_source_cursors,
+    init_db,
+    source_cursor_targets,
+)
+from post_text import activity_number, activity_time
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'app.db')
+    init_db(path)
+    return path
+
+
+def _activity(when: datetime, low: int = 0) -> int:
+    return (int(when.timestamp() * 1000) << 22) | low
+
+
+def test_advance_only_moves_forward(db_path):
+    assert advance_source_cursor('group:a', 100, db_path=db_path)
+    assert not advance_source_cursor('group:a', 90, db_path=db_path)
+    assert not advance_source_cursor('group:a', 100, db_path=db_path)
+    assert advance_source_cursor('group:a', 150, '2026-01-01T00:00:00+00:00', db_path=db_path)
+    assert advance_source_cursor('search:java', 7, db_path=db_path)
+    cursors = get_source_cursors(db_path)
+    assert cursors['group:a']['activity_id'] == 150
+    assert cursors['group:a']['post_time'] == '2026-01-01T00:00:00+00:00'
+    assert cursors['search:java']['activity_id'] == 7
+
+
+def test_clear_one_or_all(db_path):
+    advance_source_cursor('group:a', 1, db_path=db_path)
+    advance_source_cursor('group:b', 2, db_path=db_path)
+    assert clear_source_cursors('group:a', db_path=db_path) == 1
+    assert list(get_source_cursors(db_path)) == ['group:b']
+    assert clear_source_cursors(db_path=db_path) == 1
+    assert get_source_cursors(db_path) == {}
+
+
+def test_targets_stop_below_the_oldest_unhandled_post():
+    posts = {
+        'group:a': {'activity:5': 5, 'activity:7': 7, 'activity:9': 9},
+        'group:b': {'activity:3': 3, 'activity:4': 4},
+        'search:x': {'activity:8': 8},
+    }
+    # 7 failed to send (or was held): the cursor may pass 5 but not 7, so 7 (and 9) come up again
+    handled = {'activity:5', 'activity:9', 'activity:3', 'activity:4'}
+    assert source_cursor_targets(posts, handled) == {'group:a': 5, 'group:b': 4}
+
+
+def test_targets_without_handled_posts_leave_cursors_alone():
+    # e.g. a run whose sender never logged in
+    posts = {'group:a': {'activity:5': 5, 'activity:7': 7}}
+    assert source_cursor_targets(posts, set()) == {}
+    assert source_cursor_targets({}, {'activity:5'}) == {}
+
+
+def test_activity_number_and_time():
+    assert activity_number('activity:7123') == 7123
+    assert activity_number('txt:abc') is None
+    assert activity_number(None) is None
+    when = datetime(2025, 6, 1, 12, 30, tzinfo=timezone.utc)
+    assert activity_time(_activity(when, low=0x3FFFFF)) == when
+    # Ids whose high bits are not a plausible timestamp
+    assert activity_time(12345) is None
+    assert activity_time(None) is None
@@ -0,0 +1,63 @@
+from voyager import decode_posts, is_post_response
+
+ACTIVITY = 7200000000000000000
+
+
+def _update(activity, text, **extra):
+    return {
+        '$type': 'com.linkedin.voyager.dash.feed.Update',
+        'entityUrn': f'urn:li:fsd_update:(urn:li:activity:{activity},MAIN_FEED,EMPTY,DEFAULT,false)',
+        'metadata': {'backendUrn': f'urn:li:activity:{activity}'},
+        'actor': {
+            'name': {'text': 'Jane Doe'},
+            'description': {'text': 'Recruiter at Acme'},
+            'subDescription': {'text': '2h • Edited • '},
+        },
+        'commentary': {'text': {'text': text}},
+        **extra,
+    }
+
+
+def test_decodes_updates_and_skips_comments_and_duplicates():
+    payload = {'included': [
+        _update(ACTIVITY, 'We are hiring a Java developer. Mail jobs@acme.com'),
+        {'$type': 'com.linkedin.voyager.dash.social.Comment', 'commentary': {'text': 'Interested!'}},
+        _update(ACTIVITY, 'We are hiring a Java developer. Mail jobs@acme.com'),
+        _update(ACTIVITY + 1, 'Second post', content={'url': 'https://acme.com/jobs'}),
+    ]}
+    items = decode_posts(payload)
+    assert [i['activity_id'] for i in items] == [ACTIVITY, ACTIVITY + 1]
+    first = items[0]
+    assert first['urn'] == f'urn:li:activity:{ACTIVITY}'
+    assert first['hrefs'][0] == f'https://www.linkedin.com/feed/update/urn:li:activity:{ACTIVITY}/'
+    assert first['author'] == 'Jane Doe'
+    assert first['time_label'] == '2h'
+    # Laid out like the rendered post: author, headline, age, commentary
+    assert first['text'].splitlines() == ['Jane Doe', 'Recruiter at Acme', '2h', 'We are hiring a Java developer. Mail jobs@acme.com']
+    assert first['posted_at'].startswith('20')
+
+
+def test_links_and_contacts_from_commentary():
+    update = _update(ACTIVITY, 'Reach out', commentary={
+        'text': {'text': 'Reach out'},
+        'attributes': [{'hyperlink': 'mailto:hr@acme.com'}, {'hyperlink': 'https://acme.com/apply'}, {'hyperlink': 'javascript:x'}],
+    })
+    item = decode_posts([update])[0]
+    assert item['hrefs'][1:] == ['mailto:hr@acme.com', 'https://acme.com/apply']
+    assert item['contact_hrefs'] == ['mailto:hr@acme.com']
+
+
+def test_ugc_posts_and_missing_urns():
+    ugc = {'commentary': {'text': 'No activity id here'}, 'entityUrn': 'urn:li:ugcPost:7100000000000000000'}
+    bare = {'commentary': {'text': 'No urn at all'}}
+    items = decode_posts({'elements': [ugc, bare]})
+    assert items[0]['urn'] == 'urn:li:ugcPost:7100000000000000000' and items[0]['activity_id'] is None
+    assert items[1]['urn'] == '' and items[1]['hrefs'] == []
+
+
+def test_is_post_response():
+    assert is_post_response('https://www.linkedin.com/voyager/api/graphql?queryId=voyagerFeedDashMainFeed.1', 'application/json')
+    assert is_post_response('https://www.linkedin.com/voyager/api/search/dash/clusters?q=all', 'application/vnd.linkedin.normalized+json+2.1')
+    assert not is_post_response('https://www.linkedin.com/voyager/api/messaging/conversations', 'application/json')
+    assert not is_post_response('https://www.linkedin.com/voyager/api/feed/updates', 'text/html')
+    assert not is_post_response('https://www.linkedin.com/feed/', 'application/json')
@@ -0,0 +1,227 @@
+"""Posts from LinkedIn's own JSON API responses (voyager REST and GraphQL), captured through CDP.
+
+While a feed, search or group page renders, the page fetches its posts from /voyager/api/...
+as JSON. VoyagerCapture listens to the Network.* events of browser.NetworkMeter, fetches the
+bodies of those responses with Network.getResponseBody, and decode_posts() turns the post
+entities into the same {text, hrefs, contact_hrefs, urn, time_label} items as
+dom_extract.extract_posts, plus author/activity_id/posted_at. The first href is the post's
+/feed/update/urn:li:activity:<id>/ URL, so build_job picks up the exact activity id.
+
+Usage: python voyager.py [--mode feed|search|group] response.json [...]
+"""
+import base64
+import json
+import logging
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from post_text import activity_time, build_job
+
+logger = logging.getLogger(__name__)
+
+# API responses worth reading: voyager REST/GraphQL calls that carry feed, search or group updates
+# (skips messaging, notifications badges, tracking and the like)
+VOYAGER_URL_RE = re.compile(r'/voyager/api/', re.I)
+POST_URL_HINTS = ('feed', 'update', 'search', 'group')
+_ACTIVITY_URN_RE = re.compile(r'urn:li:(activity|ugcPost|share):(\d+)')
+_LINK_KEYS = ('url', 'hyperlink', 'link', 'actionTarget')
+
+# Responses seen/read, bodies that could not be fetched or parsed, posts decoded
+VOYAGER_STATS: Dict[str, Any] = {'responses': 0, 'bodies': 0, 'body_errors': 0, 'posts': 0, 'fallbacks': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str, amount: int = 1):
+    with _stats_lock:
+        VOYAGER_STATS[key] = VOYAGER_STATS.get(key, 0) + amount
+
+
+def is_post_response(url: str, mime_type: str = '') -> bool:
+    low = (url or '').lower()
+    return bool(VOYAGER_URL_RE.search(low)) and 'json' in (mime_type or 'json').lower() and any(h in low for h in POST_URL_HINTS)
+
+
+def _text(value) -> str:
+    # TextViewModel ({'text': ...}), nested {'text': {'text': ...}} or a plain string
+    for _ in range(3):
+        if isinstance(value, dict):
+            value = value.get('text')
+    return value.strip() if isinstance(value, str) else ''
+
+
+def _links(value, out: List[str]):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k in _LINK_KEYS and isinstance(v, str) and re.match(r'(https?|mailto|tel):', v, re.I):
+                out.append(v)
+            else:
+                _links(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            _links(v, out)
+
+
+def _activity_urn(entity: Dict[str, Any]) -> str:
+    # Prefer the explicit backend/update urns; entityUrn wraps them (urn:li:fsd_update:(urn:li:activity:...,...))
+    candidates = [
+        (entity.get('metadata') or {}).get('backendUrn'),
+        (entity.get('updateMetadata') or {}).get('urn'),
+        entity.get('urn'), entity.get('entityUrn'), entity.get('*socialDetail'),
+    ]
+    found = ''
+    for c in candidates:
+        m = _ACTIVITY_URN_RE.search(c or '') if isinstance(c, str) else None
+        if m and m.group(1) == 'activity':
+            return m.group(0)
+        if m and not found:
+            found = m.group(0)
+    return found
+
+
+def _age_label(when: Optional[datetime]) -> str:
+    if when is None:
+        return ''
+    minutes = max(0, int((datetime.now(timezone.utc) - when).total_seconds() // 60))
+    if minutes < 60:
+        return f'{minutes}m'
+    if minutes < 24 * 60:
+        return f'{minutes // 60}h'
+    return f'{minutes // (24 * 60)}d'
+
+
+def _entities(payload) -> Iterable[Dict[str, Any]]:
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if 'commentary' in node:
+                yield node
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def decode_posts(payload) -> List[Dict[str, Any]]:
+    """Post items from one voyager/GraphQL JSON payload, in response order and without duplicates.
+
+    Any object with a 'commentary' that is not a comment is a post (UpdateV2 / dash Update,
+    including the entries of a normalized 'included' list and reshared updates). Its text is laid
+    out like the rendered post's innerText (author, headline, age, commentary) so the DOM
+    cleaning rules still apply.
+    """
+    items: List[Dict[str, Any]] = []
+    seen = set()
+    for entity in _entities(payload):
+        commentary = _text(entity.get('commentary'))
+        # Comments carry a 'commentary' too
+        kind = f"{entity.get('$type', '')} {entity.get('entityUrn', '')}".lower()
+        if not commentary or 'comment' in kind:
+            continue
+        urn = _activity_urn(entity)
+        key = urn or commentary
+        if key in seen:
+            continue
+        seen.add(key)
+        actor = entity.get('actor') or {}
+        author = _text(actor.get('name'))
+        m = _ACTIVITY_URN_RE.search(urn)
+        activity_id = int(m.group(2)) if m and m.group(1) == 'activity' else None
+        # ugcPost/share ids use the same timestamped layout as activity ids
+        posted_at = activity_time(int(m.group(2))) if m else None
+        time_label = _text(actor.get('subDescription')).split('•')[0].strip() or _age_label(posted_at)
+        hrefs = [f'https://www.linkedin.com/feed/update/{urn}/'] if urn else []
+        _links(entity.get('commentary'), hrefs)
+        _links(actor.get('navigationContext'), hrefs)
+        lines = [author, _text(actor.get('description')), time_label, commentary]
+        items.append({
+            'text': '\n'.join(l for l in lines if l),
+            'hrefs': hrefs,
+            'contact_hrefs': [h for h in hrefs if h.lower().startswith(('mailto:', 'tel:'))],
+            'urn': urn,
+            'time_label': time_label,
+            'author': author,
+            'activity_id': activity_id,
+            'posted_at': posted_at.isoformat() if posted_at else None,
+        })
+    return items
+
+
+class VoyagerCapture:
+    """Collects the post-bearing API responses of one browser.
+
+    Register on_event with NetworkMeter.add_listener; collect(driver, meter) then reads the
+    bodies of the responses finished since the last collect/clear and returns their posts.
+    Bodies are only kept by Chrome for the current document, so collect before navigating away.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, str] = {}
+        self._finished: List[str] = []
+
+    def on_event(self, method: str, params: Dict[str, Any]):
+        if method == 'Network.responseReceived':
+            response = params.get('response') or {}
+            if is_post_response(response.get('url', ''), response.get('mimeType', '')):
+                with self._lock:
+                    self._pending[params.get('requestId')] = response.get('url', '')
+        elif method == 'Network.loadingFinished':
+            with self._lock:
+                if self._pending.pop(params.get('requestId'), None) is not None:
+                    self._finished.append(params.get('requestId'))
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._finished.clear()
+
+    def collect(self, driver, meter) -> List[Dict[str, Any]]:
+        meter.poll(driver)
+        with self._lock:
+            finished, self._finished = self._finished, []
+        items: List[Dict[str, Any]] = []
+        seen = set()
+        for request_id in finished:
+            _count('responses')
+            try:
+                res = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                body = res.get('body') or ''
+                if res.get('base64Encoded'):
+                    body = base64.b64decode(body).decode('utf-8', errors='replace')
+                payload = json.loads(body)
+            except Exception as e:
+                _count('body_errors')
+                logger.debug(f'Voyager: could not read response {request_id}: {str(e)[:120]}')
+                continue
+            _count('bodies')
+            for item in decode_posts(payload):
+                key = item['urn'] or item['text']
+                if key not in seen:
+                    seen.add(key)
+                    items.append(item)
+        _count('posts', len(items))
+        return items
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('paths', nargs='+', help='saved API response bodies (JSON)')
+    ap.add_argument('--mode', choices=('feed', 'search', 'group'), default='feed')
+    args = ap.parse_args(argv)
+    jobs = []
+    for path in args.paths:
+        with open(path, encoding='utf-8') as f:
+            for item in decode_posts(json.load(f)):
+                job = build_job(item, args.mode, 'API capture', '', require_recent=False)
+                if job is not None:
+                    jobs.append({**job, 'author': item['author'], 'posted_at': item['posted_at']})
+    print(json.dumps({'jobs': len(jobs), 'results': jobs}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from post_text import parse_age_minutes
+
+logger = logging.getLogger(__name__)
+
+# Runs inside the page (execute_async_script) and resolves as soon as the page has done what we
+# were waiting for, or at timeoutMs at the latest:
+# - 'present': post nodes exist and the DOM has been quiet for settleMs
+# - 'grow': more post nodes than when the wait started (optionally after scrolling to the bottom)
+# - 'quiet': no DOM mutations, new resources or requests in flight for settleMs
+# In every mode it also resolves once the page has been idle that way for idleMs (e.g. the end of
+# an infinite-scroll list). Requests pending for over 2s are taken to be long-polls and ignored.
+WAIT_JS = r"""
+const selectors = arguments[0], mode = arguments[1], timeoutMs = arguments[2], idleMs = arguments[3],
+      settleMs = arguments[4], doScroll = arguments[5];
+const done = arguments[arguments.length - 1];
+// Requests pending for longer than this are treated as long-polls (realtime channels) and ignored
+const LONG_POLL_MS = 2000;
+// Track fetch/XHR requests in flight; patched once per document
+if (!window.__scraperInflight) {
+    const track = window.__scraperInflight = {pending: new Map(), seq: 0};
+    const begin = () => { const id = ++track.seq; track.pending.set(id, performance.now()); return id; };
+    if (window.fetch) {
+        const origFetch = window.fetch;
+        window.fetch = function () {
+            const id = begin();
+            return origFetch.apply(this, arguments).finally(() => { track.pending.delete(id); });
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        const id = begin();
+        this.addEventListener('loadend', () => { track.pending.delete(id); }, {once: true});
+        return origSend.apply(this, arguments);
+    };
+}
+const busy = (now) => {
+    for (const t of window.__scraperInflight.pending.values()) {
+        if (now - t < LONG_POLL_MS) return true;
+    }
+    return false;
+};
+const count = () => {
+    for (const s of selectors) {
+        const n = document.querySelectorAll(s).length;
+        if (n) return n;
+    }
+    return 0;
+};
+const resources = () => (performance.getEntriesByType ? performance.getEntriesByType('resource').length : 0);
+const start = performance.now(), before = count();
+let lastMutation = start, lastChange = start, lastRes = resources(), finished = false;
+const root = document.body || document.documentElement;
+const obs = new MutationObserver(() => { lastMutation = lastChange = performance.now(); });
+obs.observe(root, {childList: true, subtree: true, characterData: true});
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    obs.disconnect();
+    clearInterval(timer);
+    done({reason: reason, before: before, after: count(), waited_ms: Math.round(performance.now() - start)});
+};
+const timer = setInterval(() => {
+    const now = performance.now(), r = resources();
+    if (r !== lastRes) { lastRes = r; lastChange = now; }
+    const domQuiet = now - lastMutation;
+    // Idle = no mutations, no new resources and no (short-lived) request in flight
+    const idleFor = busy(now) ? 0 : now - lastChange;
+    const n = count();
+    if (mode === 'present' && n > 0 && domQuiet >= settleMs) return finish('posts');
+    if (mode === 'grow' && n > before && domQuiet >= settleMs) return finish('new-posts');
+    if (mode === 'quiet' && idleFor >= settleMs) return finish('quiet');
+    if (idleFor >= idleMs) return finish('idle');
+    if (now - start >= timeoutMs) return finish('timeout');
+}, 50);
+if (doScroll) window.scrollTo(0, document.body ? document.body.scrollHeight : 0);
+"""
+
+# Time label and activity id of every post container (first selector that matches), in DOM order
+POST_MARKERS_JS = r"""
+const selectors = arguments[0];
+let posts = [];
+for (const s of selectors) {
+    posts = document.querySelectorAll(s);
+    if (posts.length) break;
+}
+const activity = (p) => {
+    const urnEl = p.matches('[data-urn]') ? p : p.querySelector('[data-urn*="activity:"]');
+    const urn = urnEl ? (urnEl.getAttribute('data-urn') || '') : '';
+    let m = urn.match(/activity:(\d+)/);
+    if (!m) {
+        const a = p.querySelector('a[href*="activity:"]');
+        m = a ? (a.getAttribute('href') || '').match(/activity:(\d+)/) : null;
+    }
+    return m ? m[1] : '';
+};
+return Array.from(posts, (p) => {
+    const t = p.querySelector('.update-components-actor__sub-description, .feed-shared-actor__sub-description, time');
+    return [t ? (t.innerText || t.textContent || '').trim() : '', activity(p)];
+});
+"""
+
+# Waits done, time actually waited vs. the fixed sleeps they replace (their upper bounds), and why each wait ended
+WAIT_STATS: Dict[str, Any] = {'waits': 0, 'waited_seconds': 0.0, 'budget_seconds': 0.0, 'saved_seconds': 0.0, 'reasons': {}}
+_stats_lock = threading.Lock()
+# True restores the plain fixed sleeps (full timeout every time), e.g. to measure the difference against a fake server
+FIXED_SLEEPS = False
+
+
+def _record(reason: str, waited: float, budget: float):
+    with _stats_lock:
+        WAIT_STATS['waits'] += 1
+        WAIT_STATS['waited_seconds'] = round(WAIT_STATS['waited_seconds'] + waited, 3)
+        WAIT_STATS['budget_seconds'] = round(WAIT_STATS['budget_seconds'] + budget, 3)
+        WAIT_STATS['saved_seconds'] = round(max(0.0, WAIT_STATS['budget_seconds'] - WAIT_STATS['waited_seconds']), 3)
+        WAIT_STATS['reasons'][reason] = WAIT_STATS['reasons'].get(reason, 0) + 1
+
+
+def _sleep(seconds: float, should_stop: Optional[Callable[[], None]]):
+    # Stop-aware fixed sleep, used when the in-page wait cannot run
+    end = time.monotonic() + max(0.0, seconds)
+    while True:
+        if should_stop is not None:
+            should_stop()
+        left = end - time.monotonic()
+        if left <= 0:
+            return
+        time.sleep(min(0.1, left))
+
+
+def _page_wait(driver, selectors: Sequence[str], mode: str, timeout: float, idle: float, settle: float, scroll: bool, should_stop: Optional[Callable[[], None]]) -> Dict[str, Any]:
+    if should_stop is not None:
+        should_stop()
+    started = time.monotonic()
+    if FIXED_SLEEPS:
+        if scroll:
+            try:
+                driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+            except Exception:
+                pass
+        _sleep(timeout, should_stop)
+        _record('fixed-sleep', time.monotonic() - started, timeout)
+        return {'reason': 'fixed-sleep'}
+    try:
+        result = driver.execute_async_script(WAIT_JS, list(selectors or ()), mode, int(timeout * 1000), int(idle * 1000), int(settle * 1000), bool(scroll))
+        if not isinstance(result, dict):
+            raise ValueError(f'unexpected result {str(result)[:100]}')
+    except Exception as e:
+        # Keep the old behaviour (scroll, then the full fixed sleep) if the script cannot run
+        logger.debug(f'Wait: in-page wait failed ({str(e)[:120]}); sleeping {timeout}s')
+        if scroll:
+            try:
+                driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+            except Exception:
+                pass
+        _sleep(timeout - (time.monotonic() - started), should_stop)
+        result = {'reason': 'fallback-sleep'}
+    _record(result.get('reason') or 'unknown', time.monotonic() - started, timeout)
+    if should_stop is not None:
+        should_stop()
+    return result
+
+
+def wait_for_posts(driver, selectors: Sequence[str], timeout: float = 4.0, idle: float = 1.0, settle: float = 0.2, should_stop: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """After a navigation: return once post nodes are rendered (or the page went idle without any), at most timeout seconds.
+
+    Returns {reason, before, after, waited_ms}; reason is 'posts', 'idle', 'timeout' or 'fallback-sleep'.
+    """
+    return _page_wait(driver, selectors, 'present', timeout, idle, settle, False, should_stop)
+
+
+def scroll_and_wait(driver, selectors: Sequence[str], timeout: float = 1.5, idle: float = 0.5, settle: float = 0.15, should_stop: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """Scroll to the bottom and return once new post nodes appear or the network goes idle, at most timeout seconds."""
+    return _page_wait(driver, selectors, 'grow', timeout, idle, settle, True, should_stop)
+
+
+def wait_quiet(driver, timeout: float = 0.3, quiet: float = 0.1, should_stop: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """After a click: return once the DOM has stopped changing for `quiet` seconds, at most timeout seconds."""
+    return _page_wait(driver, (), 'quiet', timeout, timeout, quiet, False, should_stop)
+
+
+def wait_until(driver, condition: Callable[[Any], Any], timeout: float, poll: float = 0.1, should_stop: Optional[Callable[[], None]] = None) -> bool:
+    """WebDriverWait on condition(driver), at most timeout seconds. Returns False on timeout instead of raising.
+
+    should_stop is called on every poll so a stop request interrupts the wait.
+    """
+    def check(drv):
+        if should_stop is not None:
+            should_stop()
+        try:
+            return condition(drv)
+        except Exception:
+            return False
+
+    started = time.monotonic()
+    if FIXED_SLEEPS:
+        _sleep(timeout, should_stop)
+        ok = bool(check(driver))
+        _record('fixed-sleep', time.monotonic() - started, timeout)
+        return ok
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(check)
+        ok = True
+    except TimeoutException:
+        ok = False
+    _record('condition' if ok else 'timeout', time.monotonic() - started, timeout)
+    return ok
+
+
+def _post_markers(driver, selectors: Sequence[str]):
+    # [(age in minutes or None, activity id or None)] per post
+    rows = driver.execute_script(POST_MARKERS_JS, list(selectors)) or []
+    return [(parse_age_minutes(label), int(act) if act else None) for label, act in rows]
+
+
+def scroll_through_lookback(driver, selectors: Sequence[str], max_age_minutes: Optional[int], fixed_steps: int = 3,
+                            max_steps: int = 25, step_timeout: float = 1.5, tail: int = 3,
+                            stop_at_activity: Optional[int] = None,
+                            should_stop: Optional[Callable[[], None]] = None,
+                            on_step: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+    """Scroll until the posts loaded so far reach back past max_age_minutes.
+
+    After each step the posts' time labels are parsed into ages; scrolling stops once the last
+    `tail` posts with a known age are all older than the window ('lookback'), when two steps in
+    a row load nothing new (no more posts and the same last post: 'end'), or after max_steps
+    ('max-steps'). A quiet group can stop before the first scroll; a busy one keeps going. With stop_at_activity (the source's cursor)
+    it also stops once the last `tail` posts with an activity id are all at or below it ('cursor'):
+    everything newer is already loaded. Without a window (max_age_minutes None/0), or if the
+    labels cannot be read, it does the old fixed_steps scrolls. on_step(driver) runs before every
+    scroll and once at the end, e.g. PostHarvester.harvest for lists that drop off-screen posts.
+
+    Returns {steps, reason, posts, oldest_minutes}.
+    """
+    def fixed(reason):
+        for _ in range(fixed_steps):
+            if on_step is not None:
+                on_step(driver)
+            scroll_and_wait(driver, selectors, timeout=step_timeout, should_stop=should_stop)
+        if on_step is not None:
+            on_step(driver)
+        return {'steps': fixed_steps, 'reason': reason, 'posts': None, 'oldest_minutes': None}
+
+    if not max_age_minutes or max_age_minutes <= 0:
+        return fixed('fixed')
+    steps = stalled = 0
+    prev_count = prev_last = None
+    while True:
+        if on_step is not None:
+            on_step(driver)
+        try:
+            markers = _post_markers(driver, selectors)
+        except Exception as e:
+            logger.debug(f'Wait: reading post ages failed ({str(e)[:120]}); using fixed scrolls')
+            out = fixed('fallback')
+            out['steps'] += steps
+            return out
+        known = [age for age, _ in markers if age is not None]
+        ids = [act for _, act in markers if act is not None]
+        summary = {'steps': steps, 'posts': len(markers), 'oldest_minutes': max(known) if known else None}
+        if known and min(known[-tail:]) > max_age_minutes:
+            return dict(summary, reason='lookback')
+        if stop_at_activity and ids and max(ids[-tail:]) <= stop_at_activity:
+            return dict(summary, reason='cursor')
+        if markers and not known:
+            # Posts are there but none of their labels parse (new layout/locale): the window cannot be judged
+            logger.debug(f'Wait: no readable time labels on {len(markers)} posts; using fixed scrolls')
+            out = fixed('fallback')
+            out['steps'] += steps
+            return out
+        if prev_count is not None:
+            # Virtualized lists keep the node count flat while scrolling; a different last post is progress too
+            grew = len(markers) > prev_count or (markers and markers[-1] != prev_last)
+            stalled = 0 if grew else stalled + 1
+            if stalled >= 2:
+                return dict(summary, reason='end')
+        if steps >= max_steps:
+            return dict(summary, reason='max-steps')
+        prev_count, prev_last = len(markers), (markers[-1] if markers else None)
+        scroll_and_wait(driver, selectors, timeout=step_timeout, should_stop=should_stop)
+        steps += 1